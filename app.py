@@ -9,12 +9,18 @@ import json
 import os
 import pickle
 import random
+import heapq
 
 # Import utilities
 from utils.language_utils import get_text, load_app_settings, save_app_settings
-from utils.data_utils import load_student_data
+from utils.repository import get_repository
 from utils.auth_utils import is_authenticated, render_login_page, logout_user, get_user_role
 from utils.image_base64 import get_base64_images # Import get_base64_images for its dictionary
+from utils.compaction_utils import start_compaction_worker
+from utils.sync_utils import start_sync_worker
+from utils.write_queue_utils import start_write_queue
+from utils.chart_utils import cached_figure, render_chart
+from utils.html_utils import page_markdown
 
 # Corrected: All UI functions now imported from utils.exact_ui
 from utils.exact_ui import (
@@ -42,6 +48,13 @@ st.set_page_config(
 # Apply modern UI styles - CRITICAL to be at the top
 add_exact_ui_styles()
 
+# Background compaction of the data files (starts once per process, off the request path)
+start_compaction_worker()
+# Flush any saves left queued by a previous run
+start_write_queue()
+# Reconcile with the central database while online (no-op unless EDUSCAN_SYNC_SERVER is set)
+start_sync_worker()
+
 # Initialize session state for settings
 if 'app_language' not in st.session_state:
     settings = load_app_settings()
@@ -58,13 +71,212 @@ language = st.session_state.get('app_language', 'English')
 
 # Apply theme-specific body attribute via JavaScript to allow CSS targeting
 current_theme = st.session_state.get('app_theme', 'Light')
-st.markdown(f"""
+page_markdown(f"""
     <script>
         document.body.setAttribute('data-theme', '{current_theme}');
     </script>
 """, unsafe_allow_html=True)
 
 
+# --- Dashboard Aggregation ---
+def _parse_timestamp(value):
+    """Parses an ISO timestamp string, returning None if it is missing or malformed."""
+    try:
+        return datetime.fromisoformat(str(value))
+    except (TypeError, ValueError):
+        return None
+
+def summarize_student_data(records, recent_limit=5):
+    """
+    Aggregates student prediction records for the dashboard in a single pass.
+
+    Accepts any iterable (e.g. get_repository().iter_student_data()) and keeps only
+    running totals, per-month sums and the few most recent records in memory, so the
+    cost does not grow with the size of the data file.
+    """
+    one_month_ago = datetime.now() - timedelta(days=30)
+    summary = {
+        'total': 0,
+        'new_this_month': 0,
+        'risk_counts': {},
+        'score_sums': {},
+        'score_counts': {},
+        'monthly': {},
+    }
+    recent_heap = []  # min-heap of (timestamp, sequence, record)
+
+    for sequence, record in enumerate(records):
+        summary['total'] += 1
+        timestamp = _parse_timestamp(record.get('timestamp'))
+        if timestamp and timestamp >= one_month_ago:
+            summary['new_this_month'] += 1
+
+        risk_level = record.get('risk_level')
+        summary['risk_counts'][risk_level] = summary['risk_counts'].get(risk_level, 0) + 1
+
+        core_scores = [record[col] for col in ('math_score', 'reading_score', 'writing_score')
+                       if isinstance(record.get(col), (int, float))]
+        derived = {}
+        if core_scores:
+            core_mean = sum(core_scores) / len(core_scores)
+            derived = {'science_score': core_mean * 1.05, 'social_studies_score': core_mean * 1.02}
+        for col in ('math_score', 'reading_score', 'writing_score', 'science_score', 'social_studies_score'):
+            value = record.get(col, derived.get(col))
+            if isinstance(value, (int, float)):
+                summary['score_sums'][col] = summary['score_sums'].get(col, 0) + value
+                summary['score_counts'][col] = summary['score_counts'].get(col, 0) + 1
+
+        if timestamp:
+            month = summary['monthly'].setdefault(timestamp.strftime('%Y-%m'), {})
+            for col in ('math_score', 'reading_score'):
+                if isinstance(record.get(col), (int, float)):
+                    total, count = month.get(col, (0, 0))
+                    month[col] = (total + record[col], count + 1)
+
+        entry = (timestamp or datetime.min, sequence, record)
+        if len(recent_heap) < recent_limit:
+            heapq.heappush(recent_heap, entry)
+        else:
+            heapq.heappushpop(recent_heap, entry)
+
+    summary['recent'] = [record for _, _, record in sorted(recent_heap, reverse=True)]
+    summary['avg_scores'] = {col: summary['score_sums'][col] / summary['score_counts'][col]
+                             for col in summary['score_sums']}
+    return summary
+
+
+# --- Dashboard charts (built once per data set, see utils.chart_utils) ---
+def build_subject_scores_chart(subjects, scores_display):
+    """Bar chart of average scores per subject"""
+    # Use px.bar and map subjects to color for distinct colors
+    fig_bar = px.bar(
+        x=subjects,
+        y=scores_display,
+        title="",
+        labels={'x': 'Subjects', 'y': 'Average Score (%)'},
+        # Use a categorical color mapping for distinct colors
+        color=subjects, # Map colors by subject name
+        color_discrete_sequence=px.colors.qualitative.Plotly # Or choose another palette like 'Pastel', 'Set1', etc.
+    )
+
+    fig_bar.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family='Inter', color='var(--gray-700)'),
+        showlegend=False, # We don't need a legend if colors are tied to x-axis labels
+        margin=dict(l=0, r=0, t=20, b=0),
+        height=350,
+        xaxis=dict(gridcolor='var(--gray-200)', showgrid=True),
+        yaxis=dict(gridcolor='var(--gray-200)', showgrid=True, range=[0,100])
+    )
+    return fig_bar
+
+def build_risk_distribution_chart(risk_labels, risk_values, risk_colors):
+    """Donut chart of students per risk level"""
+    filtered_labels = [label for i, label in enumerate(risk_labels) if risk_values[i] > 0]
+    filtered_values = [value for value in risk_values if value > 0]
+    filtered_colors = [risk_colors[i] for i, value in enumerate(risk_values) if value > 0]
+
+    if not filtered_values:
+        fig_pie = go.Figure(data=[go.Pie(labels=['No Data Available'], values=[1], marker_colors=['var(--gray-400)'], hole=.4, textinfo='label')])
+    else:
+        fig_pie = go.Figure(data=[go.Pie(
+            labels=filtered_labels,
+            values=filtered_values,
+            marker_colors=filtered_colors,
+            hole=.4,
+            textinfo='percent+label',
+            insidetextorientation='radial',
+            pull=[0.1 if 'Intervention' in label else 0 for label in filtered_labels]
+        )])
+
+    fig_pie.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family='Inter', color='var(--gray-700)'),
+        showlegend=True,
+        margin=dict(l=0, r=0, t=20, b=0),
+        height=350,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=-0.2,
+            xanchor="center",
+            x=0.5,
+            font=dict(size=10)
+        )
+    )
+    fig_pie.update_traces(
+        textfont_color="white",
+        textfont_size=14,
+        marker=dict(line=dict(color='var(--white)', width=1))
+    )
+    return fig_pie
+
+def build_monthly_trends_chart(months, math_trend, reading_trend):
+    """Line chart of monthly mathematics and reading averages"""
+    fig_line = go.Figure()
+    fig_line.add_trace(go.Scatter(
+        x=months, y=math_trend,
+        mode='lines+markers',
+        name='Mathematics',
+        line=dict(color='var(--primary-purple)', width=3),
+        marker=dict(size=8)
+    ))
+    fig_line.add_trace(go.Scatter(
+        x=months, y=reading_trend,
+        mode='lines+markers',
+        name='Reading',
+        line=dict(color='var(--success-green)', width=3),
+        marker=dict(size=8)
+    ))
+    
+    fig_line.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family='Inter', color='var(--gray-700)'),
+        showlegend=True,
+        margin=dict(l=60, r=40, t=40, b=60),  # Increased margins for full visibility
+        height=450,  # Increased height for better display
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="center",  # Center the legend
+            x=0.5
+        ),
+        xaxis=dict(
+            gridcolor='var(--gray-200)', 
+            showgrid=True, 
+            title="Time Period",
+            title_font=dict(size=14, color='var(--gray-700)'),
+            tickfont=dict(size=12, color='var(--gray-600)'),
+            showline=True,
+            linecolor='var(--gray-300)',
+            mirror=True
+        ),
+        yaxis=dict(
+            gridcolor='var(--gray-200)', 
+            showgrid=True, 
+            range=[65,90], 
+            title="Average Score (%)",
+            title_font=dict(size=14, color='var(--gray-700)'),
+            tickfont=dict(size=12, color='var(--gray-600)'),
+            showline=True,
+            linecolor='var(--gray-300)',
+            mirror=True
+        ),
+        # Add hover styling
+        hovermode='x unified',
+        hoverlabel=dict(
+            bgcolor='white',
+            font_size=12,
+            font_family='Inter'
+        )
+    )
+    return fig_line
+
+
 # --- Dashboard Content Rendering Function ---
 def render_dashboard_page_content():
     """Renders the main content of the Dashboard page."""
@@ -72,30 +284,20 @@ def render_dashboard_page_content():
     # Top Header Section with improved readability
     render_exact_page_header(get_material_icon_html("dashboard"), 'Educational Assessment Dashboard', 'Comprehensive Learning Analytics Platform', language)
 
-    st.markdown("<h3 style='font-size:1.5rem; font-weight:600; color:var(--gray-900); margin-bottom:1.5rem;'>System Overview</h3>", unsafe_allow_html=True)
+    page_markdown("<h3 style='font-size:1.5rem; font-weight:600; color:var(--gray-900); margin-bottom:1.5rem;'>System Overview</h3>", unsafe_allow_html=True)
     
-    # --- Fetch actual data for dashboard stats ---
-    all_student_data = load_student_data()
-    df_students = pd.DataFrame(all_student_data)
+    # --- Fetch actual data for dashboard stats (streamed, never fully loaded) ---
+    summary = summarize_student_data(get_repository().iter_student_data())
 
-    total_students = len(df_students)
+    total_students = summary['total']
     
     # Calculate new students this month (example: last 30 days)
-    new_this_month = 0
-    if not df_students.empty:
-        df_students['timestamp'] = pd.to_datetime(df_students['timestamp'])
-        one_month_ago = datetime.now() - timedelta(days=30)
-        new_this_month = df_students[df_students['timestamp'] >= one_month_ago].shape[0]
-
-    on_track_count = 0
-    at_risk_count = 0
-    intervention_count = 0
-    
-    if not df_students.empty:
-        # Assuming 'risk_level' is stored as 'Low Risk', 'Medium Risk', 'High Risk'
-        on_track_count = df_students[df_students['risk_level'] == 'Low Risk'].shape[0]
-        at_risk_count = df_students[df_students['risk_level'] == 'Medium Risk'].shape[0]
-        intervention_count = df_students[df_students['risk_level'] == 'High Risk'].shape[0]
+    new_this_month = summary['new_this_month']
+
+    # Assuming 'risk_level' is stored as 'Low Risk', 'Medium Risk', 'High Risk'
+    on_track_count = summary['risk_counts'].get('Low Risk', 0)
+    at_risk_count = summary['risk_counts'].get('Medium Risk', 0)
+    intervention_count = summary['risk_counts'].get('High Risk', 0)
 
     on_track_percentage = (on_track_count / total_students * 100) if total_students > 0 else 0
     at_risk_percentage = (at_risk_count / total_students * 100) if total_students > 0 else 0
@@ -103,29 +305,23 @@ def render_dashboard_page_content():
     # Render Stat Cards with readable labels
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.markdown(create_exact_metric_card('Total Students', total_students, f"↑ {new_this_month} new this month", get_total_students_icon(), 'total'), unsafe_allow_html=True)
+        page_markdown(create_exact_metric_card('Total Students', total_students, f"↑ {new_this_month} new this month", get_total_students_icon(), 'total'), unsafe_allow_html=True)
     with col2:
-        st.markdown(create_exact_metric_card('Students On Track', on_track_count, f"↑ {on_track_percentage:.0f}% performing well", get_on_track_icon(), 'on-track'), unsafe_allow_html=True)
+        page_markdown(create_exact_metric_card('Students On Track', on_track_count, f"↑ {on_track_percentage:.0f}% performing well", get_on_track_icon(), 'on-track'), unsafe_allow_html=True)
     with col3:
-        st.markdown(create_exact_metric_card('Students At Risk', at_risk_count, f"↑ {at_risk_percentage:.0f}% need support", get_at_risk_icon(), 'at-risk', change_type="negative"), unsafe_allow_html=True)
+        page_markdown(create_exact_metric_card('Students At Risk', at_risk_count, f"↑ {at_risk_percentage:.0f}% need support", get_at_risk_icon(), 'at-risk', change_type="negative"), unsafe_allow_html=True)
     with col4:
-        st.markdown(create_exact_metric_card('Need Intervention', intervention_count, f"↑ {(intervention_count / total_students * 100):.0f}% urgent attention" if total_students > 0 else "↑ 0% urgent attention", get_intervention_icon(), 'intervention', change_type="negative"), unsafe_allow_html=True)
+        page_markdown(create_exact_metric_card('Need Intervention', intervention_count, f"↑ {(intervention_count / total_students * 100):.0f}% urgent attention" if total_students > 0 else "↑ 0% urgent attention", get_intervention_icon(), 'intervention', change_type="negative"), unsafe_allow_html=True)
     
     # --- Performance Charts with readable titles ---
-    st.markdown("<h3 style='font-size:1.5rem; font-weight:600; color:var(--gray-900); margin-top:2.5rem; margin-bottom:1.5rem;'>Performance Insights</h3>", unsafe_allow_html=True)
+    page_markdown("<h3 style='font-size:1.5rem; font-weight:600; color:var(--gray-900); margin-top:2.5rem; margin-bottom:1.5rem;'>Performance Insights</h3>", unsafe_allow_html=True)
     chart_col1, chart_col2 = st.columns(2)
 
     with chart_col1:
         subjects = ['Mathematics', 'Reading', 'Writing', 'Science', 'Social Studies']
         
-        if not df_students.empty and all(col in df_students.columns for col in ['math_score', 'reading_score', 'writing_score']):
-            df_students_copy = df_students.copy()
-            if 'science_score' not in df_students_copy.columns:
-                df_students_copy['science_score'] = df_students_copy[['math_score', 'reading_score', 'writing_score']].mean(axis=1) * 1.05
-            if 'social_studies_score' not in df_students_copy.columns:
-                df_students_copy['social_studies_score'] = df_students_copy[['math_score', 'reading_score', 'writing_score']].mean(axis=1) * 1.02
-
-            avg_scores = df_students_copy[['math_score', 'reading_score', 'writing_score', 'science_score', 'social_studies_score']].mean().to_dict()
+        if total_students > 0 and all(col in summary['avg_scores'] for col in ['math_score', 'reading_score', 'writing_score']):
+            avg_scores = summary['avg_scores']
             
             scores_display = [
                 avg_scores.get('math_score', 0),
@@ -137,92 +333,37 @@ def render_dashboard_page_content():
         else:
             scores_display = [75, 82, 70, 78, 80]
 
-        # Use px.bar and map subjects to color for distinct colors
-        fig_bar = px.bar(
-            x=subjects,
-            y=scores_display,
-            title="",
-            labels={'x': 'Subjects', 'y': 'Average Score (%)'},
-            # Use a categorical color mapping for distinct colors
-            color=subjects, # Map colors by subject name
-            color_discrete_sequence=px.colors.qualitative.Plotly # Or choose another palette like 'Pastel', 'Set1', etc.
-        )
-        
-        fig_bar.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(family='Inter', color='var(--gray-700)'),
-            showlegend=False, # We don't need a legend if colors are tied to x-axis labels
-            margin=dict(l=0, r=0, t=20, b=0),
-            height=350,
-            xaxis=dict(gridcolor='var(--gray-200)', showgrid=True),
-            yaxis=dict(gridcolor='var(--gray-200)', showgrid=True, range=[0,100])
-        )
+        fig_bar = cached_figure('dashboard_subject_scores', (subjects, scores_display),
+                                lambda: build_subject_scores_chart(subjects, scores_display))
         
-        st.markdown(create_exact_chart_container(
+        page_markdown(create_exact_chart_container(
             f"{get_material_icon_html('trending_up', 'outlined')} <span style='color: var(--gray-900); font-weight: 600;'>Academic Performance by Subject</span>",
             "<span style='color: var(--gray-800);'>Average scores across all core academic subjects</span>",
         ), unsafe_allow_html=True)
-        st.plotly_chart(fig_bar, use_container_width=True)
+        render_chart(fig_bar)
 
     with chart_col2:
         risk_labels = ['Students On Track', 'Students At Risk', 'Need Intervention']
         risk_values = [on_track_count, at_risk_count, intervention_count]
         risk_colors = ['var(--success-green)', 'var(--warning-orange)', 'var(--danger-red)']
         
-        filtered_labels = [label for i, label in enumerate(risk_labels) if risk_values[i] > 0]
-        filtered_values = [value for value in risk_values if value > 0]
-        filtered_colors = [risk_colors[i] for i, value in enumerate(risk_values) if value > 0]
-
-        if not filtered_values:
-            fig_pie = go.Figure(data=[go.Pie(labels=['No Data Available'], values=[1], marker_colors=['var(--gray-400)'], hole=.4, textinfo='label')])
-        else:
-            fig_pie = go.Figure(data=[go.Pie(
-                labels=filtered_labels,
-                values=filtered_values,
-                marker_colors=filtered_colors,
-                hole=.4,
-                textinfo='percent+label',
-                insidetextorientation='radial',
-                pull=[0.1 if 'Intervention' in label else 0 for label in filtered_labels]
-            )])
-        
-        fig_pie.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(family='Inter', color='var(--gray-700)'),
-            showlegend=True,
-            margin=dict(l=0, r=0, t=20, b=0),
-            height=350,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=-0.2,
-                xanchor="center",
-                x=0.5,
-                font=dict(size=10)
-            )
-        )
-        fig_pie.update_traces(
-            textfont_color="white",
-            textfont_size=14,
-            marker=dict(line=dict(color='var(--white)', width=1))
-        )
+        fig_pie = cached_figure('dashboard_risk_distribution', (risk_labels, risk_values),
+                                lambda: build_risk_distribution_chart(risk_labels, risk_values, risk_colors))
         
-        st.markdown(create_exact_chart_container(
+        page_markdown(create_exact_chart_container(
             f"{get_material_icon_html('pie_chart')} <span style='color: var(--gray-900); font-weight: 600;'>Student Risk Assessment Distribution</span>",
             "<span style='color: var(--gray-800);'>Overview of student learning risk levels</span>",
         ), unsafe_allow_html=True)
-        st.plotly_chart(fig_pie, use_container_width=True)
+        render_chart(fig_pie)
 
     # Recent assessments table with readable headers
-    st.markdown(create_exact_chart_container(
+    page_markdown(create_exact_chart_container(
         f"{get_material_icon_html('grading')} <span style='color: var(--gray-900); font-weight: 600;'>Recent Assessment Results</span>",
         "<span style='color: var(--gray-800);'>Latest student assessment data and risk evaluations</span>"
     ), unsafe_allow_html=True)
     
-    if not df_students.empty:
-        df_recent = df_students.sort_values(by='timestamp', ascending=False).head(5)
+    if total_students > 0:
+        df_recent = pd.DataFrame(summary['recent'])
         display_columns = ['student_name', 'grade_level', 'math_score', 'reading_score', 'risk_level']
         
         for col in display_columns:
@@ -243,98 +384,33 @@ def render_dashboard_page_content():
         st.dataframe(pd.DataFrame(sample_data), use_container_width=True, hide_index=True)
 
     # Performance trends chart with better description
-    st.markdown(create_exact_chart_container(
+    page_markdown(create_exact_chart_container(
         f"{get_material_icon_html('analytics')} <span style='color: var(--gray-900); font-weight: 600;'>Monthly Performance Trends</span>",
         "<span style='color: var(--gray-800);'>Track average subject performance changes over time</span>"
     ), unsafe_allow_html=True)
     
-    if not df_students.empty:
-        df_students['month_year'] = df_students['timestamp'].dt.to_period('M').astype(str)
-        monthly_avg = df_students.groupby('month_year')[['math_score', 'reading_score']].mean().reset_index()
-        monthly_avg.columns = ['Month-Year', 'Mathematics Average', 'Reading Average']
-        monthly_avg = monthly_avg.sort_values(by='Month-Year')
-
-        fig_line = go.Figure()
-        fig_line.add_trace(go.Scatter(
-            x=monthly_avg['Month-Year'], y=monthly_avg['Mathematics Average'],
-            mode='lines+markers',
-            name='Mathematics',
-            line=dict(color='var(--primary-purple)', width=3),
-            marker=dict(size=8)
-        ))
-        fig_line.add_trace(go.Scatter(
-            x=monthly_avg['Month-Year'], y=monthly_avg['Reading Average'],
-            mode='lines+markers',
-            name='Reading',
-            line=dict(color='var(--success-green)', width=3),
-            marker=dict(size=8)
-        ))
+    if total_students > 0:
+        monthly_avg = pd.DataFrame([
+            {
+                'Month-Year': month,
+                'Mathematics Average': totals['math_score'][0] / totals['math_score'][1] if 'math_score' in totals else np.nan,
+                'Reading Average': totals['reading_score'][0] / totals['reading_score'][1] if 'reading_score' in totals else np.nan,
+            }
+            for month, totals in sorted(summary['monthly'].items())
+        ], columns=['Month-Year', 'Mathematics Average', 'Reading Average'])
+
+        months = monthly_avg['Month-Year'].tolist()
+        math_trend = monthly_avg['Mathematics Average'].tolist()
+        reading_trend = monthly_avg['Reading Average'].tolist()
     else:
         months = ['January', 'February', 'March', 'April', 'May', 'June', 'July']
         math_trend = [72, 74, 76, 79, 78, 81, 85]
         reading_trend = [75, 76, 78, 80, 82, 80, 78]
-        
-        fig_line = go.Figure()
-        fig_line.add_trace(go.Scatter(
-            x=months, y=math_trend,
-            mode='lines+markers',
-            name='Mathematics',
-            line=dict(color='var(--primary-purple)', width=3),
-            marker=dict(size=8)
-        ))
-        fig_line.add_trace(go.Scatter(
-            x=months, y=reading_trend,
-            mode='lines+markers',
-            name='Reading',
-            line=dict(color='var(--success-green)', width=3),
-            marker=dict(size=8)
-        ))
-    
-    fig_line.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(family='Inter', color='var(--gray-700)'),
-        showlegend=True,
-        margin=dict(l=60, r=40, t=40, b=60),  # Increased margins for full visibility
-        height=450,  # Increased height for better display
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="center",  # Center the legend
-            x=0.5
-        ),
-        xaxis=dict(
-            gridcolor='var(--gray-200)', 
-            showgrid=True, 
-            title="Time Period",
-            title_font=dict(size=14, color='var(--gray-700)'),
-            tickfont=dict(size=12, color='var(--gray-600)'),
-            showline=True,
-            linecolor='var(--gray-300)',
-            mirror=True
-        ),
-        yaxis=dict(
-            gridcolor='var(--gray-200)', 
-            showgrid=True, 
-            range=[65,90], 
-            title="Average Score (%)",
-            title_font=dict(size=14, color='var(--gray-700)'),
-            tickfont=dict(size=12, color='var(--gray-600)'),
-            showline=True,
-            linecolor='var(--gray-300)',
-            mirror=True
-        ),
-        # Add hover styling
-        hovermode='x unified',
-        hoverlabel=dict(
-            bgcolor='white',
-            font_size=12,
-            font_family='Inter'
-        )
-    )
+
+    fig_line = cached_figure('dashboard_monthly_trends', (months, math_trend, reading_trend),
+                             lambda: build_monthly_trends_chart(months, math_trend, reading_trend))
     
-    st.plotly_chart(fig_line, use_container_width=True)
+    render_chart(fig_line)
 
 def main():
     """Main application function"""
@@ -0,0 +1,69 @@
+-- Monthly range-partitioned variant of 0001_initial_schema.sql, used when
+-- EDUSCAN_DB_PARTITIONING=monthly on a new database. Predictions are partitioned
+-- by timestamp and observations by date, so the partition key is part of each
+-- primary key. Monthly partitions are created by
+-- utils.migration_utils.ensure_monthly_partitions(); rows outside them land in
+-- the DEFAULT partition and are moved when their month's partition is created.
+
+CREATE TABLE IF NOT EXISTS students (
+    id SERIAL PRIMARY KEY,
+    name TEXT NOT NULL,
+    grade_level TEXT,
+    created_date TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS predictions (
+    id SERIAL,
+    student_id INTEGER NOT NULL REFERENCES students (id),
+    math_score REAL,
+    reading_score REAL,
+    writing_score REAL,
+    attendance REAL,
+    behavior INTEGER,
+    literacy INTEGER,
+    prediction INTEGER,
+    probability REAL,
+    risk_level TEXT,
+    notes TEXT,
+    timestamp TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
+
+CREATE TABLE IF NOT EXISTS predictions_default PARTITION OF predictions DEFAULT;
+
+CREATE TABLE IF NOT EXISTS parent_observations (
+    id SERIAL,
+    student_id INTEGER NOT NULL REFERENCES students (id),
+    child_name TEXT NOT NULL,
+    date DATE NOT NULL,
+    homework_completion REAL,
+    reading_time REAL,
+    focus_level TEXT,
+    subjects_struggled TEXT,
+    behavior_rating INTEGER,
+    mood_rating INTEGER,
+    sleep_hours REAL,
+    energy_level TEXT,
+    social_interactions TEXT,
+    learning_wins TEXT,
+    challenges_faced TEXT,
+    strategies_used TEXT,
+    screen_time REAL,
+    physical_activity REAL,
+    medication_taken BOOLEAN DEFAULT FALSE,
+    special_events TEXT,
+    timestamp TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, date)
+) PARTITION BY RANGE (date);
+
+CREATE TABLE IF NOT EXISTS parent_observations_default PARTITION OF parent_observations DEFAULT;
+
+CREATE TABLE IF NOT EXISTS users (
+    id SERIAL PRIMARY KEY,
+    username TEXT NOT NULL,
+    password TEXT NOT NULL,
+    user_type TEXT NOT NULL,
+    full_name TEXT,
+    email TEXT,
+    created_date TIMESTAMP NOT NULL DEFAULT NOW()
+);
@@ -0,0 +1,59 @@
+-- Tables used by utils/db_utils.py. IF NOT EXISTS keeps this safe on databases
+-- that were created by hand before migrations existed.
+
+CREATE TABLE IF NOT EXISTS students (
+    id SERIAL PRIMARY KEY,
+    name TEXT NOT NULL,
+    grade_level TEXT,
+    created_date TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS predictions (
+    id SERIAL PRIMARY KEY,
+    student_id INTEGER NOT NULL REFERENCES students (id),
+    math_score REAL,
+    reading_score REAL,
+    writing_score REAL,
+    attendance REAL,
+    behavior INTEGER,
+    literacy INTEGER,
+    prediction INTEGER,
+    probability REAL,
+    risk_level TEXT,
+    notes TEXT,
+    timestamp TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS parent_observations (
+    id SERIAL PRIMARY KEY,
+    student_id INTEGER NOT NULL REFERENCES students (id),
+    child_name TEXT NOT NULL,
+    date DATE NOT NULL,
+    homework_completion REAL,
+    reading_time REAL,
+    focus_level TEXT,
+    subjects_struggled TEXT,
+    behavior_rating INTEGER,
+    mood_rating INTEGER,
+    sleep_hours REAL,
+    energy_level TEXT,
+    social_interactions TEXT,
+    learning_wins TEXT,
+    challenges_faced TEXT,
+    strategies_used TEXT,
+    screen_time REAL,
+    physical_activity REAL,
+    medication_taken BOOLEAN DEFAULT FALSE,
+    special_events TEXT,
+    timestamp TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS users (
+    id SERIAL PRIMARY KEY,
+    username TEXT NOT NULL,
+    password TEXT NOT NULL,
+    user_type TEXT NOT NULL,
+    full_name TEXT,
+    email TEXT,
+    created_date TIMESTAMP NOT NULL DEFAULT NOW()
+);
@@ -0,0 +1,21 @@
+-- One row per student name, so db_utils.get_or_create_student_id() can use
+-- INSERT ... ON CONFLICT (name) instead of SELECT-then-INSERT.
+--
+-- Earlier code could insert the same name twice under concurrent saves. Those
+-- duplicates are merged into the lowest id before the index is built.
+
+CREATE TEMP TABLE student_merge ON COMMIT DROP AS
+SELECT id AS duplicate_id, MIN(id) OVER (PARTITION BY name) AS keep_id
+FROM students;
+
+DELETE FROM student_merge WHERE duplicate_id = keep_id;
+
+UPDATE predictions p SET student_id = m.keep_id
+FROM student_merge m WHERE p.student_id = m.duplicate_id;
+
+UPDATE parent_observations po SET student_id = m.keep_id
+FROM student_merge m WHERE po.student_id = m.duplicate_id;
+
+DELETE FROM students s USING student_merge m WHERE s.id = m.duplicate_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_students_name ON students (name);
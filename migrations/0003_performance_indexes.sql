@@ -0,0 +1,30 @@
+-- Indexes for the hot queries in utils/db_utils.py. On partitioned tables each
+-- index is created on every partition automatically.
+
+-- Latest predictions per student (history views, keyset pagination)
+CREATE INDEX IF NOT EXISTS idx_predictions_student_timestamp
+    ON predictions (student_id, timestamp DESC);
+
+-- Unfiltered history streams ordered newest first
+CREATE INDEX IF NOT EXISTS idx_predictions_timestamp
+    ON predictions (timestamp DESC, id DESC);
+
+-- One observation per student per day: the ON CONFLICT target of
+-- db_utils.save_parent_observation_to_db(), also used by deletes and date
+-- ranges. Earlier code could insert the same day twice under concurrent saves;
+-- only the latest of those rows is kept. The index includes the partition key
+-- (date), so it can be unique on the partitioned schema too.
+DELETE FROM parent_observations po
+USING parent_observations newer
+WHERE newer.student_id = po.student_id AND newer.date = po.date
+  AND (COALESCE(newer.timestamp, '-infinity'), newer.id) > (COALESCE(po.timestamp, '-infinity'), po.id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_parent_observations_student_date
+    ON parent_observations (student_id, date);
+
+-- Parent Tracker filters by child_name directly
+CREATE INDEX IF NOT EXISTS idx_parent_observations_child_date
+    ON parent_observations (child_name, date);
+
+-- Login and user upserts
+CREATE INDEX IF NOT EXISTS idx_users_username ON users (username);
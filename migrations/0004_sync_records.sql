@@ -0,0 +1,14 @@
+-- Current version of every record exchanged with offline clients
+-- (see utils/sync_utils.py). seq increases with every accepted change, so
+-- clients pull deltas with "seq > last seen".
+CREATE TABLE IF NOT EXISTS sync_records (
+    record_key TEXT PRIMARY KEY,
+    kind VARCHAR(20) NOT NULL,
+    payload TEXT,
+    deleted BOOLEAN NOT NULL DEFAULT FALSE,
+    updated_at TEXT NOT NULL,
+    seq BIGINT NOT NULL,
+    origin VARCHAR(64) NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_sync_records_seq ON sync_records (seq);
@@ -0,0 +1,9 @@
+-- Idempotency key for predictions saved through the write-behind queue
+-- (utils/write_queue_utils.py): the spool entry id. A queued write replayed
+-- after a crash hits ON CONFLICT DO NOTHING instead of adding a duplicate row.
+-- The index includes timestamp, the partition key on the partitioned schema;
+-- a replayed prediction carries the same timestamp. Rows without a write_id
+-- never conflict.
+ALTER TABLE predictions ADD COLUMN IF NOT EXISTS write_id TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_predictions_write_id ON predictions (write_id, timestamp);
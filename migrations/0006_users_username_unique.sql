@@ -0,0 +1,14 @@
+-- One row per username, so db_utils.save_user_to_db() can use
+-- INSERT ... ON CONFLICT (username) instead of UPDATE-then-INSERT.
+--
+-- Earlier code could insert the same username twice under concurrent saves.
+-- Its UPDATE kept every copy in step, so the lowest id is kept and the rest
+-- are dropped. The non-unique index from 0003 is replaced under the same name.
+
+DELETE FROM users u
+USING users older
+WHERE older.username = u.username AND older.id < u.id;
+
+DROP INDEX IF EXISTS idx_users_username;
+
+CREATE UNIQUE INDEX idx_users_username ON users (username);
@@ -5,25 +5,20 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 import json
 import os
 import sys
+import time
 
-# Enhanced Lottie import
-try:
-    from streamlit_lottie import st_lottie
-    import requests
-    LOTTIE_AVAILABLE = True
-except ImportError:
-    LOTTIE_AVAILABLE = False
 
 # Append parent directory to sys.path to enable importing from utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.model_utils import load_model, make_prediction
-from utils.data_utils import save_prediction_data, load_student_data
+from utils.repository import get_repository
 from utils.image_base64 import get_base64_images
+from utils.lottie_utils import render_lottie
 from utils.language_utils import get_text, load_app_settings, save_app_settings
 from utils.exact_ui import (
     add_exact_ui_styles,
@@ -35,6 +30,11 @@ from utils.exact_ui import (
 )
 from utils.auth_utils import is_authenticated, render_login_page, logout_user, get_user_role
 from utils.icon_utils import get_material_icon_html
+from utils.html_utils import page_markdown
+from utils.compaction_utils import start_compaction_worker
+from utils.sync_utils import start_sync_worker
+from utils.write_queue_utils import start_write_queue, enqueue_write, UI_CONFIRM_WAIT_SECONDS
+from utils.chart_utils import cached_figure, invalidate_figures, line_trace, render_chart, render_points_report
 
 # Page config
 st.set_page_config(
@@ -47,6 +47,13 @@ st.set_page_config(
 # Apply styles and initialize
 add_exact_ui_styles()
 
+# Background compaction of the data files (starts once per process, off the request path)
+start_compaction_worker()
+# Background writer for saves (also flushes anything left queued by a previous run)
+start_write_queue()
+# Reconcile with the central database while online (no-op unless EDUSCAN_SYNC_SERVER is set)
+start_sync_worker()
+
 if 'app_language' not in st.session_state:
     settings = load_app_settings()
     st.session_state['app_language'] = settings.get('language', 'English')
@@ -60,7 +67,10 @@ if 'offline_mode' not in st.session_state:
 language = st.session_state.get('app_language', 'English')
 current_theme = st.session_state.get('app_theme', 'Light')
 
-st.markdown(f"""
+# Assessment records shown per "load more" step in Historical Data Analysis
+HISTORY_PAGE_SIZE = 20
+
+page_markdown(f"""
     <script>
         document.body.setAttribute('data-theme', '{current_theme}');
     </script>
@@ -68,54 +78,6 @@ st.markdown(f"""
 
 render_exact_sidebar()
 
-# Clean Lottie functions
-def load_lottie_url(url: str):
-    """Load Lottie animation with timeout"""
-    if not LOTTIE_AVAILABLE:
-        return None
-    try:
-        r = requests.get(url, timeout=5)
-        if r.status_code == 200:
-            return r.json()
-    except:
-        pass
-    return None
-
-def remove_lottie_background(lottie_json):
-    """Simple background removal"""
-    if not lottie_json:
-        return None
-    try:
-        if 'bg' in lottie_json:
-            del lottie_json['bg']
-        lottie_json['bg'] = None
-        return lottie_json
-    except:
-        return lottie_json
-
-def render_lottie(url, height=200, key=None, fallback_icon="school", fallback_text="Loading..."):
-    """Simple Lottie renderer with fallback"""
-    if LOTTIE_AVAILABLE:
-        lottie_json = load_lottie_url(url)
-        if lottie_json:
-            cleaned = remove_lottie_background(lottie_json)
-            try:
-                st_lottie(cleaned, height=height, key=key, speed=1, loop=True, quality="high")
-                return True
-            except:
-                pass
-    
-    # Elegant fallback
-    st.markdown(f"""
-    <div style="height: {height}px; display: flex; flex-direction: column; align-items: center; justify-content: center; 
-         background: linear-gradient(135deg, rgba(139, 92, 246, 0.1), rgba(59, 130, 246, 0.1)); 
-         border-radius: 12px; text-align: center; border: 2px dashed rgba(139, 92, 246, 0.3);">
-        <span class="material-symbols-outlined" style="font-size: 3rem; color: var(--primary-purple); margin-bottom: 0.5rem; animation: pulse 2s infinite;">{fallback_icon}</span>
-        <p style="color: var(--gray-600); margin: 0; font-weight: 500;">{fallback_text}</p>
-    </div>
-    """, unsafe_allow_html=True)
-    return False
-
 def get_risk_animation_url(prediction_prob):
     """Get appropriate animation URL based on risk level"""
     if prediction_prob < 0.3:
@@ -241,7 +203,7 @@ def display_recommendations(risk_level, student_data):
     """Display personalized recommendations based on risk level"""
     
     if "Low" in risk_level:
-        st.markdown(f"{get_material_icon_html('check_circle')} **Low Risk** - Continue current support strategies", unsafe_allow_html=True)
+        page_markdown(f"{get_material_icon_html('check_circle')} **Low Risk** - Continue current support strategies", unsafe_allow_html=True)
         recommendations = [
             "Maintain current learning pace and methods",
             "Continue regular progress monitoring",
@@ -250,7 +212,7 @@ def display_recommendations(risk_level, student_data):
         ]
         color = "#10b981"
     elif "Medium" in risk_level:
-        st.markdown(f"{get_material_icon_html('warning')} **Medium Risk** - Targeted interventions recommended", unsafe_allow_html=True)
+        page_markdown(f"{get_material_icon_html('warning')} **Medium Risk** - Targeted interventions recommended", unsafe_allow_html=True)
         recommendations = [
             "Implement targeted interventions in lower-performing areas",
             "Increase frequency of progress monitoring",
@@ -260,7 +222,7 @@ def display_recommendations(risk_level, student_data):
         ]
         color = "#f59e0b"
     else:
-        st.markdown(f"{get_material_icon_html('priority_high')} **High Risk** - Intensive intervention required", unsafe_allow_html=True)
+        page_markdown(f"{get_material_icon_html('priority_high')} **High Risk** - Intensive intervention required", unsafe_allow_html=True)
         recommendations = [
             "Initiate comprehensive assessment by learning specialists",
             "Implement intensive intervention strategies",
@@ -271,10 +233,58 @@ def display_recommendations(risk_level, student_data):
         ]
         color = "#ef4444"
     
-    st.markdown(f"### {get_material_icon_html('lightbulb')} Personalized Recommendations", unsafe_allow_html=True)
+    page_markdown(f"### {get_material_icon_html('lightbulb')} Personalized Recommendations", unsafe_allow_html=True)
     for i, rec in enumerate(recommendations, 1):
         st.write(f"{i}. {rec}")
 
+# --- Historical analysis charts (built once per data set, see utils.chart_utils) ---
+RISK_COLORS = {'Low Risk': '#10B981', 'Medium Risk': '#F59E0B', 'High Risk': '#EF4444'}
+
+def build_risk_trend_chart(daily_risks):
+    # One downsampled trace per risk level, so years of daily counts stay light
+    fig_trend = go.Figure([
+        line_trace(daily_risks.index, daily_risks[level], mode='lines', name=level,
+                   line=dict(color=RISK_COLORS.get(level)))
+        for level in daily_risks.columns
+    ])
+    fig_trend.update_layout(
+        title="Risk Level Trends Over Time",
+        legend_title_text="risk_level",
+        xaxis_title="Date",
+        yaxis_title="Number of Students",
+        height=400
+    )
+    return fig_trend
+
+def build_correlation_heatmap(corr_matrix):
+    fig_heatmap = px.imshow(corr_matrix, 
+                          text_auto=True, 
+                          title="Performance Indicators Correlation",
+                          color_continuous_scale="RdBu_r",
+                          aspect="auto")
+    fig_heatmap.update_layout(height=500)
+    return fig_heatmap
+
+def build_student_progress_chart(student_progress, student_name):
+    fig_progress = go.Figure(line_trace(student_progress['timestamp'], student_progress['probability'],
+                                        mode='lines+markers', name='probability'))
+    fig_progress.update_layout(
+        title=f"Learning Risk Trend for {student_name}",
+        xaxis_title="Assessment Date",
+        yaxis_title="Risk Probability",
+        height=400
+    )
+    return fig_progress
+
+def build_monthly_risk_chart(monthly_data):
+    fig_monthly = px.bar(monthly_data, title="Monthly Risk Level Distribution", color_discrete_map=RISK_COLORS)
+    fig_monthly.update_layout(
+        xaxis_title="Month",
+        yaxis_title="Number of Students",
+        height=400
+    )
+    return fig_monthly
+
 def main():
     # Authentication check
     if not is_authenticated():
@@ -291,13 +301,13 @@ def main():
     )
     
     # Enhanced hero section with multiple animations
-    st.markdown(f"### {get_material_icon_html('star')} Empowering Student Success Through Data-Driven Assessment", unsafe_allow_html=True)
+    page_markdown(f"### {get_material_icon_html('star')} Empowering Student Success Through Data-Driven Assessment", unsafe_allow_html=True)
     
     # Three-column animation layout
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.markdown(f"**{get_material_icon_html('analytics')} Data Analysis**", unsafe_allow_html=True)
+        page_markdown(f"**{get_material_icon_html('analytics')} Data Analysis**", unsafe_allow_html=True)
         render_lottie(
             "https://lottie.host/c5d32643-1965-4071-981e-d2ab6e40f0f7/cIUo7cX9X9.json",
             height=180,
@@ -308,7 +318,7 @@ def main():
         st.caption("Advanced analytics for student assessment")
     
     with col2:
-        st.markdown(f"**{get_material_icon_html('target')} Learning Success**", unsafe_allow_html=True)
+        page_markdown(f"**{get_material_icon_html('target')} Learning Success**", unsafe_allow_html=True)
         render_lottie(
             "https://lottie.host/c5dfa88a-8138-4928-9a9c-8f810f30419c/v5EB8t0KVf.json",
             height=180,
@@ -319,7 +329,7 @@ def main():
         st.caption("Celebrating educational achievements")
     
     with col3:
-        st.markdown(f"**{get_material_icon_html('science')} Evidence-Based Methods**", unsafe_allow_html=True)
+        page_markdown(f"**{get_material_icon_html('science')} Evidence-Based Methods**", unsafe_allow_html=True)
         render_lottie(
             "https://lottie.host/687a0991-917f-4d7b-92f6-d9ecaa0780b7/D75iWs83gn.json",
             height=180,
@@ -331,7 +341,7 @@ def main():
 
     # Enhanced sidebar for prediction options
     with st.sidebar:
-        st.markdown(f"### {get_material_icon_html('target')} Assessment Options", unsafe_allow_html=True)
+        page_markdown(f"### {get_material_icon_html('target')} Assessment Options", unsafe_allow_html=True)
         
         available_prediction_types = ["Individual Student Assessment", "Batch Student Upload", "Historical Data Analysis"]
         user_role = get_user_role()
@@ -343,8 +353,8 @@ def main():
         )
         
         # Enhanced model information panel
-        st.markdown(f"### {get_material_icon_html('smart_toy')} AI Model Information", unsafe_allow_html=True)
-        st.markdown(f"""
+        page_markdown(f"### {get_material_icon_html('smart_toy')} AI Model Information", unsafe_allow_html=True)
+        page_markdown(f"""
         <div style="border-left: 6px solid #1f77b4; background-color: #eaf4fc; padding: 1rem; border-radius: 5px;">
             <strong>Assessment Model Details</strong><br><br>
             <ul>
@@ -360,7 +370,7 @@ def main():
 
         
         # Show model features with icons
-        st.markdown(f"**{get_material_icon_html('checklist')} Assessment Criteria:**", unsafe_allow_html=True)
+        page_markdown(f"**{get_material_icon_html('checklist')} Assessment Criteria:**", unsafe_allow_html=True)
 
         features = [
             f"{get_material_icon_html('calculate')} Mathematics Score (0-100%)",
@@ -372,10 +382,10 @@ def main():
         ]
 
         for feature in features:
-            st.markdown(f"• {feature}", unsafe_allow_html=True)
+            page_markdown(f"• {feature}", unsafe_allow_html=True)
 
             
-        st.markdown(
+        page_markdown(
             f"""
             <div style="background-color: rgba(40,167,69,0.1); padding: 1rem; border-left: 5px solid #28a745; border-radius: 4px; color: #155724;">
                 {get_material_icon_html('check_circle')} AI model ready for student assessments
@@ -387,7 +397,7 @@ def main():
         
         uploaded_file = None
         if "Batch" in prediction_type:
-            st.markdown(f"#### {get_material_icon_html('folder')} Upload Student Data", unsafe_allow_html=True)
+            page_markdown(f"#### {get_material_icon_html('folder')} Upload Student Data", unsafe_allow_html=True)
             uploaded_file = st.file_uploader(
                 "Upload CSV file with student data",
                 type=['csv'],
@@ -399,7 +409,7 @@ def main():
     if prediction_type == "Individual Student Assessment":
         reset_counter = st.session_state.get('reset_counter', 0)
         
-        st.markdown(f"""
+        page_markdown(f"""
         <div class="input-section section-animated-text">
             <h2 class="highlight-text">Student Learning Assessment Form</h2>
             <p style="font-size: 1.1em; margin-bottom: 2rem; color: var(--gray-700);">
@@ -411,7 +421,7 @@ def main():
         col1, col2 = st.columns(2)
         
         with col1:
-            st.markdown(f"""
+            page_markdown(f"""
             <div class="input-section">
                 <h3 class="highlight-text">{get_material_icon_html('analytics')} Academic Performance Scores</h3>
             </div>
@@ -424,7 +434,7 @@ def main():
                                           help="Student's written expression and composition skills", key=f"writing_score_input_{reset_counter}")
             
         with col2:
-            st.markdown(f"""
+            page_markdown(f"""
             <div class="input-section">
                 <h3 class="highlight-text">{get_material_icon_html('psychology')} Behavioral & Social Indicators</h3>
             </div>
@@ -440,7 +450,7 @@ def main():
                                                 help="Assess the student's reading and literacy development stage", key=f"literacy_slider_{reset_counter}")
             literacy = int(literacy_selection.split(' ')[0])
         
-        st.markdown(f"""
+        page_markdown(f"""
         <div class="input-section">
             <h3 class="highlight-text">{get_material_icon_html('person')} Student Information</h3>
         </div>
@@ -479,7 +489,7 @@ def main():
                 st.session_state['reset_counter'] = 0
             st.session_state['reset_counter'] += 1
             
-            st.markdown(
+            page_markdown(
                 f"""
                 <div style="background-color: rgba(40,167,69,0.1); padding: 1rem; border-left: 5px solid #28a745; border-radius: 4px; color: #155724;">
                     {get_material_icon_html('check_circle')} Form completely reset! Ready for new student assessment.
@@ -496,7 +506,7 @@ def main():
             errors = validate_inputs(math_score, reading_score, writing_score, attendance, behavior, literacy)
             
             if errors:
-                st.markdown(
+                page_markdown(
                     f"""
                     <div style="background-color: rgba(220,53,69,0.1); padding: 1rem; border-left: 5px solid #dc3545; border-radius: 4px; color: #721c24;">
                         {get_material_icon_html('error')} <strong>Please correct the following errors:</strong>
@@ -530,7 +540,7 @@ def main():
                     }
                     
                     # Enhanced results display
-                    st.markdown(f"""
+                    page_markdown(f"""
                     <div class="results-section">
                         <h2 class="highlight-text">AI Assessment Results</h2>
                         <p style="font-size: 1.2em; text-align: center; color: var(--gray-700); margin-bottom: 2rem;">
@@ -552,7 +562,7 @@ def main():
                         risk_level = "High Risk"
                         risk_color = "#ef4444"
                         risk_icon = get_material_icon_html('priority_high')
-                    # st.markdown(f"""
+                    # page_markdown(f"""
                     #     <div style="padding: 1.5rem; border-radius: 8px; border: 2px solid {risk_color}; background-color: rgba(0,0,0,0.03); text-align: center;">
                     #         <div style="font-size: 2rem; color: {risk_color};">
                     #             {risk_icon}
@@ -565,7 +575,7 @@ def main():
                     # """, unsafe_allow_html=True)
 
                     # Risk level display with animation
-                    st.markdown(f"""
+                    page_markdown(f"""
                     <div style="text-align: center; background: linear-gradient(135deg, {risk_color}20, {risk_color}30); 
                          padding: 1.5rem; border-radius: 12px; margin-bottom: 2rem; border: 2px solid {risk_color}40;">
                         <h3 style="color: {risk_color}; margin-bottom: 0.5rem;">{risk_icon} Learning Risk Level: {risk_level}</h3>
@@ -579,11 +589,11 @@ def main():
                         animation_url = get_risk_animation_url(prediction_prob)
                         
                         if prediction_prob < 0.3:
-                            st.markdown(f"**{get_material_icon_html('celebration')} Excellent Progress - Continue Current Path**", unsafe_allow_html=True)
+                            page_markdown(f"**{get_material_icon_html('celebration')} Excellent Progress - Continue Current Path**", unsafe_allow_html=True)
                         elif prediction_prob < 0.7:
-                            st.markdown(f"**{get_material_icon_html('warning')} Attention Needed - Targeted Support Recommended**", unsafe_allow_html=True)
+                            page_markdown(f"**{get_material_icon_html('warning')} Attention Needed - Targeted Support Recommended**", unsafe_allow_html=True)
                         else:
-                            st.markdown(f"**{get_material_icon_html('priority_high')} Immediate Action - Comprehensive Intervention Required**", unsafe_allow_html=True)
+                            page_markdown(f"**{get_material_icon_html('priority_high')} Immediate Action - Comprehensive Intervention Required**", unsafe_allow_html=True)
                         
                         # render_lottie(
                         #     animation_url,
@@ -598,15 +608,15 @@ def main():
                     
                     viz_col1, viz_col2 = st.columns(2)
                     with viz_col1:
-                        st.plotly_chart(fig_gauge, use_container_width=True)
+                        render_chart(fig_gauge)
                     with viz_col2:
-                        st.plotly_chart(fig_radar, use_container_width=True)
+                        render_chart(fig_radar)
                     
                     # Recommendations
                     display_recommendations(risk_level, student_data)
                     
                     # Assessment summary
-                    st.markdown(f"### {get_material_icon_html('checklist')} Complete Assessment Summary", unsafe_allow_html=True)
+                    page_markdown(f"### {get_material_icon_html('checklist')} Complete Assessment Summary", unsafe_allow_html=True)
                     summary_data = {
                         "Assessment Area": ["Mathematics", "Reading Comprehension", "Writing Skills", "School Attendance", 
                                           "Classroom Behavior", "Literacy Development", "Overall Risk Level", "AI Confidence"],
@@ -626,8 +636,12 @@ def main():
                             "notes": notes,
                             **student_data
                         }
-                        save_prediction_data(prediction_record)
-                        st.success("Assessment saved successfully to database!")
+                        save_handle = enqueue_write('save_prediction', prediction_record)
+                        st.session_state.pop('hist_records_pages', None)
+                        if save_handle.wait(UI_CONFIRM_WAIT_SECONDS):
+                            st.success("Assessment saved successfully to database!")
+                        else:
+                            st.info("Assessment queued. It will be saved as soon as the connection allows.")
                 
                 except Exception as e:
                     st.error("Error processing assessment: {str(e)}")
@@ -646,17 +660,22 @@ def main():
                     st.error("Missing required columns: {', '.join(missing_columns)}")
                     st.info("Required columns: math_score, reading_score, writing_score, attendance, behavior, literacy")
                 else:
-                    st.markdown(f"### {get_material_icon_html('analytics')} Data Preview", unsafe_allow_html=True)
+                    page_markdown(f"### {get_material_icon_html('analytics')} Data Preview", unsafe_allow_html=True)
                     st.dataframe(df.head())
                     
                     if st.button("Process Batch Assessments", key="process_batch_predictions_button"):
                         progress_bar = st.progress(0)
-                        st.markdown("**Processing student assessments...**")
+                        page_markdown("**Processing student assessments...**")
                         results = []
+                        prediction_records = []
+                        unnamed_rows = []
+                        batch_started = datetime.now()
                         
                         for idx, row in df.iterrows():
                             try:
-                                prediction, prediction_prob = make_prediction(row.to_dict())
+                                # Plain Python values so the records can be stored as JSON
+                                row_data = {k: (v.item() if hasattr(v, 'item') else v) for k, v in row.to_dict().items()}
+                                prediction, prediction_prob = make_prediction(row_data)
                                 
                                 if prediction_prob < 0.3:
                                     risk_level = "Low Risk"
@@ -669,8 +688,25 @@ def main():
                                     'Student_ID': idx + 1,
                                     'Risk_Assessment': risk_level,
                                     'Confidence_Score': f"{prediction_prob:.1%}",
-                                    **row.to_dict()
+                                    **row_data
                                 })
+                                # Records are keyed by student name, so unnamed rows are not saved
+                                student_name = row_data.get('student_name')
+                                student_name = "" if pd.isna(student_name) else str(student_name).strip()
+                                if not student_name:
+                                    unnamed_rows.append(idx + 1)
+                                else:
+                                    prediction_records.append({
+                                        # One microsecond apart, so (student_name, timestamp) stays unique per row
+                                        "timestamp": (batch_started + timedelta(microseconds=idx)).isoformat(),
+                                        "grade_level": "Unknown",
+                                        "notes": "Batch upload",
+                                        **row_data,
+                                        "student_name": student_name,
+                                        "prediction": int(prediction),
+                                        "probability": float(prediction_prob),
+                                        "risk_level": risk_level
+                                    })
                                 
                                 progress_bar.progress((idx + 1) / len(df))
                             
@@ -678,7 +714,25 @@ def main():
                                 st.error("Error processing student {idx + 1}: {str(e)}")
                         
                         results_df = pd.DataFrame(results)
-                        st.markdown(f"### {get_material_icon_html('trending_up')} Batch Assessment Results", unsafe_allow_html=True)
+                        
+                        if unnamed_rows:
+                            st.warning(f"{len(unnamed_rows)} rows have no student_name and were not saved "
+                                       f"(rows {', '.join(map(str, unnamed_rows[:10]))}{'...' if len(unnamed_rows) > 10 else ''})")
+                        
+                        # Persist the whole batch in one write
+                        if prediction_records:
+                            save_started = time.perf_counter()
+                            saved_count = get_repository().save_predictions_bulk(prediction_records)
+                            invalidate_figures()
+                            st.session_state.pop('hist_records_pages', None)
+                            save_seconds = time.perf_counter() - save_started
+                            if saved_count:
+                                rows_per_second = saved_count / save_seconds if save_seconds else float('inf')
+                                st.success(f"Saved {saved_count} assessments in {save_seconds:.2f}s ({rows_per_second:,.0f} rows/s)")
+                            else:
+                                st.error("Could not save the batch assessments")
+                        
+                        page_markdown(f"### {get_material_icon_html('trending_up')} Batch Assessment Results", unsafe_allow_html=True)
                         st.dataframe(results_df)
                         
                         # Enhanced visualization
@@ -686,7 +740,7 @@ def main():
                         fig_pie = px.pie(values=risk_counts.values, names=risk_counts.index, 
                                          title="Student Risk Level Distribution",
                                          color_discrete_map={'Low Risk': '#10B981', 'Medium Risk': '#F59E0B', 'High Risk': '#EF4444'})
-                        st.plotly_chart(fig_pie, use_container_width=True)
+                        render_chart(fig_pie)
                         
                         csv = results_df.to_csv(index=False)
                         st.download_button(
@@ -704,7 +758,7 @@ def main():
             st.info(f"Please upload a CSV file to begin batch processing")
             
             # Show sample CSV format
-            st.markdown(f"### {get_material_icon_html('checklist')} Sample CSV Format", unsafe_allow_html=True)
+            page_markdown(f"### {get_material_icon_html('checklist')} Sample CSV Format", unsafe_allow_html=True)
             sample_data = pd.DataFrame({
                 'math_score': [85, 72, 93],
                 'reading_score': [78, 65, 89],
@@ -716,13 +770,15 @@ def main():
             st.dataframe(sample_data)
     
     else:  # Historical Data Analysis
-        st.markdown(f"### {get_material_icon_html('analytics')} Historical Assessment Analysis", unsafe_allow_html=True)
-        historical_data = load_student_data()
+        page_markdown(f"### {get_material_icon_html('analytics')} Historical Assessment Analysis", unsafe_allow_html=True)
+        # Only peek at the first record here; the records themselves are streamed below
+        try:
+            has_historical_data = next(iter(get_repository().iter_student_data()), None) is not None
+        except Exception as e:
+            st.error(f"Could not load the assessment history: {e}")
+            st.stop()
         
-        if historical_data:
-            df_historical = pd.DataFrame(historical_data)
-            df_historical['timestamp'] = pd.to_datetime(df_historical['timestamp'])
-            
+        if has_historical_data:
             # Enhanced analysis options
             analysis_col1, analysis_col2 = st.columns(2)
             
@@ -740,7 +796,7 @@ def main():
                     key="time_range_selector"
                 )
             
-            # Filter data based on time range
+            # Filter data based on time range while streaming, so only the selected window is materialized
             now = datetime.now()
             if time_range == "Last 30 Days":
                 cutoff = now - pd.Timedelta(days=30)
@@ -749,24 +805,36 @@ def main():
             elif time_range == "Last 6 Months":
                 cutoff = now - pd.Timedelta(days=180)
             else:
-                cutoff = df_historical['timestamp'].min()
+                cutoff = None
             
-            filtered_data = df_historical[df_historical['timestamp'] >= cutoff]
+            filtered_records = []
+            try:
+                for record in get_repository().iter_student_data():
+                    try:
+                        record_time = datetime.fromisoformat(str(record.get('timestamp')))
+                    except ValueError:
+                        continue
+                    if cutoff is None or record_time >= cutoff:
+                        filtered_records.append(record)
+            except Exception as e:
+                # A partial history would skew every chart below, so show none of it
+                st.error(f"Could not load the full assessment history: {e}")
+                st.stop()
+            
+            filtered_data = pd.DataFrame(filtered_records)
+            if filtered_data.empty:
+                filtered_data = pd.DataFrame(columns=['timestamp'])
+            filtered_data['timestamp'] = pd.to_datetime(filtered_data['timestamp'])
             
             if analysis_type == "Risk Trends Over Time":
-                st.markdown(f"#### {get_material_icon_html('trending_up')} Risk Level Trends Analysis", unsafe_allow_html=True)
+                page_markdown(f"#### {get_material_icon_html('trending_up')} Risk Level Trends Analysis", unsafe_allow_html=True)
                 
                 if 'risk_level' in filtered_data.columns:
                     daily_risks = filtered_data.groupby([filtered_data['timestamp'].dt.date, 'risk_level']).size().unstack(fill_value=0)
                     
-                    fig_trend = px.line(daily_risks, title="Risk Level Trends Over Time",
-                                       color_discrete_map={'Low Risk': '#10B981', 'Medium Risk': '#F59E0B', 'High Risk': '#EF4444'})
-                    fig_trend.update_layout(
-                        xaxis_title="Date",
-                        yaxis_title="Number of Students",
-                        height=400
-                    )
-                    st.plotly_chart(fig_trend, use_container_width=True)
+                    fig_trend = cached_figure('risk_trends', daily_risks, lambda: build_risk_trend_chart(daily_risks))
+                    render_chart(fig_trend)
+                    render_points_report(fig_trend)
                     
                     # Summary statistics
                     total_assessments = len(filtered_data)
@@ -788,7 +856,7 @@ def main():
                     st.warning(f"No risk level data available for trend analysis")
             
             elif analysis_type == "Performance Correlation Analysis":
-                st.markdown(f"#### {get_material_icon_html('link')} Academic Performance Correlation Matrix", unsafe_allow_html=True)
+                page_markdown(f"#### {get_material_icon_html('link')} Academic Performance Correlation Matrix", unsafe_allow_html=True)
                 
                 numeric_cols = ['math_score', 'reading_score', 'writing_score', 'attendance', 'behavior', 'literacy']
                 available_cols = [col for col in numeric_cols if col in filtered_data.columns]
@@ -796,16 +864,11 @@ def main():
                 if len(available_cols) >= 2:
                     corr_matrix = filtered_data[available_cols].corr()
                     
-                    fig_heatmap = px.imshow(corr_matrix, 
-                                          text_auto=True, 
-                                          title="Performance Indicators Correlation",
-                                          color_continuous_scale="RdBu_r",
-                                          aspect="auto")
-                    fig_heatmap.update_layout(height=500)
-                    st.plotly_chart(fig_heatmap, use_container_width=True)
+                    fig_heatmap = cached_figure('correlation', corr_matrix, lambda: build_correlation_heatmap(corr_matrix))
+                    render_chart(fig_heatmap)
                     
                     # Insights
-                    st.markdown(f"#### {get_material_icon_html('lightbulb')} Key Insights", unsafe_allow_html=True)
+                    page_markdown(f"#### {get_material_icon_html('lightbulb')} Key Insights", unsafe_allow_html=True)
                     strong_correlations = []
                     for i in range(len(corr_matrix.columns)):
                         for j in range(i+1, len(corr_matrix.columns)):
@@ -826,7 +889,7 @@ def main():
                     st.warning(f"Insufficient numeric data for correlation analysis")
             
             elif analysis_type == "Individual Student Progress":
-                st.markdown(f"#### {get_material_icon_html('person')} Individual Student Progress Tracking", unsafe_allow_html=True)
+                page_markdown(f"#### {get_material_icon_html('person')} Individual Student Progress Tracking", unsafe_allow_html=True)
                 
                 if 'student_name' in filtered_data.columns:
                     student_names = filtered_data['student_name'].dropna().unique()
@@ -839,15 +902,12 @@ def main():
                             
                             if len(student_progress) > 1:
                                 # Progress over time
-                                fig_progress = px.line(student_progress, x='timestamp', y='probability', 
-                                                     title=f"Learning Risk Trend for {selected_student}",
-                                                     markers=True)
-                                fig_progress.update_layout(
-                                    xaxis_title="Assessment Date",
-                                    yaxis_title="Risk Probability",
-                                    height=400
-                                )
-                                st.plotly_chart(fig_progress, use_container_width=True)
+                                progress_points = student_progress[['timestamp', 'probability']]
+                                fig_progress = cached_figure(
+                                    'student_risk_progress', (selected_student, progress_points),
+                                    lambda: build_student_progress_chart(progress_points, selected_student))
+                                render_chart(fig_progress)
+                                render_points_report(fig_progress)
                                 
                                 # Performance comparison
                                 if len(student_progress) >= 2:
@@ -865,7 +925,7 @@ def main():
                                         st.metric("Days Since Last Assessment", f"{days_between} days")
                                 
                                 # Detailed progress table
-                                st.markdown(f"#### {get_material_icon_html('analytics')} Assessment History", unsafe_allow_html=True)
+                                page_markdown(f"#### {get_material_icon_html('analytics')} Assessment History", unsafe_allow_html=True)
                                 progress_display = student_progress[['timestamp', 'math_score', 'reading_score', 'writing_score', 'attendance', 'behavior', 'literacy', 'risk_level', 'probability']].copy()
                                 progress_display['timestamp'] = progress_display['timestamp'].dt.strftime('%Y-%m-%d %H:%M')
                                 progress_display['probability'] = progress_display['probability'].apply(lambda x: f"{x:.1%}")
@@ -878,24 +938,19 @@ def main():
                     st.warning(f"Student name data not available")
             
             else:  # Intervention Effectiveness
-                st.markdown(f"#### {get_material_icon_html('target')} Intervention Effectiveness Analysis", unsafe_allow_html=True)
+                page_markdown(f"#### {get_material_icon_html('target')} Intervention Effectiveness Analysis", unsafe_allow_html=True)
                 
                 if 'risk_level' in filtered_data.columns and len(filtered_data) > 10:
                     # Analyze risk level changes over time
                     monthly_data = filtered_data.groupby([filtered_data['timestamp'].dt.to_period('M'), 'risk_level']).size().unstack(fill_value=0)
+                    monthly_data.index = monthly_data.index.astype(str)  # Periods aren't JSON serializable
                     
                     if len(monthly_data) > 1:
-                        fig_monthly = px.bar(monthly_data, title="Monthly Risk Level Distribution",
-                                           color_discrete_map={'Low Risk': '#10B981', 'Medium Risk': '#F59E0B', 'High Risk': '#EF4444'})
-                        fig_monthly.update_layout(
-                            xaxis_title="Month",
-                            yaxis_title="Number of Students",
-                            height=400
-                        )
-                        st.plotly_chart(fig_monthly, use_container_width=True)
+                        fig_monthly = cached_figure('monthly_risk', monthly_data, lambda: build_monthly_risk_chart(monthly_data))
+                        render_chart(fig_monthly)
                         
                         # Effectiveness metrics
-                        st.markdown(f"#### {get_material_icon_html('trending_up')} Intervention Impact Metrics", unsafe_allow_html=True)
+                        page_markdown(f"#### {get_material_icon_html('trending_up')} Intervention Impact Metrics", unsafe_allow_html=True)
                         
                         total_students = len(filtered_data['student_name'].unique()) if 'student_name' in filtered_data.columns else len(filtered_data)
                         high_risk_students = len(filtered_data[filtered_data['risk_level'] == 'High Risk'])
@@ -913,12 +968,35 @@ def main():
                         st.info(f"Insufficient data for monthly trend analysis")
                 else:
                     st.warning(f"Insufficient data for intervention effectiveness analysis")
+            
+            # Individual records, fetched a page at a time with keyset pagination
+            page_markdown(f"#### {get_material_icon_html('list')} Assessment Records", unsafe_allow_html=True)
+            records_state = st.session_state.get('hist_records_pages')
+            if records_state is None or records_state['key'] != time_range:
+                records, records_cursor = get_repository().page_student_data(HISTORY_PAGE_SIZE, start=cutoff)
+                records_state = {'key': time_range, 'records': records, 'cursor': records_cursor}
+                st.session_state['hist_records_pages'] = records_state
+            
+            record_columns = ['timestamp', 'student_name', 'grade_level', 'risk_level', 'probability',
+                              'math_score', 'reading_score', 'writing_score', 'attendance']
+            records_df = pd.DataFrame(records_state['records'])
+            if not records_df.empty:
+                st.dataframe(records_df[[c for c in record_columns if c in records_df.columns]],
+                             use_container_width=True, hide_index=True)
+            st.caption(f"Showing the {len(records_state['records'])} most recent assessments in this range")
+            
+            if records_state['cursor'] is not None:
+                if st.button("Load more assessments", key="hist_records_load_more"):
+                    more, records_state['cursor'] = get_repository().page_student_data(
+                        HISTORY_PAGE_SIZE, before=records_state['cursor'], start=cutoff)
+                    records_state['records'] = records_state['records'] + more
+                    st.rerun()
         else:
             st.info(f"No historical data available. Complete some assessments first to enable analysis!")
             
             # Show sample of what analysis would look like
-            st.markdown(f"### {get_material_icon_html('preview')} Available After Assessments", unsafe_allow_html=True)
-            st.markdown(f"""
+            page_markdown(f"### {get_material_icon_html('preview')} Available After Assessments", unsafe_allow_html=True)
+            page_markdown(f"""
             Once you've completed student assessments, you'll be able to:
             
             - **{get_material_icon_html('trending_up')} Track Risk Trends**: Monitor how student risk levels change over time
@@ -928,13 +1006,13 @@ def main():
             """, unsafe_allow_html=True)
 
     # Enhanced tips section
-    st.markdown("---")
-    st.markdown(f"### {get_material_icon_html('lightbulb')} Assessment Best Practices", unsafe_allow_html=True)
+    page_markdown("---")
+    page_markdown(f"### {get_material_icon_html('lightbulb')} Assessment Best Practices", unsafe_allow_html=True)
     
     tip_col1, tip_col2 = st.columns(2)
     
     with tip_col1:
-        st.markdown(f"""
+        page_markdown(f"""
         **{get_material_icon_html('target')} For Accurate Assessments:**
         - Gather data from multiple sources and timeframes
         - Consider external factors affecting performance
@@ -943,7 +1021,7 @@ def main():
         """, unsafe_allow_html=True)
     
     with tip_col2:
-        st.markdown(f"""
+        page_markdown(f"""
         **{get_material_icon_html('analytics')} Using Results Effectively:**
         - Use assessments as starting points for deeper evaluation
         - Combine AI insights with professional judgment
@@ -952,13 +1030,13 @@ def main():
         """, unsafe_allow_html=True)
     
     # Add help and support section
-    st.markdown("---")
-    st.markdown(f"### {get_material_icon_html('help')} Need Help?", unsafe_allow_html=True)
+    page_markdown("---")
+    page_markdown(f"### {get_material_icon_html('help')} Need Help?", unsafe_allow_html=True)
     
     help_col1, help_col2 = st.columns(2)
     
     with help_col1:
-        st.markdown(f"""
+        page_markdown(f"""
         **{get_material_icon_html('library_books')} Resources:**
         - [Assessment Guidelines](/#) - Best practices for student evaluation
         - [Interpretation Guide](/#) - Understanding risk levels and recommendations  
@@ -966,7 +1044,7 @@ def main():
         """, unsafe_allow_html=True)
     
     with help_col2:
-        st.markdown(f"""
+        page_markdown(f"""
         **{get_material_icon_html('phone')} Support:**
         - Email: support@eduscan.edu
         - Phone: (555) 123-4567
@@ -8,19 +8,11 @@ import random
 import sys
 import os
 
-# Add streamlit-lottie import
-try:
-    from streamlit_lottie import st_lottie
-    import requests
-    LOTTIE_AVAILABLE = True
-except ImportError:
-    LOTTIE_AVAILABLE = False
-    st.warning("streamlit-lottie not installed. Install with: pip install streamlit-lottie")
-
 # Append parent directory to sys.path to enable importing from utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.image_base64 import get_base64_images
+from utils.lottie_utils import render_lottie
 from utils.language_utils import get_text, load_app_settings, save_app_settings
 from utils.exact_ui import (
     add_exact_ui_styles,
@@ -32,6 +24,7 @@ from utils.exact_ui import (
 )
 from utils.auth_utils import is_authenticated, render_login_page, logout_user, get_user_role
 from utils.icon_utils import get_material_icon_html
+from utils.html_utils import page_markdown
 
 # Page config
 st.set_page_config(
@@ -57,7 +50,7 @@ if 'offline_mode' not in st.session_state:
 language = st.session_state.get('app_language', 'English')
 current_theme = st.session_state.get('app_theme', 'Light')
 
-st.markdown(f"""
+page_markdown(f"""
     <script>
         document.body.setAttribute('data-theme', '{current_theme}');
     </script>
@@ -65,54 +58,6 @@ st.markdown(f"""
 
 render_exact_sidebar()
 
-# Clean Lottie functions
-def load_lottie_url(url: str):
-    """Load Lottie animation with timeout"""
-    if not LOTTIE_AVAILABLE:
-        return None
-    try:
-        r = requests.get(url, timeout=5)
-        if r.status_code == 200:
-            return r.json()
-    except:
-        pass
-    return None
-
-def remove_lottie_background(lottie_json):
-    """Simple background removal"""
-    if not lottie_json:
-        return None
-    try:
-        if 'bg' in lottie_json:
-            del lottie_json['bg']
-        lottie_json['bg'] = None
-        return lottie_json
-    except:
-        return lottie_json
-
-def render_lottie(url, height=200, key=None, fallback_icon="school", fallback_text="Loading..."):
-    """Simple Lottie renderer with fallback"""
-    if LOTTIE_AVAILABLE:
-        lottie_json = load_lottie_url(url)
-        if lottie_json:
-            cleaned = remove_lottie_background(lottie_json)
-            try:
-                st_lottie(cleaned, height=height, key=key, speed=1, loop=True, quality="high")
-                return True
-            except:
-                pass
-    
-    # Elegant fallback
-    st.markdown(f"""
-    <div style="height: {height}px; display: flex; flex-direction: column; align-items: center; justify-content: center; 
-         background: linear-gradient(135deg, rgba(139, 92, 246, 0.1), rgba(59, 130, 246, 0.1)); 
-         border-radius: 12px; text-align: center; border: 2px dashed rgba(139, 92, 246, 0.3);">
-        <span class="material-symbols-outlined" style="font-size: 3rem; color: var(--primary-purple); margin-bottom: 0.5rem; animation: pulse 2s infinite;">{fallback_icon}</span>
-        <p style="color: var(--gray-600); margin: 0; font-weight: 500;">{fallback_text}</p>
-    </div>
-    """, unsafe_allow_html=True)
-    return False
-
 def generate_activity(difficulty_type, grade_level):
     """Generate a random educational activity based on difficulty type and grade level"""
     
@@ -225,13 +170,13 @@ def main():
     )
     
     # Enhanced hero section with multiple animations
-    st.markdown(f"### {get_material_icon_html('star')} Professional Excellence in Education",  unsafe_allow_html=True)
+    page_markdown(f"### {get_material_icon_html('star')} Professional Excellence in Education",  unsafe_allow_html=True)
     
     # Two-column layout for animations
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown(f"**{get_material_icon_html('groups')} Teacher Collaboration**", unsafe_allow_html=True)
+        page_markdown(f"**{get_material_icon_html('groups')} Teacher Collaboration**", unsafe_allow_html=True)
         render_lottie(
             "https://lottie.host/9dbf9a0f-b1fd-4b92-8215-e595745178d6/iFNBmCDQ5Z.json",
             height=250,
@@ -242,7 +187,7 @@ def main():
         st.caption("Building professional learning communities and collaborative support systems")
     
     with col2:
-        st.markdown(f"**{get_material_icon_html('library_books')} Innovative Teaching Methods**", unsafe_allow_html=True)
+        page_markdown(f"**{get_material_icon_html('library_books')} Innovative Teaching Methods**", unsafe_allow_html=True)
         render_lottie(
             "https://lottie.host/62286ecf-6779-4781-90a0-c747f05d5f8a/giBjeAZ9o4.json",
             height=250,
@@ -253,13 +198,13 @@ def main():
         st.caption("Implementing research-based strategies for diverse learners and inclusive classrooms")
 
     # Quick Assessment Tools
-    st.markdown("---")
-    st.markdown(f"### {get_material_icon_html('search')} Quick Assessment Tools", unsafe_allow_html=True)
+    page_markdown("---")
+    page_markdown(f"### {get_material_icon_html('search')} Quick Assessment Tools", unsafe_allow_html=True)
     
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("#### Student Risk Assessment")
+        page_markdown("#### Student Risk Assessment")
         student_name = st.text_input("Student Name", key="teacher_student_name")
         risk_indicators = st.multiselect(
             "Observed Risk Indicators",
@@ -277,7 +222,7 @@ def main():
                 st.warning("Please enter student name and select risk indicators")
     
     with col2:
-        st.markdown("#### Intervention Planning")
+        page_markdown("#### Intervention Planning")
         intervention_type = st.selectbox(
             "Intervention Type",
             ["Academic Support", "Behavioral Intervention", "Social Skills", "Family Engagement"],
@@ -294,16 +239,16 @@ def main():
             st.success(f"Intervention plan created successfully!")
             
             # Show sample intervention plan
-            st.markdown("**Suggested Intervention Plan:**")
+            page_markdown("**Suggested Intervention Plan:**")
             if intervention_type == "Academic Support":
-                st.markdown(f"""
+                page_markdown(f"""
                 - **Daily**: 15-minute focused skill practice
                 - **Weekly**: Progress assessment and adjustment
                 - **Resources**: Differentiated worksheets, educational games
                 - **Support**: Peer tutoring, teacher check-ins
                 """)
             elif intervention_type == "Behavioral Intervention":
-                st.markdown(f"""
+                page_markdown(f"""
                 - **Daily**: Behavior tracking chart
                 - **Weekly**: Positive reinforcement system review
                 - **Resources**: Social stories, self-regulation tools
@@ -311,14 +256,14 @@ def main():
                 """)
 
     # Resource categories with enhanced animations
-    st.markdown("---")
-    st.markdown(f"### {get_material_icon_html('library_books')} Evidence-Based Intervention Strategies", unsafe_allow_html=True)
+    page_markdown("---")
+    page_markdown(f"### {get_material_icon_html('library_books')} Evidence-Based Intervention Strategies", unsafe_allow_html=True)
     
     # Two animations for intervention strategies section
     intervention_col1, intervention_col2 = st.columns(2)
     
     with intervention_col1:
-        st.markdown(f"**{get_material_icon_html('target')} Targeted Intervention Strategies**", unsafe_allow_html=True)
+        page_markdown(f"**{get_material_icon_html('target')} Targeted Intervention Strategies**", unsafe_allow_html=True)
         render_lottie(
             "https://lottie.host/687a0991-917f-4d7b-92f6-d9ecaa0780b7/D75iWs83gm.json",
             height=280,
@@ -329,7 +274,7 @@ def main():
         st.caption("Research-proven strategies for supporting diverse learning needs")
     
     with intervention_col2:
-        st.markdown(f"**{get_material_icon_html('analytics')} Data-Driven Assessment**", unsafe_allow_html=True)
+        page_markdown(f"**{get_material_icon_html('analytics')} Data-Driven Assessment**", unsafe_allow_html=True)
         render_lottie(
             "https://lottie.host/8a1c9f65-4b8d-4e2f-9a3c-7f6e5d4c3b2a/M4X8jK9wR5.json",
             height=280,
@@ -343,7 +288,7 @@ def main():
     strategy_tabs = st.tabs([f"Reading Support", f"Math Interventions", f"Writing Help", f"Behavioral Strategies"])
     
     with strategy_tabs[0]:  # Reading Support
-        st.markdown("#### Proven Reading Intervention Techniques")
+        page_markdown("#### Proven Reading Intervention Techniques")
         
         strategies = [
             {
@@ -368,12 +313,12 @@ def main():
         
         for strategy in strategies:
             with st.expander(f"{strategy['title']}"):
-                st.markdown(f"**Description:** {strategy['description']}")
-                st.markdown(f"**Duration:** {strategy['duration']}")
-                st.markdown(f"**Materials:** {strategy['materials']}")
+                page_markdown(f"**Description:** {strategy['description']}")
+                page_markdown(f"**Duration:** {strategy['duration']}")
+                page_markdown(f"**Materials:** {strategy['materials']}")
     
     with strategy_tabs[1]:  # Math Interventions
-        st.markdown("#### Mathematics Support Strategies")
+        page_markdown("#### Mathematics Support Strategies")
         
         math_strategies = [
             {
@@ -392,12 +337,12 @@ def main():
         
         for strategy in math_strategies:
             with st.expander(f"{strategy['title']}"):
-                st.markdown(f"**Description:** {strategy['description']}")
-                st.markdown(f"**Duration:** {strategy['duration']}")
-                st.markdown(f"**Materials:** {strategy['materials']}")
+                page_markdown(f"**Description:** {strategy['description']}")
+                page_markdown(f"**Duration:** {strategy['duration']}")
+                page_markdown(f"**Materials:** {strategy['materials']}")
     
     with strategy_tabs[2]:  # Writing Help
-        st.markdown("#### Writing Development Support")
+        page_markdown("#### Writing Development Support")
         
         writing_strategies = [
             {
@@ -416,12 +361,12 @@ def main():
         
         for strategy in writing_strategies:
             with st.expander(f"{strategy['title']}"):
-                st.markdown(f"**Description:** {strategy['description']}")
-                st.markdown(f"**Duration:** {strategy['duration']}")
-                st.markdown(f"**Materials:** {strategy['materials']}")
+                page_markdown(f"**Description:** {strategy['description']}")
+                page_markdown(f"**Duration:** {strategy['duration']}")
+                page_markdown(f"**Materials:** {strategy['materials']}")
     
     with strategy_tabs[3]:  # Behavioral Strategies
-        st.markdown("#### Behavioral Support Techniques")
+        page_markdown("#### Behavioral Support Techniques")
         
         behavioral_strategies = [
             {
@@ -440,18 +385,18 @@ def main():
         
         for strategy in behavioral_strategies:
             with st.expander(f"{strategy['title']}"):
-                st.markdown(f"**Description:** {strategy['description']}")
-                st.markdown(f"**Duration:** {strategy['duration']}")
-                st.markdown(f"**Materials:** {strategy['materials']}")
+                page_markdown(f"**Description:** {strategy['description']}")
+                page_markdown(f"**Duration:** {strategy['duration']}")
+                page_markdown(f"**Materials:** {strategy['materials']}")
 
     # Progress Monitoring Tools
-    st.markdown("---")
-    st.markdown(f"### {get_material_icon_html('analytics')} Progress Monitoring & Documentation", unsafe_allow_html=True)
+    page_markdown("---")
+    page_markdown(f"### {get_material_icon_html('analytics')} Progress Monitoring & Documentation", unsafe_allow_html=True)
     
     monitor_col1, monitor_col2 = st.columns(2)
     
     with monitor_col1:
-        st.markdown("#### Weekly Progress Tracker")
+        page_markdown("#### Weekly Progress Tracker")
         
         tracking_student = st.text_input("Student Name", key="tracking_student")
         tracking_week = st.date_input("Week Starting", key="tracking_week")
@@ -469,19 +414,19 @@ def main():
                 st.success(f"Progress report saved successfully!")
                 
                 # Display summary
-                st.markdown("**Weekly Summary:**")
-                st.markdown(f"- **Student:** {tracking_student}")
-                st.markdown(f"- **Week:** {tracking_week}")
-                st.markdown(f"- **Academic Progress:** {academic_progress}/5")
-                st.markdown(f"- **Behavioral Progress:** {behavioral_progress}/5")
-                st.markdown(f"- **Engagement:** {engagement_level}/5")
+                page_markdown("**Weekly Summary:**")
+                page_markdown(f"- **Student:** {tracking_student}")
+                page_markdown(f"- **Week:** {tracking_week}")
+                page_markdown(f"- **Academic Progress:** {academic_progress}/5")
+                page_markdown(f"- **Behavioral Progress:** {behavioral_progress}/5")
+                page_markdown(f"- **Engagement:** {engagement_level}/5")
             else:
                 st.warning("Please enter student name")
     
     with monitor_col2:
-        st.markdown("#### Resource Library")
+        page_markdown("#### Resource Library")
         
-        st.markdown(f"""
+        page_markdown(f"""
         **{get_material_icon_html('folder')} Downloadable Resources:**
         - Intervention planning templates
         - Progress monitoring forms
@@ -498,14 +443,14 @@ def main():
             st.info(f"Resource pack would be downloaded in a real implementation")
 
     # Interactive Learning Activities Generator
-    st.markdown("---")
-    st.markdown(f"### {get_material_icon_html('extension')} Interactive Learning Activities Generator", unsafe_allow_html=True)
+    page_markdown("---")
+    page_markdown(f"### {get_material_icon_html('extension')} Interactive Learning Activities Generator", unsafe_allow_html=True)
     
     # Two animations for activity generation section
     activity_anim_col1, activity_anim_col2 = st.columns(2)
     
     with activity_anim_col1:
-        st.markdown(f"**{get_material_icon_html('casino')} Activity Generation Engine**", unsafe_allow_html=True)
+        page_markdown(f"**{get_material_icon_html('casino')} Activity Generation Engine**", unsafe_allow_html=True)
         render_lottie(
             "https://lottie.host/5940ae0a-4ef4-4f79-a517-abce94639765/H8tXMAPaUk.json",
             height=250,
@@ -516,7 +461,7 @@ def main():
         st.caption("Generate customized learning activities for any subject and grade level")
     
     with activity_anim_col2:
-        st.markdown(f"**{get_material_icon_html('tune')} Adaptive Learning Tools**", unsafe_allow_html=True)
+        page_markdown(f"**{get_material_icon_html('tune')} Adaptive Learning Tools**", unsafe_allow_html=True)
         render_lottie(
             "https://lottie.host/15c1c3e6-35bf-4933-bc7e-193fa1580efe/iwAfN5QwfZ.json",
             height=250,
@@ -547,7 +492,7 @@ def main():
     if st.button(f"Generate Custom Activity", key="gen_act_btn", type="primary"):
         activity = generate_activity(difficulty_type_act, grade_level_act)
         
-        st.markdown(f"### {get_material_icon_html('celebration')} Generated Activity", unsafe_allow_html=True)
+        page_markdown(f"### {get_material_icon_html('celebration')} Generated Activity", unsafe_allow_html=True)
         st.info(f"**Activity**: {activity}")
         
         # Customize materials and objectives based on activity type
@@ -569,17 +514,17 @@ def main():
 
         col_mat, col_obj = st.columns(2)
         with col_mat:
-            st.markdown(f"**{get_material_icon_html('checklist')} Materials Needed:**", unsafe_allow_html=True)
+            page_markdown(f"**{get_material_icon_html('checklist')} Materials Needed:**", unsafe_allow_html=True)
             for material in materials:
                 st.write(f"• {material}")
         with col_obj:
-            st.markdown(f"**{get_material_icon_html('target')} Learning Objectives:**", unsafe_allow_html=True)
+            page_markdown(f"**{get_material_icon_html('target')} Learning Objectives:**", unsafe_allow_html=True)
             for obj in objectives:
                 st.write(f"• {obj}")
 
     # Help and Support
-    st.markdown("---")
-    st.markdown(f"""
+    page_markdown("---")
+    page_markdown(f"""
     ### {get_material_icon_html('lightbulb')} Need Additional Support?
     
     **Contact Information:**
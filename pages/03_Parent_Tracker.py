@@ -8,18 +8,12 @@ from datetime import datetime, date, timedelta
 import os
 import sys
 
-# Enhanced Lottie import
-try:
-    from streamlit_lottie import st_lottie
-    import requests
-    LOTTIE_AVAILABLE = True
-except ImportError:
-    LOTTIE_AVAILABLE = False
 
 # Append parent directory to sys.path to enable importing from utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.data_utils import save_parent_observation, load_parent_observations
+from utils.repository import get_repository
+from utils.lottie_utils import render_lottie
 from utils.language_utils import load_app_settings
 from utils.exact_ui import (
     add_exact_ui_styles,
@@ -28,6 +22,11 @@ from utils.exact_ui import (
 )
 from utils.auth_utils import is_authenticated, get_user_role
 from utils.icon_utils import get_material_icon_html
+from utils.html_utils import page_markdown
+from utils.compaction_utils import start_compaction_worker
+from utils.sync_utils import start_sync_worker
+from utils.write_queue_utils import start_write_queue, enqueue_write, UI_CONFIRM_WAIT_SECONDS
+from utils.chart_utils import cached_figure, line_trace, render_chart, render_points_report
 
 # Page config
 st.set_page_config(
@@ -40,6 +39,13 @@ st.set_page_config(
 # Apply styles and initialize
 add_exact_ui_styles()
 
+# Background compaction of the data files (starts once per process, off the request path)
+start_compaction_worker()
+# Background writer for saves (also flushes anything left queued by a previous run)
+start_write_queue()
+# Reconcile with the central database while online (no-op unless EDUSCAN_SYNC_SERVER is set)
+start_sync_worker()
+
 if 'app_language' not in st.session_state:
     settings = load_app_settings()
     st.session_state['app_language'] = settings.get('language', 'English')
@@ -53,7 +59,7 @@ if 'offline_mode' not in st.session_state:
 language = st.session_state.get('app_language', 'English')
 current_theme = st.session_state.get('app_theme', 'Light')
 
-st.markdown(f"""
+page_markdown(f"""
     <script>
         document.body.setAttribute('data-theme', '{current_theme}');
     </script>
@@ -67,56 +73,21 @@ if 'parent_data' not in st.session_state:
 if 'weekly_data' not in st.session_state:
     st.session_state['weekly_data'] = []
 
-# Clean Lottie functions
-def load_lottie_url(url: str):
-    """Load Lottie animation with timeout"""
-    if not LOTTIE_AVAILABLE:
-        return None
-    try:
-        r = requests.get(url, timeout=5)
-        if r.status_code == 200:
-            return r.json()
-    except:
-        pass
-    return None
-
-def remove_lottie_background(lottie_json):
-    """Simple background removal"""
-    if not lottie_json:
-        return None
-    try:
-        if 'bg' in lottie_json:
-            del lottie_json['bg']
-        lottie_json['bg'] = None
-        return lottie_json
-    except:
-        return lottie_json
+# Observations shown per "load more" step in the Observations Log
+OBSERVATION_LOG_PAGE_SIZE = 25
 
-def render_lottie(url, height=200, key=None, fallback_icon="family_restroom", fallback_text="Loading..."):
-    """Simple Lottie renderer with fallback"""
-    if LOTTIE_AVAILABLE:
-        lottie_json = load_lottie_url(url)
-        if lottie_json:
-            cleaned = remove_lottie_background(lottie_json)
-            try:
-                st_lottie(cleaned, height=height, key=key, speed=1, loop=True, quality="high")
-                return True
-            except:
-                pass
-    
-    # Elegant fallback
-    st.markdown(f"""
-    <div style="height: {height}px; display: flex; flex-direction: column; align-items: center; justify-content: center; 
-         background: linear-gradient(135deg, rgba(139, 92, 246, 0.1), rgba(59, 130, 246, 0.1)); 
-         border-radius: 12px; text-align: center; border: 2px dashed rgba(139, 92, 246, 0.3);">
-        <span class="material-symbols-outlined" style="font-size: 3rem; color: var(--primary-purple); margin-bottom: 0.5rem; animation: pulse 2s infinite;">{fallback_icon}</span>
-        <p style="color: var(--gray-600); margin: 0; font-weight: 500;">{fallback_text}</p>
-    </div>
-    """, unsafe_allow_html=True)
-    return False
+def load_day_observations(child_name, day, behavior_value=None):
+    """A child's observations on one day, optionally only those with the given behavior rating"""
+    return [obs for obs in get_repository().load_child_observations(child_name, day, day)
+            if behavior_value is None or obs['behavior_rating'] == behavior_value]
 
 def create_progress_chart(data, metric):
-    """Create enhanced progress chart for specific metric"""
+    """Create enhanced progress chart for specific metric (built once per data set)"""
+    if not data:
+        return None
+    return cached_figure('progress', (data, metric), lambda: _build_progress_chart(data, metric))
+
+def _build_progress_chart(data, metric):
     df = pd.DataFrame(data)
     if df.empty:
         return None
@@ -136,10 +107,14 @@ def create_progress_chart(data, metric):
     
     color = color_map.get(metric, '#6b7280')
     
-    fig = px.line(df, x='date', y=metric, 
-                  title=f"{metric.replace('_', ' ').title()} Progress Over Time",
-                  markers=True,
-                  color_discrete_sequence=[color])
+    # Years of daily entries are downsampled to the chart width before plotting
+    fig = go.Figure(line_trace(
+        df['date'], df[metric],
+        mode='lines+markers',
+        name=metric.replace('_', ' ').title(),
+        line=dict(color=color),
+        marker=dict(color=color)
+    ))
     
     # UPDATED layout for progress charts
     fig.update_layout(
@@ -198,6 +173,9 @@ def create_weekly_summary(data):
     if weekly_avg.empty:
         return None, None
 
+    return cached_figure('weekly_summary', weekly_avg, lambda: _build_weekly_summary_chart(weekly_avg)), weekly_avg
+
+def _build_weekly_summary_chart(weekly_avg):
     # Create enhanced summary chart
     fig = go.Figure()
     
@@ -264,7 +242,7 @@ def create_weekly_summary(data):
         )
     )
     
-    return fig, weekly_avg
+    return fig
 
 def main():
     # Authentication check
@@ -290,13 +268,13 @@ def main():
     )
     
     # Enhanced hero section with multiple animations
-    st.markdown(f"###  Strengthening Home-School Connections", unsafe_allow_html=True)
+    page_markdown(f"###  Strengthening Home-School Connections", unsafe_allow_html=True)
     
     # Three-column animation layout
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.markdown(f"**{get_material_icon_html('track_changes')} Progress Tracking**", unsafe_allow_html=True)
+        page_markdown(f"**{get_material_icon_html('track_changes')} Progress Tracking**", unsafe_allow_html=True)
         render_lottie(
             "https://lottie.host/ceff5ec9-b733-44f1-b68e-aa9d6676297d/xGcBHYi1ID.json",
             height=200,
@@ -307,7 +285,7 @@ def main():
         st.caption("Track daily learning activities and behaviors")
     
     with col2:
-        st.markdown(f"**{get_material_icon_html('diversity_3')} Family Support**", unsafe_allow_html=True)
+        page_markdown(f"**{get_material_icon_html('diversity_3')} Family Support**", unsafe_allow_html=True)
         render_lottie(
             "https://lottie.host/ed479bf5-36af-4dd8-84f2-f5893f0687f9/Tgc64kKeCO.json",
             height=200,
@@ -318,7 +296,7 @@ def main():
         st.caption("Building strong family-school partnerships")
     
     with col3:
-        st.markdown(f"**{get_material_icon_html('target')} Student Success**", unsafe_allow_html=True)
+        page_markdown(f"**{get_material_icon_html('target')} Student Success**", unsafe_allow_html=True)
         render_lottie(
             "https://lottie.host/4e1ac443-9c90-4a25-b20d-c918d5a0290f/pa2Qd9xE5l.json",
             height=200,
@@ -329,13 +307,13 @@ def main():
         st.caption("Celebrating learning milestones together")
 
     # Enhanced impact cards
-    st.markdown("---")
-    st.markdown(f"### {get_material_icon_html('lightbulb')} Family Engagement Impact", unsafe_allow_html=True)
+    page_markdown("---")
+    page_markdown(f"### {get_material_icon_html('lightbulb')} Family Engagement Impact", unsafe_allow_html=True)
     
     impact_col1, impact_col2 = st.columns(2)
     
     with impact_col1:
-        st.markdown(f"""
+        page_markdown(f"""
         <div style="text-align: center; padding: 2rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
              border-radius: 16px; color: white; margin-bottom: 1rem; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
             <h3>{get_material_icon_html('trending_up')} Academic Growth</h3>
@@ -346,7 +324,7 @@ def main():
         </div>
         """, unsafe_allow_html=True)
         
-        st.markdown(f"""
+        page_markdown(f"""
         <div style="text-align: center; padding: 2rem; background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%); 
              border-radius: 16px; color: white; margin-bottom: 1rem; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
             <h3>{get_material_icon_html('handshake')} School Communication</h3>
@@ -358,7 +336,7 @@ def main():
         """, unsafe_allow_html=True)
     
     with impact_col2:
-        st.markdown(f"""
+        page_markdown(f"""
         <div style="text-align: center; padding: 2rem; background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); 
              border-radius: 16px; color: white; margin-bottom: 1rem; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
             <h3>{get_material_icon_html('sentiment_satisfied')} Social-Emotional Health</h3>
@@ -369,7 +347,7 @@ def main():
         </div>
         """, unsafe_allow_html=True)
         
-        st.markdown(f"""
+        page_markdown(f"""
         <div style="text-align: center; padding: 2rem; background: linear-gradient(135deg, #43e97b 0%, #38f9d7 100%); 
              border-radius: 16px; color: white; margin-bottom: 1rem; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
             <h3>{get_material_icon_html('home')} Home Environment</h3>
@@ -382,7 +360,7 @@ def main():
 
     # Enhanced sidebar
     with st.sidebar:
-        st.markdown(f"### {get_material_icon_html('person')} Child Information", unsafe_allow_html=True)
+        page_markdown(f"### {get_material_icon_html('person')} Child Information", unsafe_allow_html=True)
         
         # Child selection with better UX
         child_name = st.text_input(
@@ -396,13 +374,12 @@ def main():
             st.success( f"Tracking progress for **{child_name}**")
             
             # Show quick stats if data exists
-            all_observations = load_parent_observations()
-            child_observations = [obs for obs in all_observations if obs.get('child_name') == child_name]
+            child_observations = get_repository().load_child_observations(child_name)
             
             if child_observations:
                 st.metric("Total Observations", len(child_observations))
                 
-                latest_obs = max(child_observations, key=lambda x: x['date'])
+                latest_obs = child_observations[-1]  # Index returns oldest first
                 latest_date = date.fromisoformat(latest_obs['date'])
                 days_since = (date.today() - latest_date).days
                 
@@ -413,7 +390,7 @@ def main():
                 else:
                     st.warning( f"Last entry: {days_since} days ago")
         
-        st.markdown(f"### {get_material_icon_html('target')} Dashboard Views", unsafe_allow_html=True)
+        page_markdown(f"### {get_material_icon_html('target')} Dashboard Views", unsafe_allow_html=True)
         dashboard_view = st.selectbox(
             "Choose your view:",
             ["Daily Entry", "Progress Tracking", "Weekly Summary", "Observations Log"],
@@ -423,7 +400,7 @@ def main():
         
         # Enhanced date range for analysis
         if dashboard_view in ["Progress Tracking", "Weekly Summary"]:
-            st.markdown(f"###  Analysis Period", unsafe_allow_html=True)
+            page_markdown(f"###  Analysis Period", unsafe_allow_html=True)
             
             period_preset = st.selectbox(
                 "Quick periods:",
@@ -447,7 +424,7 @@ def main():
 
     # Main content based on selected view
     if not child_name:
-        st.markdown(f"""
+        page_markdown(f"""
         <div style="text-align: center; padding: 3rem; background: linear-gradient(135deg, rgba(139, 92, 246, 0.1), rgba(59, 130, 246, 0.1)); 
              border-radius: 16px; border: 2px dashed rgba(139, 92, 246, 0.3);">
             <span class="material-symbols-outlined" style="font-size: 4rem; color: var(--primary-purple); margin-bottom: 1rem;">child_care</span>
@@ -462,13 +439,12 @@ def main():
         if 'daily_entry_reset_counter' not in st.session_state:
             st.session_state['daily_entry_reset_counter'] = 0
 
-        st.markdown(f"##  Daily Observation Entry")
-        st.markdown(f"Recording observations for **{child_name}** on {date.today().strftime('%A, %B %d, %Y')}", unsafe_allow_html=True)
+        page_markdown(f"##  Daily Observation Entry")
+        page_markdown(f"Recording observations for **{child_name}** on {date.today().strftime('%A, %B %d, %Y')}", unsafe_allow_html=True)
         
         # Check if entry exists for today
-        all_observations = load_parent_observations()
-        today_entry = next((obs for obs in all_observations 
-                           if obs.get('child_name') == child_name and obs['date'] == date.today().isoformat()), None)
+        todays_observations = get_repository().load_child_observations(child_name, date.today(), date.today())
+        today_entry = todays_observations[-1] if todays_observations else None
         
         if today_entry:
             st.info( "You already have an entry for today. You can update it by submitting again.")
@@ -477,7 +453,7 @@ def main():
             col1, col2 = st.columns(2)
             
             with col1:
-                st.markdown(f"### {get_material_icon_html('library_books')} Academic Activities", unsafe_allow_html=True)
+                page_markdown(f"### {get_material_icon_html('library_books')} Academic Activities", unsafe_allow_html=True)
                 
                 homework_completion = st.slider(
                     "Homework Completion (%)", 
@@ -508,7 +484,7 @@ def main():
                 )
             
             with col2:
-                st.markdown(f"### {get_material_icon_html('psychology')} Behavioral & Emotional", unsafe_allow_html=True)
+                page_markdown(f"### {get_material_icon_html('psychology')} Behavioral & Emotional", unsafe_allow_html=True)
                 
                 behavior_rating = st.select_slider(
                     "Overall Behavior Rating", 
@@ -542,7 +518,7 @@ def main():
                     key=f"pt_energy_level_input_{st.session_state['daily_entry_reset_counter']}"
                 )
             
-            st.markdown(f"### {get_material_icon_html('edit')} Detailed Observations", unsafe_allow_html=True)
+            page_markdown(f"### {get_material_icon_html('edit')} Detailed Observations", unsafe_allow_html=True)
             
             col3, col4 = st.columns(2)
             
@@ -576,7 +552,7 @@ def main():
                     key=f"pt_social_interactions_input_{st.session_state['daily_entry_reset_counter']}"
                 )
             
-            st.markdown(f"### {get_material_icon_html('home')} Home Environment Factors", unsafe_allow_html=True)
+            page_markdown(f"### {get_material_icon_html('home')} Home Environment Factors", unsafe_allow_html=True)
             
             col5, col6 = st.columns(2)
             
@@ -641,20 +617,15 @@ def main():
                     "timestamp": datetime.now().isoformat()
                 }
                 
-                # Save to both persistent storage and session state
-                save_parent_observation(observation_data)
-                
-                # Also save to session state for immediate access
-                if 'parent_data' not in st.session_state:
-                    st.session_state['parent_data'] = []
-                
-                # Remove any existing entry for today and add the new one
-                st.session_state['parent_data'] = [obs for obs in st.session_state['parent_data'] 
-                                                 if not (obs.get('child_name') == child_name and obs['date'] == date.today().isoformat())]
-                st.session_state['parent_data'].append(observation_data)
-                
-                st.success( "Daily observation saved successfully!")
-                st.balloons()
+                # Upsert: replaces today's entry for this child if one already exists.
+                # Written in the background so a slow connection doesn't block the page.
+                save_handle = enqueue_write('save_parent_observation', observation_data)
+                st.session_state.pop('pt_log_pages', None)
+                if save_handle.wait(UI_CONFIRM_WAIT_SECONDS):
+                    st.success( "Daily observation saved successfully!")
+                    st.balloons()
+                else:
+                    st.info("Daily observation queued. It will be saved as soon as the connection allows.")
             
             if clear_button:
                 st.session_state['daily_entry_reset_counter'] += 1
@@ -663,29 +634,24 @@ def main():
             # Handle delete button if today's entry exists
             if today_entry and 'delete_button' in locals() and delete_button:
                 # Remove today's entry from observations
-                all_observations = [obs for obs in all_observations 
-                                  if not (obs.get('child_name') == child_name and obs['date'] == date.today().isoformat())]
-                # Note: In a real implementation, you would save this back to your data store
-                st.success( "Today's entry has been deleted!")
+                delete_handle = enqueue_write('delete_parent_observation',
+                                              {'child_name': child_name, 'date': date.today().isoformat()})
+                st.session_state.pop('pt_log_pages', None)
+                if delete_handle.wait(UI_CONFIRM_WAIT_SECONDS):  # so the rerun usually reflects it
+                    st.success( "Today's entry has been deleted!")
+                else:
+                    st.info("Delete queued. Today's entry will be removed as soon as the connection allows.")
                 st.rerun()
 
     elif dashboard_view == "Progress Tracking":
-        st.markdown(f"## {get_material_icon_html('trending_up')} Progress Analysis Dashboard", unsafe_allow_html=True)
-        st.markdown(f"Comprehensive analysis for **{child_name}** from {start_date} to {end_date}")
+        page_markdown(f"## {get_material_icon_html('trending_up')} Progress Analysis Dashboard", unsafe_allow_html=True)
+        page_markdown(f"Comprehensive analysis for **{child_name}** from {start_date} to {end_date}")
         
         # Load observations properly
-        all_observations = load_parent_observations()
-        
-        # Add any session state data if it exists
-        if 'parent_data' in st.session_state and st.session_state['parent_data']:
-            all_observations.extend(st.session_state['parent_data'])
-        
-        child_observations = [obs for obs in all_observations 
-                            if obs.get('child_name') == child_name 
-                            and start_date <= date.fromisoformat(obs['date']) <= end_date]
+        child_observations = get_repository().load_child_observations(child_name, start_date, end_date)
         
         if not child_observations:
-            st.markdown(f"""
+            page_markdown(f"""
             <div style="text-align: center; padding: 2rem; background: rgba(251, 191, 36, 0.1); 
                  border-radius: 12px; border: 2px dashed rgba(251, 191, 36, 0.5);">
                 <span class="material-symbols-outlined" style="font-size: 3rem; color: #f59e0b; margin-bottom: 1rem;">trending_up</span>
@@ -696,7 +662,7 @@ def main():
             return
         
         # Enhanced overview metrics
-        st.markdown(f"### {get_material_icon_html('analytics')} Quick Overview", unsafe_allow_html=True)
+        page_markdown(f"### {get_material_icon_html('analytics')} Quick Overview", unsafe_allow_html=True)
         
         df = pd.DataFrame(child_observations)
         
@@ -726,36 +692,38 @@ def main():
         tab1, tab2, tab3, tab4 = st.tabs([f"Academic", f"Behavioral", f"Emotional", f"Health & Lifestyle"])
         
         with tab1:
-            st.markdown("### Academic Performance Trends")
+            page_markdown("### Academic Performance Trends")
             
             col1, col2 = st.columns(2)
             
             with col1:
-                st.markdown("""
+                page_markdown("""
                 <div style="border: 1px solid var(--border-color); border-radius: 8px; padding: 10px; margin-bottom: 15px; background-color: var(--card-background);">
                 """, unsafe_allow_html=True) # Start of styled div
                 homework_fig = create_progress_chart(child_observations, 'homework_completion')
                 if homework_fig:
-                    st.plotly_chart(homework_fig, use_container_width=True)
-                st.markdown("</div>", unsafe_allow_html=True) # End of styled div
+                    render_chart(homework_fig)
+                    render_points_report(homework_fig)
+                page_markdown("</div>", unsafe_allow_html=True) # End of styled div
             
             with col2:
-                st.markdown("""
+                page_markdown("""
                 <div style="border: 1px solid var(--border-color); border-radius: 8px; padding: 10px; margin-bottom: 15px; background-color: var(--card-background);">
                 """, unsafe_allow_html=True) # Start of styled div
                 reading_fig = create_progress_chart(child_observations, 'reading_time')
                 if reading_fig:
-                    st.plotly_chart(reading_fig, use_container_width=True)
-                st.markdown("</div>", unsafe_allow_html=True) # End of styled div
+                    render_chart(reading_fig)
+                    render_points_report(reading_fig)
+                page_markdown("</div>", unsafe_allow_html=True) # End of styled div
             
-            st.markdown(f"#### {get_material_icon_html('analytics')} Subject Difficulty Analysis", unsafe_allow_html=True)
+            page_markdown(f"#### {get_material_icon_html('analytics')} Subject Difficulty Analysis", unsafe_allow_html=True)
             
             all_subjects = []
             for obs in child_observations:
                 all_subjects.extend(obs.get('subjects_struggled', []))
             
             if all_subjects:
-                st.markdown("""
+                page_markdown("""
                 <div style="border: 1px solid var(--border-color); border-radius: 8px; padding: 10px; margin-bottom: 15px; background-color: var(--card-background);">
                 """, unsafe_allow_html=True) # Start of styled div
                 subject_counts = pd.Series(all_subjects).value_counts()
@@ -801,8 +769,8 @@ def main():
                         font_family='Inter'
                     )
                 )
-                st.plotly_chart(fig_subjects, use_container_width=True)
-                st.markdown("</div>", unsafe_allow_html=True) # End of styled div
+                render_chart(fig_subjects)
+                page_markdown("</div>", unsafe_allow_html=True) # End of styled div
                 
                 # Insights
                 most_difficult = subject_counts.index[0] if len(subject_counts) > 0 else None
@@ -812,14 +780,15 @@ def main():
                 st.success( "Excellent! No subject difficulties recorded in this period.")
         
         with tab2:
-            st.markdown("### Behavioral Progress Analysis")
-            st.markdown("""
+            page_markdown("### Behavioral Progress Analysis")
+            page_markdown("""
             <div style="border: 1px solid var(--border-color); border-radius: 8px; padding: 10px; margin-bottom: 15px; background-color: var(--card-background);">
             """, unsafe_allow_html=True) # Start of styled div
             behavior_fig = create_progress_chart(child_observations, 'behavior_rating')
             if behavior_fig:
-                st.plotly_chart(behavior_fig, use_container_width=True)
-            st.markdown("</div>", unsafe_allow_html=True) # End of styled div
+                render_chart(behavior_fig)
+                render_points_report(behavior_fig)
+            page_markdown("</div>", unsafe_allow_html=True) # End of styled div
 
             col1, col2, col3 = st.columns(3)
             
@@ -850,8 +819,8 @@ def main():
                     st.metric("Behavior Trend", "Need more data")
             
             # Behavior distribution
-            st.markdown("#### Behavior Rating Distribution")
-            st.markdown("""
+            page_markdown("#### Behavior Rating Distribution")
+            page_markdown("""
             <div style="border: 1px solid var(--border-color); border-radius: 8px; padding: 10px; margin-bottom: 15px; background-color: var(--card-background);">
             """, unsafe_allow_html=True) # Start of styled div
             behavior_dist = df['behavior_rating'].value_counts().sort_index()
@@ -884,24 +853,25 @@ def main():
                     font_family='Inter'
                 )
             )
-            st.plotly_chart(fig_behavior_dist, use_container_width=True)
-            st.markdown("</div>", unsafe_allow_html=True) # End of styled div
+            render_chart(fig_behavior_dist)
+            page_markdown("</div>", unsafe_allow_html=True) # End of styled div
         
         with tab3:
-            st.markdown("### Emotional Well-being Tracking")
-            st.markdown("""
+            page_markdown("### Emotional Well-being Tracking")
+            page_markdown("""
             <div style="border: 1px solid var(--border-color); border-radius: 8px; padding: 10px; margin-bottom: 15px; background-color: var(--card-background);">
             """, unsafe_allow_html=True) # Start of styled div
             mood_fig = create_progress_chart(child_observations, 'mood_rating')
             if mood_fig:
-                st.plotly_chart(mood_fig, use_container_width=True)
-            st.markdown("</div>", unsafe_allow_html=True) # End of styled div
+                render_chart(mood_fig)
+                render_points_report(mood_fig)
+            page_markdown("</div>", unsafe_allow_html=True) # End of styled div
             
             col1, col2 = st.columns(2)
             
             with col1:
-                st.markdown("#### Mood Distribution")
-                st.markdown("""
+                page_markdown("#### Mood Distribution")
+                page_markdown("""
                 <div style="border: 1px solid var(--border-color); border-radius: 8px; padding: 10px; margin-bottom: 15px; background-color: var(--card-background);">
                 """, unsafe_allow_html=True) # Start of styled div
                 mood_dist = df['mood_rating'].value_counts().sort_index()
@@ -934,11 +904,11 @@ def main():
                         font_family='Inter'
                     )
                 )
-                st.plotly_chart(fig_mood_dist, use_container_width=True)
-                st.markdown("</div>", unsafe_allow_html=True) # End of styled div
+                render_chart(fig_mood_dist)
+                page_markdown("</div>", unsafe_allow_html=True) # End of styled div
             
             with col2:
-                st.markdown("#### Emotional Insights")
+                page_markdown("#### Emotional Insights")
                 avg_mood = df['mood_rating'].mean()
                 happy_days = len(df[df['mood_rating'] >= 4])
                 total_days = len(df)
@@ -964,29 +934,31 @@ def main():
                         st.warning( "Recent mood has been lower than average")
         
         with tab4:
-            st.markdown("### Health & Lifestyle Analysis")
+            page_markdown("### Health & Lifestyle Analysis")
             
             col1, col2 = st.columns(2)
             
             with col1:
-                st.markdown("""
+                page_markdown("""
                 <div style="border: 1px solid var(--border-color); border-radius: 8px; padding: 10px; margin-bottom: 15px; background-color: var(--card-background);">
                 """, unsafe_allow_html=True) # Start of styled div
                 sleep_fig = create_progress_chart(child_observations, 'sleep_hours')
                 if sleep_fig:
-                    st.plotly_chart(sleep_fig, use_container_width=True)
-                st.markdown("</div>", unsafe_allow_html=True) # End of styled div
+                    render_chart(sleep_fig)
+                    render_points_report(sleep_fig)
+                page_markdown("</div>", unsafe_allow_html=True) # End of styled div
             
             with col2:
-                st.markdown("""
+                page_markdown("""
                 <div style="border: 1px solid var(--border-color); border-radius: 8px; padding: 10px; margin-bottom: 15px; background-color: var(--card-background);">
                 """, unsafe_allow_html=True) # Start of styled div
                 activity_fig = create_progress_chart(child_observations, 'physical_activity')
                 if activity_fig:
-                    st.plotly_chart(activity_fig, use_container_width=True)
-                st.markdown("</div>", unsafe_allow_html=True) # End of styled div
+                    render_chart(activity_fig)
+                    render_points_report(activity_fig)
+                page_markdown("</div>", unsafe_allow_html=True) # End of styled div
             
-            st.markdown("#### Health & Lifestyle Summary")
+            page_markdown("#### Health & Lifestyle Summary")
             
             health_col1, health_col2, health_col3, health_col4 = st.columns(4)
             
@@ -1030,21 +1002,13 @@ def main():
                         st.warning( "Monitor medication schedule")
 
     elif dashboard_view == "Weekly Summary":
-        st.markdown("---")
+        page_markdown("---")
 
-        st.markdown(f"## {get_material_icon_html('calendar_today')} Weekly Progress Summary", unsafe_allow_html=True)
-        st.markdown(f"Comprehensive weekly analysis for **{child_name}**")
+        page_markdown(f"## {get_material_icon_html('calendar_today')} Weekly Progress Summary", unsafe_allow_html=True)
+        page_markdown(f"Comprehensive weekly analysis for **{child_name}**")
         
         # Load observations properly
-        all_observations = load_parent_observations()
-        
-        # Add any session state data if it exists
-        if 'parent_data' in st.session_state and st.session_state['parent_data']:
-            all_observations.extend(st.session_state['parent_data'])
-        
-        child_observations = [obs for obs in all_observations 
-                            if obs.get('child_name') == child_name 
-                            and start_date <= date.fromisoformat(obs['date']) <= end_date]
+        child_observations = get_repository().load_child_observations(child_name, start_date, end_date)
         
         if not child_observations:
             st.warning( "No observations found for the selected period.")
@@ -1053,24 +1017,24 @@ def main():
         # Enhanced weekly summary with animations
         weekly_fig, weekly_data = create_weekly_summary(child_observations)
         
-        st.markdown(f"### **{get_material_icon_html('insights')} Your Weekly Progress Trends**", unsafe_allow_html=True)
+        page_markdown(f"### **{get_material_icon_html('insights')} Your Weekly Progress Trends**", unsafe_allow_html=True)
         
         if weekly_fig:
             # --- START STYLING FOR WEEKLY SUMMARY PLOT ---
-            # st.markdown("---")
-            st.plotly_chart(weekly_fig, use_container_width=True)
-            st.markdown("</div>", unsafe_allow_html=True)
+            # page_markdown("---")
+            render_chart(weekly_fig)
+            page_markdown("</div>", unsafe_allow_html=True)
             # --- END STYLING FOR WEEKLY SUMMARY PLOT ---
             
             if weekly_data is not None and not weekly_data.empty:
-                st.markdown(f"### {get_material_icon_html('target')} Weekly Insights & Recommendations", unsafe_allow_html=True)
+                page_markdown(f"### {get_material_icon_html('target')} Weekly Insights & Recommendations", unsafe_allow_html=True)
                 
                 latest_week = weekly_data.iloc[-1]
                 
                 insight_col1, insight_col2 = st.columns(2)
                 
                 with insight_col1:
-                    st.markdown(f"#### {get_material_icon_html('star')} This Week's Highlights", unsafe_allow_html=True)
+                    page_markdown(f"#### {get_material_icon_html('star')} This Week's Highlights", unsafe_allow_html=True)
                     
                     # Homework insights
                     if latest_week['homework_completion'] >= 85:
@@ -1095,7 +1059,7 @@ def main():
                         st.warning( "Consider earlier bedtime")
                 
                 with insight_col2:
-                    st.markdown(f"#### {get_material_icon_html('trending_up')} Growth & Trends", unsafe_allow_html=True)
+                    page_markdown(f"#### {get_material_icon_html('trending_up')} Growth & Trends", unsafe_allow_html=True)
                     
                     if len(weekly_data) > 1:
                         prev_week = weekly_data.iloc[-2]
@@ -1124,12 +1088,12 @@ def main():
                             concerns.append(f"Mood has declined")
                         
                         if improvements:
-                            st.markdown("**Positive Changes:**")
+                            page_markdown("**Positive Changes:**")
                             for improvement in improvements:
                                 st.success(improvement)
                         
                         if concerns:
-                            st.markdown("**Areas to Watch:**")
+                            page_markdown("**Areas to Watch:**")
                             for concern in concerns:
                                 st.warning(concern)
                         
@@ -1139,8 +1103,8 @@ def main():
                         st.info( "Need more weeks of data for trend analysis")
                 
                 # Goal setting section
-                st.markdown("---")
-                st.markdown(f"###  Goals for Next Week")
+                page_markdown("---")
+                page_markdown(f"###  Goals for Next Week")
                 
                 goal_col1, goal_col2 = st.columns(2)
                 
@@ -1180,20 +1144,14 @@ def main():
                 st.info( "Insufficient data for weekly summary analysis")
 
     else:  # Observations Log
-        st.markdown(f"##  Complete Observation History")
-        st.markdown(f"Detailed log of all observations for **{child_name}**")
+        page_markdown(f"##  Complete Observation History")
+        page_markdown(f"Detailed log of all observations for **{child_name}**")
         
-        # Load observations properly
-        all_observations = load_parent_observations()
-        
-        # Add any session state data if it exists
-        if 'parent_data' in st.session_state and st.session_state['parent_data']:
-            all_observations.extend(st.session_state['parent_data'])
+        # Only the first page is fetched up front; older entries are loaded on demand
+        first_page, _ = get_repository().page_child_observations(child_name, 1)
         
-        child_observations = [obs for obs in all_observations if obs.get('child_name') == child_name]
-        
-        if not child_observations:
-            st.markdown(f"""
+        if not first_page:
+            page_markdown(f"""
             <div style="text-align: center; padding: 2rem; background: rgba(251, 191, 36, 0.1); 
                  border-radius: 12px; border: 2px dashed rgba(251, 191, 36, 0.5);">
                 <span class="material-symbols-outlined" style="font-size: 3rem; color: #f59e0b; margin-bottom: 1rem;">history</span>
@@ -1203,8 +1161,6 @@ def main():
             """, unsafe_allow_html=True)
             return
         
-        child_observations.sort(key=lambda x: x['date'], reverse=True)
-        
         # Enhanced filtering options
         filter_col1, filter_col2, filter_col3 = st.columns(3)
         
@@ -1236,22 +1192,26 @@ def main():
                 if st.button( "Cancel", key="cancel_delete_all"):
                     st.info("Data deletion cancelled.")
         
-        st.markdown(f"###  Showing {len(child_observations)} observations")
-        
-        # Apply filters
-        filtered_observations = child_observations
-        
-        if date_filter:
-            filtered_observations = [obs for obs in filtered_observations 
-                                   if date.fromisoformat(obs['date']) == date_filter]
+        # Filters are applied by the repository; pages are kept in session state
+        # and reset whenever the child or a filter changes
+        behavior_value = int(behavior_filter.split(' ')[0]) if behavior_filter != "All" else None
+        log_key = (child_name, date_filter, behavior_value)
+        log_state = st.session_state.get('pt_log_pages')
+        if log_state is None or log_state['key'] != log_key:
+            if date_filter:
+                records = load_day_observations(child_name, date_filter, behavior_value)
+                cursor = None
+            else:
+                records, cursor = get_repository().page_child_observations(
+                    child_name, OBSERVATION_LOG_PAGE_SIZE, behavior_rating=behavior_value)
+            log_state = {'key': log_key, 'records': records, 'cursor': cursor}
+            st.session_state['pt_log_pages'] = log_state
+        filtered_observations = log_state['records']
         
-        if behavior_filter != "All":
-            behavior_value = int(behavior_filter.split(' ')[0])
-            filtered_observations = [obs for obs in filtered_observations 
-                                   if obs['behavior_rating'] == behavior_value]
+        page_markdown(f"###  Showing {len(filtered_observations)} most recent observations")
         
         # Display observations with enhanced formatting
-        for i, obs in enumerate(filtered_observations[:25]):  # Show last 25 observations
+        for i, obs in enumerate(filtered_observations):
             obs_date = date.fromisoformat(obs['date'])
             
             # Create color-coded header based on behavior rating
@@ -1266,7 +1226,7 @@ def main():
                 header_color = "#f59e0b"  # Orange
                 rating_icon = get_material_icon_html('sentiment_dissatisfied')
             
-            st.markdown(
+            page_markdown(
                 f"""
                 <div style="border-left: 5px solid {header_color}; padding: 0.5rem 1rem; margin-bottom: 1rem; background-color: #f9fafb;">
                     <h4 style="margin: 0; font-size: 1rem; color: {header_color};">
@@ -1279,7 +1239,7 @@ def main():
             )
 
             with st.expander(f"Observation on {obs_date.strftime('%A, %B %d, %Y')} - Behavior: {behavior_rating}/5"):
-                st.markdown(
+                page_markdown(
                     f"""
                     <div style="display: flex; align-items: center; gap: 0.5rem;">
                         {rating_icon}
@@ -1303,12 +1263,12 @@ def main():
                     st.metric("Sleep", f"{obs['sleep_hours']} hrs")
                 
                 if show_detailed:
-                    st.markdown("---")
+                    page_markdown("---")
                     
                     detail_col1, detail_col2, detail_col3 = st.columns(3)
                     
                     with detail_col1:
-                        st.markdown(f"**Academic Details**", unsafe_allow_html=True)
+                        page_markdown(f"**Academic Details**", unsafe_allow_html=True)
                         st.write(f"• Focus Level: {obs.get('focus_level', 'N/A')}")
                         if obs.get('subjects_struggled'):
                             st.write(f"• Difficult Subjects: {', '.join(obs['subjects_struggled'])}")
@@ -1316,13 +1276,13 @@ def main():
                             st.write("• No subject difficulties")
                     
                     with detail_col2:
-                        st.markdown(f"**Behavioral & Social**", unsafe_allow_html=True)
+                        page_markdown(f"**Behavioral & Social**", unsafe_allow_html=True)
                         st.write(f"• Energy Level: {obs.get('energy_level', 'N/A')}")
                         st.write(f"• Screen Time: {obs['screen_time']} hrs")
                         st.write(f"• Physical Activity: {obs['physical_activity']} min")
                     
                     with detail_col3:
-                        st.markdown(f"**Health & Special**", unsafe_allow_html=True)
+                        page_markdown(f"**Health & Special**", unsafe_allow_html=True)
                         med_status = f"Yes" if obs['medication_taken'] else f"No"
                         st.write(f"• Medication: {med_status}")
                         if obs.get('special_events'):
@@ -1331,7 +1291,7 @@ def main():
                     # Detailed notes
                     if any([obs.get('learning_wins'), obs.get('challenges_faced'), 
                            obs.get('strategies_used'), obs.get('social_interactions')]):
-                        st.markdown(f"**Detailed Notes:**", unsafe_allow_html=True)
+                        page_markdown(f"**Detailed Notes:**", unsafe_allow_html=True)
                         
                         if obs.get('learning_wins'):
                             st.success( f"**Wins:** {obs['learning_wins']}")
@@ -1345,13 +1305,20 @@ def main():
                         if obs.get('social_interactions'):
                             st.info( f"**Social:** {obs['social_interactions']}")
         
+        if log_state['cursor'] is not None:
+            if st.button("Load more observations", key="pt_log_load_more"):
+                more, log_state['cursor'] = get_repository().page_child_observations(
+                    child_name, OBSERVATION_LOG_PAGE_SIZE, before=log_state['cursor'], behavior_rating=behavior_value)
+                log_state['records'] = log_state['records'] + more
+                st.rerun()
+        
         # Export functionality
-        st.markdown("---")
+        page_markdown("---")
         export_col1, export_col2 = st.columns(2)
         
         with export_col1:
             if st.button( "Export All Observations", key="pt_export_all_observations"):
-                df_export = pd.DataFrame(child_observations)
+                df_export = pd.DataFrame(get_repository().load_child_observations(child_name))
                 csv = df_export.to_csv(index=False)
                 st.download_button(
                     label="Download Complete History (CSV)",
@@ -1362,9 +1329,19 @@ def main():
                 )
         
         with export_col2:
-            if filtered_observations != child_observations:
+            if date_filter or behavior_value is not None:
                 if st.button( "sExport Filtered Data", key="pt_export_filtered"):
-                    df_filtered = pd.DataFrame(filtered_observations)
+                    # The full filtered query, not just the pages loaded above
+                    try:
+                        if date_filter:
+                            export_records = load_day_observations(child_name, date_filter, behavior_value)
+                        else:
+                            export_records = get_repository().iter_child_observations(
+                                child_name, behavior_rating=behavior_value)
+                        df_filtered = pd.DataFrame(list(export_records))
+                    except Exception as e:
+                        st.error(f"Could not export the observations: {e}")
+                        st.stop()
                     csv_filtered = df_filtered.to_csv(index=False)
                     st.download_button(
                         label="Download Filtered Data (CSV)",
@@ -1375,13 +1352,13 @@ def main():
                     )
 
     # Enhanced tips and support section
-    st.markdown("---")
-    st.markdown(f"### {get_material_icon_html('lightbulb')} Parent Tracking Success Tips", unsafe_allow_html=True)
+    page_markdown("---")
+    page_markdown(f"### {get_material_icon_html('lightbulb')} Parent Tracking Success Tips", unsafe_allow_html=True)
     
     tip_col1, tip_col2 = st.columns(2)
     
     with tip_col1:
-        st.markdown(f"""
+        page_markdown(f"""
         **{get_material_icon_html('target')} Effective Daily Tracking:**
         - Record observations at the same time each day for consistency
         - Be specific about both successes and challenges
@@ -1391,7 +1368,7 @@ def main():
         """, unsafe_allow_html=True)
     
     with tip_col2:
-        st.markdown(f"""
+        page_markdown(f"""
         **{get_material_icon_html('handshake')} When to Reach Out for Support:**
         - Consistent low behavior or mood ratings over several days
         - Persistent difficulties with homework or specific subjects  
@@ -1401,13 +1378,13 @@ def main():
         """, unsafe_allow_html=True)
     
     # Contact and resources
-    st.markdown("---")
-    st.markdown(f"### {get_material_icon_html('phone')} Support & Resources", unsafe_allow_html=True)
+    page_markdown("---")
+    page_markdown(f"### {get_material_icon_html('phone')} Support & Resources", unsafe_allow_html=True)
     
     support_col1, support_col2 = st.columns(2)
     
     with support_col1:
-        st.markdown(f"""
+        page_markdown(f"""
         **{get_material_icon_html('school')} School Communication:**
         - Share observation trends with your child's teacher
         - Use data to support parent-teacher conferences
@@ -1416,7 +1393,7 @@ def main():
         """, unsafe_allow_html=True)
     
     with support_col2:
-        st.markdown(f"""
+        page_markdown(f"""
         **{get_material_icon_html('library_books')} Additional Resources:**
         - [Parent Support Groups](/#) - Connect with other parents
         - [Learning Strategies Guide](/#) - Evidence-based home support methods
@@ -7,18 +7,11 @@ from datetime import datetime
 import sys
 import os
 
-# Enhanced Lottie import
-try:
-    from streamlit_lottie import st_lottie
-    import requests
-    LOTTIE_AVAILABLE = True
-except ImportError:
-    LOTTIE_AVAILABLE = False
-
 # Append parent directory to sys.path to enable importing from utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.image_base64 import get_base64_images
+from utils.lottie_utils import render_lottie
 from utils.language_utils import get_text, load_app_settings, save_app_settings
 from utils.exact_ui import (
     add_exact_ui_styles,
@@ -30,6 +23,8 @@ from utils.exact_ui import (
 )
 from utils.auth_utils import is_authenticated, render_login_page, logout_user, get_user_role
 from utils.icon_utils import get_material_icon_html
+from utils.html_utils import page_markdown
+from utils.chart_utils import render_chart
 
 # Page config
 st.set_page_config(
@@ -55,7 +50,7 @@ if 'offline_mode' not in st.session_state:
 language = st.session_state.get('app_language', 'English')
 current_theme = st.session_state.get('app_theme', 'Light')
 
-st.markdown(f"""
+page_markdown(f"""
     <script>
         document.body.setAttribute('data-theme', '{current_theme}');
     </script>
@@ -63,54 +58,6 @@ st.markdown(f"""
 
 render_exact_sidebar()
 
-# Clean Lottie functions
-def load_lottie_url(url: str):
-    """Load Lottie animation with timeout"""
-    if not LOTTIE_AVAILABLE:
-        return None
-    try:
-        r = requests.get(url, timeout=5)
-        if r.status_code == 200:
-            return r.json()
-    except:
-        pass
-    return None
-
-def remove_lottie_background(lottie_json):
-    """Simple background removal"""
-    if not lottie_json:
-        return None
-    try:
-        if 'bg' in lottie_json:
-            del lottie_json['bg']
-        lottie_json['bg'] = None
-        return lottie_json
-    except:
-        return lottie_json
-
-def render_lottie(url, height=200, key=None, fallback_icon="school", fallback_text="Loading..."):
-    """Simple Lottie renderer with fallback"""
-    if LOTTIE_AVAILABLE:
-        lottie_json = load_lottie_url(url)
-        if lottie_json:
-            cleaned = remove_lottie_background(lottie_json)
-            try:
-                st_lottie(cleaned, height=height, key=key, speed=1, loop=True, quality="high")
-                return True
-            except:
-                pass
-    
-    # Elegant fallback
-    st.markdown(f"""
-    <div style="height: {height}px; display: flex; flex-direction: column; align-items: center; justify-content: center; 
-         background: linear-gradient(135deg, rgba(139, 92, 246, 0.1), rgba(59, 130, 246, 0.1)); 
-         border-radius: 12px; text-align: center; border: 2px dashed rgba(139, 92, 246, 0.3);">
-        <span class="material-symbols-outlined" style="font-size: 3rem; color: var(--primary-purple); margin-bottom: 0.5rem; animation: pulse 2s infinite;">{fallback_icon}</span>
-        <p style="color: var(--gray-600); margin: 0; font-weight: 500;">{fallback_text}</p>
-    </div>
-    """, unsafe_allow_html=True)
-    return False
-
 def main():
     # Authentication check
     if not is_authenticated():
@@ -127,13 +74,13 @@ def main():
     )
     
     # Enhanced hero section with multiple animations
-    st.markdown(f"### {get_material_icon_html('star')} Educational Excellence in Action", unsafe_allow_html=True)
+    page_markdown(f"### {get_material_icon_html('star')} Educational Excellence in Action", unsafe_allow_html=True)
     
     # Three-column animation layout
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.markdown(f"**{get_material_icon_html('library_books')} Learning Excellence**", unsafe_allow_html=True)
+        page_markdown(f"**{get_material_icon_html('library_books')} Learning Excellence**", unsafe_allow_html=True)
         render_lottie(
             "https://lottie.host/5940ae0a-4ef4-4f79-a517-abce94639765/H8tXMAPaUK.json",
             height=200,
@@ -144,7 +91,7 @@ def main():
         st.caption("Research-based educational strategies and methodologies")
     
     with col2:
-        st.markdown(f"**{get_material_icon_html('science')} Research Innovation**", unsafe_allow_html=True)
+        page_markdown(f"**{get_material_icon_html('science')} Research Innovation**", unsafe_allow_html=True)
         render_lottie(
             "https://lottie.host/687a0991-917f-4d7b-92f6-d9ecaa0780b7/D75iWs83gn.json",
             height=200,
@@ -155,7 +102,7 @@ def main():
         st.caption("Cutting-edge educational research and development")
     
     with col3:
-        st.markdown(f"**{get_material_icon_html('target')} Student Success**", unsafe_allow_html=True)
+        page_markdown(f"**{get_material_icon_html('target')} Student Success**", unsafe_allow_html=True)
         render_lottie(
             "https://lottie.host/4e1ac443-9c90-4a25-b20d-c918d5a0290f/pa2Qd9xE5l.json",
             height=200,
@@ -166,13 +113,13 @@ def main():
         st.caption("Empowering every learner to reach their potential")
 
     # Enhanced educational impact showcase
-    st.markdown("---")
-    st.markdown(f"### {get_material_icon_html('analytics')} Educational Impact & Research", unsafe_allow_html=True)
+    page_markdown("---")
+    page_markdown(f"### {get_material_icon_html('analytics')} Educational Impact & Research", unsafe_allow_html=True)
     
     impact_col1, impact_col2 = st.columns(2)
     
     with impact_col1:
-        st.markdown(f"""
+        page_markdown(f"""
         <div style="text-align: center; padding: 2rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
              border-radius: 16px; color: white; margin-bottom: 1rem; box-shadow: 0 4px 6px rgba(0,0,0,0.1); transition: transform 0.3s ease;"
              onmouseover="this.style.transform='translateY(-5px)'" onmouseout="this.style.transform='translateY(0)'">
@@ -184,7 +131,7 @@ def main():
         </div>
         """, unsafe_allow_html=True)
         
-        st.markdown(f"""
+        page_markdown(f"""
         <div style="text-align: center; padding: 2rem; background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%); 
              border-radius: 16px; color: white; margin-bottom: 1rem; box-shadow: 0 4px 6px rgba(0,0,0,0.1); transition: transform 0.3s ease;"
              onmouseover="this.style.transform='translateY(-5px)'" onmouseout="this.style.transform='translateY(0)'">
@@ -197,7 +144,7 @@ def main():
         """, unsafe_allow_html=True)
     
     with impact_col2:
-        st.markdown(f"""
+        page_markdown(f"""
         <div style="text-align: center; padding: 2rem; background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); 
              border-radius: 16px; color: white; margin-bottom: 1rem; box-shadow: 0 4px 6px rgba(0,0,0,0.1); transition: transform 0.3s ease;"
              onmouseover="this.style.transform='translateY(-5px)'" onmouseout="this.style.transform='translateY(0)'">
@@ -209,7 +156,7 @@ def main():
         </div>
         """, unsafe_allow_html=True)
         
-        st.markdown(f"""
+        page_markdown(f"""
         <div style="text-align: center; padding: 2rem; background: linear-gradient(135deg, #43e97b 0%, #38f9d7 100%); 
              border-radius: 16px; color: white; margin-bottom: 1rem; box-shadow: 0 4px 6px rgba(0,0,0,0.1); transition: transform 0.3s ease;"
              onmouseover="this.style.transform='translateY(-5px)'" onmouseout="this.style.transform='translateY(0)'">
@@ -222,8 +169,8 @@ def main():
         """, unsafe_allow_html=True)
 
     # Enhanced content selection
-    st.markdown("---")
-    st.markdown(f"### {get_material_icon_html('target')} Explore Educational Content", unsafe_allow_html=True)
+    page_markdown("---")
+    page_markdown(f"### {get_material_icon_html('target')} Explore Educational Content", unsafe_allow_html=True)
     
     content_col1, content_col2 = st.columns(2)
 
@@ -256,12 +203,12 @@ def main():
 
     # Enhanced content sections
     if content_type == f"Research Overview":
-        st.markdown(f"## {get_material_icon_html('analytics')} Research Overview: Learning Difficulties", unsafe_allow_html=True)
+        page_markdown(f"## {get_material_icon_html('analytics')} Research Overview: Learning Difficulties", unsafe_allow_html=True)
         
         # Add research-focused animation
         research_col = st.columns([1, 2, 1])
         with research_col[1]:
-            st.markdown(f"**{get_material_icon_html('science')} Data-Driven Research Excellence**", unsafe_allow_html=True)
+            page_markdown(f"**{get_material_icon_html('science')} Data-Driven Research Excellence**", unsafe_allow_html=True)
             render_lottie(
                 "https://lottie.host/8a1c9f65-4b8d-4e2f-9a3c-7f6e5d4c3b2a/M4X8jK9wR6.json",
                 height=250,
@@ -274,7 +221,7 @@ def main():
         tab1, tab2, tab3 = st.tabs([f"Statistics", f"Neuroscience", f"Impact Studies"])
         
         with tab1:
-            st.markdown("### Learning Difficulties Statistics")
+            page_markdown("### Learning Difficulties Statistics")
             
             prevalence_data = {
                 "Type": ["Dyslexia", "ADHD", "Dyscalculia", "Dysgraphia", "Language Disorders", "Other"],
@@ -297,7 +244,7 @@ def main():
                 color_discrete_sequence=px.colors.qualitative.Set3
             )
             fig_prevalence.update_layout(height=500)
-            st.plotly_chart(fig_prevalence, use_container_width=True)
+            render_chart(fig_prevalence)
             
             # Enhanced metrics display
             col1, col2, col3, col4 = st.columns(4)
@@ -312,7 +259,7 @@ def main():
                 st.metric("Improvement Rate", "80%", "with intervention")
         
         with tab2:
-            st.markdown(f"""
+            page_markdown(f"""
             #### **{get_material_icon_html('psychology')} Brain-Based Understanding of Learning Difficulties**
             
             Learning difficulties are neurobiological in origin, involving differences in brain structure and function:
@@ -335,7 +282,7 @@ def main():
             - Attention and cognitive control challenges
             """, unsafe_allow_html=True)
             
-            st.markdown(f"""
+            page_markdown(f"""
             #### **{get_material_icon_html('star')} Neuroplasticity and Intervention**
             
             **The Brain's Remarkable Ability to Change:**
@@ -351,7 +298,7 @@ def main():
             - Long-term structural brain changes possible with sustained intervention
             """, unsafe_allow_html=True)
             
-            st.markdown(f"#### {get_material_icon_html('schedule')} Critical Intervention Periods", unsafe_allow_html=True)
+            page_markdown(f"#### {get_material_icon_html('schedule')} Critical Intervention Periods", unsafe_allow_html=True)
             
             timeline_data = {
                 "Age Range": ["3-5 years", "6-8 years", "9-12 years", "13+ years"],
@@ -369,7 +316,7 @@ def main():
             st.dataframe(timeline_df, use_container_width=True, hide_index=True)
         
         with tab3:
-            st.markdown(f"""
+            page_markdown(f"""
             #### **{get_material_icon_html('emoji_events')} Major Research Findings & Evidence**
             
             **National Reading Panel (2000) - Landmark Study**
@@ -409,9 +356,9 @@ def main():
                 color_continuous_scale="Viridis"
             )
             fig_effectiveness.update_layout(height=400)
-            st.plotly_chart(fig_effectiveness, use_container_width=True)
+            render_chart(fig_effectiveness)
             
-            st.markdown(f"""
+            page_markdown(f"""
             #### **{get_material_icon_html('trending_up')} Longitudinal Study Insights**
             
             **Connecticut Longitudinal Study (Shaywitz et al.) - 20+ Year Follow-up**
@@ -424,12 +371,12 @@ def main():
             """, unsafe_allow_html=True)
 
     elif content_type == f"Types of Learning Difficulties":
-        st.markdown(f"## {get_material_icon_html('extension')} Understanding Different Learning Difficulties", unsafe_allow_html=True)
+        page_markdown(f"## {get_material_icon_html('extension')} Understanding Different Learning Difficulties", unsafe_allow_html=True)
         
         # Add learning types animation
         types_col = st.columns([1, 2, 1])
         with types_col[1]:
-            st.markdown(f"**{get_material_icon_html('extension')} Learning Differences & Strengths**", unsafe_allow_html=True)
+            page_markdown(f"**{get_material_icon_html('extension')} Learning Differences & Strengths**", unsafe_allow_html=True)
             render_lottie(
                 "https://lottie.host/15c1c3e6-35bf-4933-bc7e-193fa1580efe/iwAfN5QwfZ.json",
                 height=250,
@@ -446,7 +393,7 @@ def main():
         )
         
         if difficulty_type == "Dyslexia":
-            st.markdown(f"""
+            page_markdown(f"""
             #### **{get_material_icon_html('menu_book')} Dyslexia: Understanding Reading Challenges**
             
             Dyslexia is a neurobiological learning difference that affects reading and language processing, 
@@ -467,12 +414,12 @@ def main():
             - Innovative approaches to challenges
             """, unsafe_allow_html=True)
             
-            st.markdown(f"#### {get_material_icon_html('schedule')} Observable Signs by Developmental Stage", unsafe_allow_html=True)
+            page_markdown(f"#### {get_material_icon_html('schedule')} Observable Signs by Developmental Stage", unsafe_allow_html=True)
             
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                st.markdown(f"""
+                page_markdown(f"""
                 **{get_material_icon_html('child_care')} Early Years (Ages 3-5):**
                 - Delayed speech development or unclear speech
                 - Difficulty learning nursery rhymes or rhyming games
@@ -482,7 +429,7 @@ def main():
                 """, unsafe_allow_html=True)
             
             with col2:
-                st.markdown(f"""
+                page_markdown(f"""
                 **{get_material_icon_html('library_books')} Elementary (Ages 6-8):**
                 - Slow progress in learning to read
                 - Difficulty sounding out words or blending sounds
@@ -492,7 +439,7 @@ def main():
                 """, unsafe_allow_html=True)
             
             with col3:
-                st.markdown(f"""
+                page_markdown(f"""
                 **{get_material_icon_html('school')} Older Students (Ages 9+):**
                 - Reading significantly below grade level expectations
                 - Difficulty with reading comprehension of complex texts
@@ -501,7 +448,7 @@ def main():
                 - Fatigue after reading for short periods
                 """, unsafe_allow_html=True)
             
-            st.markdown(f"""
+            page_markdown(f"""
             #### **{get_material_icon_html('psychology')} Neurological Understanding**
             - Differences in left hemisphere language processing areas
             - Reduced connectivity in reading-specific neural networks
@@ -518,7 +465,7 @@ def main():
             """, unsafe_allow_html=True)
         
         elif difficulty_type == "Dyscalculia":
-            st.markdown(f"""
+            page_markdown(f"""
             #### **{get_material_icon_html('calculate')} Dyscalculia: Mathematical Learning Challenges**
             
             Dyscalculia is a specific learning difficulty that affects mathematical understanding, 
@@ -532,7 +479,7 @@ def main():
             - Trouble with time, money, and measurement concepts
             """, unsafe_allow_html=True)
             
-            st.markdown(f"#### {get_material_icon_html('analytics')} Common Areas of Difficulty", unsafe_allow_html=True)
+            page_markdown(f"#### {get_material_icon_html('analytics')} Common Areas of Difficulty", unsafe_allow_html=True)
             
             manifestations = {
                 "Mathematical Area": [
@@ -564,7 +511,7 @@ def main():
             manifestations_df = pd.DataFrame(manifestations)
             st.dataframe(manifestations_df, use_container_width=True, hide_index=True)
             
-            st.markdown(f"""
+            page_markdown(f"""
             #### **{get_material_icon_html('lightbulb')} Strengths Often Present:**
             - Strong language and verbal reasoning abilities
             - Excellent memory for stories, facts, and information
@@ -573,12 +520,12 @@ def main():
             """, unsafe_allow_html=True)
 
     elif content_type == f"Early Intervention Strategies":
-        st.markdown(f"## {get_material_icon_html('rocket_launch')} Early Intervention: The Foundation of Success", unsafe_allow_html=True)
+        page_markdown(f"## {get_material_icon_html('rocket_launch')} Early Intervention: The Foundation of Success", unsafe_allow_html=True)
         
         # Add early intervention animation
         early_col = st.columns([1, 2, 1])
         with early_col[1]:
-            st.markdown(f"**{get_material_icon_html('eco')} Early Intervention Excellence**", unsafe_allow_html=True)
+            page_markdown(f"**{get_material_icon_html('eco')} Early Intervention Excellence**", unsafe_allow_html=True)
             render_lottie(
                 "https://lottie.host/4d42d6a6-8290-4b13-b3ab-2a10a490e6db/9oJrI4pj1f.json",
                 height=250,
@@ -595,7 +542,7 @@ def main():
         )
         
         if intervention_focus == "Pre-Reading & Literacy Foundations":
-            st.markdown(f"""
+            page_markdown(f"""
             #### **{get_material_icon_html('library_books')} Building Essential Pre-Reading Skills**
             
             **{get_material_icon_html('key')} Core Foundation: Phonological Awareness**
@@ -640,7 +587,7 @@ def main():
             progression_df = pd.DataFrame(progression_data)
             st.dataframe(progression_df, use_container_width=True, hide_index=True)
             
-            st.markdown(f"""
+            page_markdown(f"""
             #### **{get_material_icon_html('games')} Effective Pre-Reading Activities by Category**
             
             **{get_material_icon_html('music_note')} Phonological Awareness Games:**
@@ -665,12 +612,12 @@ def main():
             """, unsafe_allow_html=True)
 
     elif content_type == f"Academic Resources Library":
-        st.markdown(f"## {get_material_icon_html('library_books')} Comprehensive Academic Resource Library", unsafe_allow_html=True)
+        page_markdown(f"## {get_material_icon_html('library_books')} Comprehensive Academic Resource Library", unsafe_allow_html=True)
         
         # Add academic resources animation
         resources_col = st.columns([1, 2, 1])
         with resources_col[1]:
-            st.markdown(f"**{get_material_icon_html('library_books')} Evidence-Based Resource Collection**", unsafe_allow_html=True)
+            page_markdown(f"**{get_material_icon_html('library_books')} Evidence-Based Resource Collection**", unsafe_allow_html=True)
             render_lottie(
                 "https://lottie.host/687a0991-917f-4d7b-92f6-d9ecaa0780b7/D75iWs83gN.json",
                 height=250,
@@ -687,7 +634,7 @@ def main():
         )
         
         if resource_category == f"{get_material_icon_html('article')} Research Articles & Studies":
-            st.markdown(f"### {get_material_icon_html('science')} Essential Research Articles & Studies", unsafe_allow_html=True)
+            page_markdown(f"### {get_material_icon_html('science')} Essential Research Articles & Studies", unsafe_allow_html=True)
             
             articles = [
                 {
@@ -749,12 +696,12 @@ def main():
                     st.write(f"**Full Citation:** {article['Citation']}")
 
     elif content_type == f"Technology Tools & Platforms":
-        st.markdown(f"## {get_material_icon_html('computer')} Technology Tools for Learning Support", unsafe_allow_html=True)
+        page_markdown(f"## {get_material_icon_html('computer')} Technology Tools for Learning Support", unsafe_allow_html=True)
         
         # Add technology tools animation
         tech_col = st.columns([1, 2, 1])
         with tech_col[1]:
-            st.markdown(f"**{get_material_icon_html('computer')} Educational Technology Solutions**", unsafe_allow_html=True)
+            page_markdown(f"**{get_material_icon_html('computer')} Educational Technology Solutions**", unsafe_allow_html=True)
             render_lottie(
                 "https://lottie.host/5940ae0a-4ef4-4f79-a517-abce94639765/H8tXMAPaUk.json",
                 height=250,
@@ -778,7 +725,7 @@ def main():
 
         
         if tool_category == f"{get_material_icon_html('menu_book')} Reading Support Tools":
-            st.markdown(f"#### {get_material_icon_html('menu_book')} Advanced Reading Support Technologies", unsafe_allow_html=True)
+            page_markdown(f"#### {get_material_icon_html('menu_book')} Advanced Reading Support Technologies", unsafe_allow_html=True)
             
             reading_tools = [
                 {
@@ -829,12 +776,12 @@ def main():
                         st.write(f"**Implementation Strategy:** {tool['Implementation']}")
 
     else:  # Support Strategies & Best Practices
-        st.markdown(f"## {get_material_icon_html('handshake')} Support Strategies for Educational Stakeholders", unsafe_allow_html=True)
+        page_markdown(f"## {get_material_icon_html('handshake')} Support Strategies for Educational Stakeholders", unsafe_allow_html=True)
         
         # Add support strategies animation
         support_col = st.columns([1, 2, 1])
         with support_col[1]:
-            st.markdown(f"**{get_material_icon_html('handshake')} Collaborative Support Strategies**", unsafe_allow_html=True)
+            page_markdown(f"**{get_material_icon_html('handshake')} Collaborative Support Strategies**", unsafe_allow_html=True)
             render_lottie(
                 "https://lottie.host/15c1c3e6-35bf-4933-bc7e-193fa1580efe/iwAfN5QwfZ.json",
                 height=250,
@@ -857,7 +804,7 @@ def main():
 
         
         if stakeholder == f"{get_material_icon_html('school')} Teachers & Educators":
-            st.markdown(f"""
+            page_markdown(f"""
             #### **{get_material_icon_html('target')} Classroom Implementation Strategies**
             
             **{get_material_icon_html('library_books')} Daily Teaching Practices:**
@@ -875,7 +822,7 @@ def main():
             - Include both formative and summative assessment opportunities
             """, unsafe_allow_html=True)
             
-            st.markdown(f"#### {get_material_icon_html('check_circle')} Daily Teaching Excellence Checklist", unsafe_allow_html=True)
+            page_markdown(f"#### {get_material_icon_html('check_circle')} Daily Teaching Excellence Checklist", unsafe_allow_html=True)
             
             checklist_categories = {
                 f"Learning Objectives & Instruction": [
@@ -905,12 +852,12 @@ def main():
             }
             
             for category, items in checklist_categories.items():
-                st.markdown(f"**{category}**")
+                page_markdown(f"**{category}**")
                 for item in items:
                     st.checkbox(item, key=f"teacher_checklist_{item}")
         
         elif stakeholder == f"{get_material_icon_html('family_restroom')} Parents & Families":
-            st.markdown(f"""
+            page_markdown(f"""
             #### **{get_material_icon_html('home')} Creating a Supportive Home Learning Environment**
             
             **{get_material_icon_html('star')} Foundation Strategies:**
@@ -928,7 +875,7 @@ def main():
             - **Real-World Learning**: Connect school learning to everyday experiences and family activities
             """, unsafe_allow_html=True)
             
-            st.markdown(f"#### {get_material_icon_html('library_books')} Evidence-Based Parent Resources", unsafe_allow_html=True)
+            page_markdown(f"#### {get_material_icon_html('library_books')} Evidence-Based Parent Resources", unsafe_allow_html=True)
             
             parent_resources = [
                 {
@@ -974,13 +921,13 @@ def main():
                         st.write(f"**Key Features:** {resource['Key Features']}")
 
     # Enhanced help and support section
-    st.markdown("---")
-    st.markdown(f"### {get_material_icon_html('lightbulb')} Additional Resources & Support", unsafe_allow_html=True)
+    page_markdown("---")
+    page_markdown(f"### {get_material_icon_html('lightbulb')} Additional Resources & Support", unsafe_allow_html=True)
     
     support_col1, support_col2 = st.columns(2)
     
     with support_col1:
-        st.markdown(f"""
+        page_markdown(f"""
         **{get_material_icon_html('link')} Professional Development & Training:**
         - [Orton-Gillingham Training](/#) - Structured literacy certification programs
         - [Wilson Language Training](/#) - Multi-sensory reading program certification
@@ -988,7 +935,7 @@ def main():
         - [Council for Exceptional Children](/#) - Special education professional development
         """, unsafe_allow_html=True)
         
-        st.markdown(f"""
+        page_markdown(f"""
         **{get_material_icon_html('analytics')} Assessment & Screening Tools:**
         - [DIBELS Assessment](/#) - Dynamic Indicators of Basic Early Literacy Skills
         - [AIMSweb Screening](/#) - Universal screening and progress monitoring
@@ -997,7 +944,7 @@ def main():
         """, unsafe_allow_html=True)
     
     with support_col2:
-        st.markdown(f"""
+        page_markdown(f"""
         **{get_material_icon_html('school')} Educational Organizations & Resources:**
         - [National Center on Improving Literacy](/#) - Federal literacy research center
         - [What Works Clearinghouse](/#) - Evidence-based education practices
@@ -1005,7 +952,7 @@ def main():
         - [National Association of Elementary School Principals](/#) - Leadership resources
         """, unsafe_allow_html=True)
         
-        st.markdown(f"""
+        page_markdown(f"""
         **{get_material_icon_html('phone')} Technical Support & Assistance:**
         - **Help Desk:** support@eduscan.edu
         - **Phone Support:** (555) 123-4567
@@ -1014,13 +961,13 @@ def main():
         """, unsafe_allow_html=True)
     
     # What's new section
-    st.markdown("---")
-    st.markdown(f"### {get_material_icon_html('new_releases')} Latest Updates & Additions", unsafe_allow_html=True)
+    page_markdown("---")
+    page_markdown(f"### {get_material_icon_html('new_releases')} Latest Updates & Additions", unsafe_allow_html=True)
     
     updates_col1, updates_col2 = st.columns(2)
     
     with updates_col1:
-        st.markdown(f"""
+        page_markdown(f"""
         **{get_material_icon_html('science')} Recently Added Research:**
         - Updated meta-analysis on reading intervention effectiveness (March 2024)
         - New studies on executive function development and academic achievement
@@ -1029,7 +976,7 @@ def main():
         """, unsafe_allow_html=True)
     
     with updates_col2:
-        st.markdown(f"""
+        page_markdown(f"""
         **{get_material_icon_html('build')} New Tools & Resources:**
         - Enhanced digital accessibility toolkit for educators
         - Updated parent communication templates and guides
@@ -1038,8 +985,8 @@ def main():
         """, unsafe_allow_html=True)
     
     # Call to action
-    st.markdown("---")
-    st.markdown(f"""
+    page_markdown("---")
+    page_markdown(f"""
     <div style="text-align: center; padding: 2rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
          border-radius: 16px; color: white; margin: 2rem 0;">
         <h3>{get_material_icon_html('rocket_launch')} Ready to Make a Difference?</h3>
@@ -0,0 +1,238 @@
+# utils/asset_utils.py
+"""
+Static asset pipeline for the UI stylesheet and the images it references.
+
+The stylesheet source lives in styles/. build_static_assets() minifies it,
+copies every image its url()s point at into static/ under a content-hashed
+name, and writes static/manifest.json mapping logical names to those files.
+Streamlit serves static/ at /app/static when server.enableStaticServing is
+on, and adding ?v=<hash> to a URL makes it send a long-lived Cache-Control
+header, so browsers download each version once.
+
+The self-hosted fonts (utils/font_utils.py) are put in front of the
+stylesheet, so the font files go through the same pipeline.
+
+The manifest records the mtime of every file the build read. Those are
+compared with the files on disk at most every ASSET_CHECK_SECONDS, and the
+build runs again when one has changed. It can also be run ahead of
+deployment:
+
+    python -m utils.asset_utils build
+"""
+import argparse
+import base64
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+
+import streamlit as st
+
+from utils.font_utils import FONT_CSS_FILE, get_font_css
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STYLES_DIR = os.path.join(ROOT_DIR, "styles")
+STATIC_DIR = os.path.join(ROOT_DIR, "static")
+MANIFEST_FILE = os.path.join(STATIC_DIR, "manifest.json")
+STATIC_URL_PATH = "app/static"
+# How often get_manifest() checks the sources for changes
+ASSET_CHECK_SECONDS = float(os.environ.get('EDUSCAN_ASSET_CHECK_SECONDS', 5))
+
+# Stylesheets built into static/ (logical name -> source under styles/)
+STYLESHEETS = {
+    'exact_ui.css': 'exact_ui.css',
+}
+# Small stylesheet inlined into every page ahead of the full one
+CRITICAL_CSS_FILE = os.path.join(STYLES_DIR, "critical.css")
+
+_URL_REFERENCE = re.compile(r"url\(\s*['\"]?(?!data:|https?:|/)([^'\")]+)['\"]?\s*\)")
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+
+_manifest = None
+_manifest_checked_at = 0.0
+_manifest_lock = threading.Lock()
+
+
+def minify_css(css):
+    """Strips comments and insignificant whitespace."""
+    css = _CSS_COMMENT.sub("", css)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)  # only spaces after a colon; 'a :hover' keeps its space
+    return css.replace(";}", "}").strip()
+
+def _content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+def _fingerprinted_name(name, digest):
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{digest}{ext}"
+
+def static_base_url():
+    """URL prefix Streamlit serves static/ under, honouring server.baseUrlPath."""
+    base = (st.get_option("server.baseUrlPath") or "").strip("/")
+    return f"/{base}/{STATIC_URL_PATH}/" if base else f"/{STATIC_URL_PATH}/"
+
+def static_serving_enabled():
+    return bool(st.get_option("server.enableStaticServing"))
+
+def _read_stylesheet(source):
+    """A stylesheet's source with the font rules from utils/font_utils.py in front."""
+    with open(os.path.join(STYLES_DIR, source), 'r', encoding='utf-8') as f:
+        return get_font_css() + f.read()
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+def _write_if_missing(path, data):
+    if not os.path.exists(path):
+        with open(path, 'wb') as f:
+            f.write(data)
+
+def build_static_assets():
+    """
+    Builds the fingerprinted bundle and images into static/ and returns the manifest:
+    {'base_url': ..., 'assets': {logical_name: {'file': ..., 'hash': ...}}}.
+    Files from previous builds that the new manifest no longer lists are removed.
+    """
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    base_url = static_base_url()
+    assets = {}
+    # Every file read (mtime None if missing), so a later check needn't parse the CSS
+    sources = {os.path.relpath(FONT_CSS_FILE, ROOT_DIR): _mtime(FONT_CSS_FILE)}
+
+    def add_file(name, data):
+        digest = _content_hash(data)
+        filename = _fingerprinted_name(name, digest)
+        _write_if_missing(os.path.join(STATIC_DIR, filename), data)
+        assets[name] = {'file': filename, 'hash': digest}
+        return f"{base_url}{filename}?v={digest}"
+
+    for name, source in STYLESHEETS.items():
+        source_path = os.path.join(STYLES_DIR, source)
+        sources[os.path.relpath(source_path, ROOT_DIR)] = _mtime(source_path)
+        css = _read_stylesheet(source)
+
+        def replace_reference(match):
+            path = os.path.normpath(os.path.join(STYLES_DIR, match.group(1)))
+            sources[os.path.relpath(path, ROOT_DIR)] = _mtime(path)
+            if not os.path.exists(path):
+                print(f"Warning: {path} referenced from {source} not found.")
+                return "none"
+            with open(path, 'rb') as image_file:
+                return f"url('{add_file(os.path.basename(path), image_file.read())}')"
+
+        add_file(name, minify_css(_URL_REFERENCE.sub(replace_reference, css)).encode('utf-8'))
+
+    manifest = {'base_url': base_url, 'assets': assets, 'sources': sources}
+    tmp_path = f"{MANIFEST_FILE}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, MANIFEST_FILE)
+
+    current = {asset['file'] for asset in assets.values()}
+    fingerprinted = re.compile(r"^(.+)\.[0-9a-f]{12}(\.[a-z0-9]+)$")
+    for filename in os.listdir(STATIC_DIR):
+        match = fingerprinted.match(filename)
+        if match and filename not in current and match.group(1) + match.group(2) in assets:
+            os.remove(os.path.join(STATIC_DIR, filename))
+    return manifest
+
+def _manifest_is_current(manifest):
+    """Whether the sources recorded at build time are unchanged and the built files exist."""
+    try:
+        if manifest.get('base_url') != static_base_url():
+            return False
+        if any(_mtime(os.path.join(ROOT_DIR, path)) != mtime for path, mtime in manifest['sources'].items()):
+            return False
+        return all(os.path.exists(os.path.join(STATIC_DIR, asset['file']))
+                   for asset in manifest['assets'].values())
+    except KeyError:
+        return False
+
+def get_manifest():
+    """
+    The current manifest, rebuilding static/ first if a source changed (checked
+    at most every ASSET_CHECK_SECONDS). None if the build fails.
+    """
+    global _manifest, _manifest_checked_at
+    if _manifest is not None and time.monotonic() - _manifest_checked_at < ASSET_CHECK_SECONDS:
+        return _manifest
+    with _manifest_lock:
+        try:
+            if _manifest is None and os.path.exists(MANIFEST_FILE):
+                with open(MANIFEST_FILE, 'r') as f:
+                    _manifest = json.load(f)
+            if _manifest is None or not _manifest_is_current(_manifest):
+                _manifest = build_static_assets()
+            _manifest_checked_at = time.monotonic()
+        except Exception as e:
+            print(f"Error building static assets: {e}")
+            _manifest = None
+        return _manifest
+
+def get_static_url(name):
+    """
+    URL of a built asset, cache-busted by its content hash, or None when static
+    serving is off or the build failed (callers then inline the asset).
+    """
+    if not static_serving_enabled():
+        return None
+    manifest = get_manifest()
+    asset = manifest['assets'].get(name) if manifest else None
+    if asset is None:
+        return None
+    return f"{manifest['base_url']}{asset['file']}?v={asset['hash']}"
+
+def get_inline_css(name):
+    """Minified stylesheet with its images embedded as data URIs (the no-static-serving fallback)."""
+    source = STYLESHEETS[name]
+    font_mtime = os.path.getmtime(FONT_CSS_FILE) if os.path.exists(FONT_CSS_FILE) else 0
+    return _inline_css(source, os.path.getmtime(os.path.join(STYLES_DIR, source)), font_mtime)
+
+def get_critical_css():
+    """Minified styles/critical.css, inlined into every page so the first paint is styled."""
+    return _critical_css(_mtime(CRITICAL_CSS_FILE))
+
+@lru_cache(maxsize=2)
+def _critical_css(mtime):
+    if mtime is None:
+        return ""
+    with open(CRITICAL_CSS_FILE, 'r', encoding='utf-8') as f:
+        return minify_css(f.read())
+
+@lru_cache(maxsize=8)
+def _inline_css(source, mtime, font_mtime):
+    css = _read_stylesheet(source)
+
+    def embed(match):
+        path = os.path.normpath(os.path.join(STYLES_DIR, match.group(1)))
+        if not os.path.exists(path):
+            return "none"
+        mime_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        with open(path, 'rb') as image_file:
+            return f"url('data:{mime_type};base64,{base64.b64encode(image_file.read()).decode('ascii')}')"
+
+    return minify_css(_URL_REFERENCE.sub(embed, css))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build EduScan static assets into static/.")
+    parser.add_argument("command", choices=["build"])
+    parser.parse_args(argv)
+    manifest = build_static_assets()
+    for name, asset in manifest['assets'].items():
+        size = os.path.getsize(os.path.join(STATIC_DIR, asset['file']))
+        print(f"  {name:<24} -> {asset['file']} ({size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,44 +1,20 @@
 import streamlit as st
-import json
-import os
 from datetime import datetime, timedelta
 
-USERS_FILE = "data/users.json"
+from utils.repository import get_repository
 
-def _load_users():
-    """Loads user data from the JSON file."""
-    if not os.path.exists("data"):
-        os.makedirs("data")
-    if not os.path.exists(USERS_FILE) or os.stat(USERS_FILE).st_size == 0:
-        # Create a dummy users.json if it doesn't exist
-        dummy_users = [
-            {"username": "teacher1", "password": "password123", "role": "teacher"},
-            {"username": "parent1", "password": "password123", "role": "parent"},
-            {"username": "admin", "password": "adminpassword", "role": "admin"}
-        ]
-        with open(USERS_FILE, 'w') as f:
-            json.dump(dummy_users, f, indent=2)
-        return dummy_users
-    
+def authenticate_user(username, password):
+    """Authenticates a user based on username and password."""
     try:
-        with open(USERS_FILE, 'r') as f:
-            return json.load(f)
-    except json.JSONDecodeError:
-        st.error("Error: users.json is corrupt. Please check the file.")
-        return []
+        user = get_repository().authenticate_user(username, password)
     except Exception as e:
         st.error(f"Error loading user data: {e}")
-        return []
-
-def authenticate_user(username, password):
-    """Authenticates a user based on username and password."""
-    users = _load_users()
-    for user in users:
-        if user["username"] == username and user["password"] == password:
-            st.session_state["authenticated"] = True
-            st.session_state["username"] = user["username"]
-            st.session_state["role"] = user["role"]
-            return True
+        user = None
+    if user:
+        st.session_state["authenticated"] = True
+        st.session_state["username"] = user["username"]
+        st.session_state["role"] = user["role"]
+        return True
     st.session_state["authenticated"] = False
     return False
 
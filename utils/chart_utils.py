@@ -0,0 +1,254 @@
+# utils/chart_utils.py
+"""
+Shared helpers for the Plotly charts on the dashboard and analysis pages.
+
+cached_figure() keeps built figures in a process-wide cache keyed by
+(chart type, data fingerprint, theme, language). The entry stores the
+serialized figure JSON (its size bounds the cache) alongside the figure
+object, so a rerun with unchanged data, in any session, skips building the
+figure entirely:
+
+    fig = cached_figure('progress', (observations, metric), lambda: build(observations, metric))
+
+Because the key includes a hash of the data, a changed data set always gets
+a new figure. The write queue and sync worker also call invalidate_figures()
+after writing to the store, so figures for superseded data are dropped
+rather than waiting to be evicted.
+
+Long time series go through line_trace(), which downsamples them before the
+figure is built: a min/max pass for very long series, then LTTB
+(Largest-Triangle-Three-Buckets) down to about one point per pixel of chart
+width. Large series switch to WebGL (Scattergl), and render_points_report()
+captions the chart with how many points were actually sent.
+
+render_chart() draws a figure either interactively (Plotly JS) or, in offline
+mode or with EDUSCAN_CHART_BACKEND=static, as a pre-rendered image from
+utils.static_charts, cached on disk by a hash of the figure's data.
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+from cachetools import LRUCache
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+try:
+    from utils.static_charts import render_static_chart
+    STATIC_CHARTS_AVAILABLE = True
+except ImportError:
+    STATIC_CHARTS_AVAILABLE = False
+
+from utils.asset_utils import static_base_url, static_serving_enabled
+
+# Total size of cached figure JSON
+FIGURE_CACHE_BYTES = 32 * 1024 * 1024
+# Charts are drawn with use_container_width; this is the widest they get on the pages' layout
+DEFAULT_CHART_WIDTH_PX = 900
+POINTS_PER_PIXEL = 1
+# Min/max pre-pass before LTTB once a series has this many times the target points
+MINMAX_PREFILTER_RATIO = 10
+# Raw series longer than this are drawn with WebGL
+SCATTERGL_MIN_POINTS = 2000
+# interactive | static | auto (static images while the session is in offline mode)
+CHART_BACKEND = os.environ.get('EDUSCAN_CHART_BACKEND', 'auto').lower()
+
+# key -> (figure JSON, figure)
+_figures = LRUCache(maxsize=FIGURE_CACHE_BYTES, getsizeof=lambda entry: len(entry[0]))
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+
+def _update_hash(digest, data):
+    if isinstance(data, pd.DataFrame):
+        digest.update(json.dumps([str(c) for c in data.columns]).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    elif isinstance(data, pd.Series):
+        digest.update(str(data.name).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    elif isinstance(data, (list, tuple)) and not any(isinstance(item, (pd.DataFrame, pd.Series)) for item in data):
+        digest.update(json.dumps(data, sort_keys=True, default=str).encode('utf-8'))
+    elif isinstance(data, (list, tuple)):
+        for item in data:
+            _update_hash(digest, item)
+    else:
+        digest.update(json.dumps(data, sort_keys=True, default=str).encode('utf-8'))
+    digest.update(b'\x00')
+
+def data_fingerprint(data):
+    """Content hash of chart input: DataFrames, Series, and JSON-like values (or tuples of them)."""
+    digest = hashlib.sha1()
+    _update_hash(digest, data)
+    return digest.hexdigest()
+
+def _session_setting(key, default):
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return default
+    return st.session_state.get(key, default)
+
+def cached_figure(chart_type, data, build, theme=None, language=None):
+    """
+    Returns the figure `build()` makes for `data`, building it only if no figure
+    for (chart_type, data fingerprint, theme, language) is cached. Theme and
+    language default to the session's. build() may return None (nothing cached).
+    Cached figures are shared between sessions; don't modify them.
+    """
+    theme = theme or _session_setting('app_theme', 'Light')
+    language = language or _session_setting('app_language', 'English')
+    key = (chart_type, data_fingerprint(data), theme, language)
+    with _lock:
+        entry = _figures.get(key)
+        _stats['hits' if entry else 'misses'] += 1
+    if entry is not None:
+        return entry[1]
+
+    fig = build()
+    if fig is not None:
+        entry = (fig.to_json(), fig)
+        with _lock:
+            try:
+                _figures[key] = entry
+            except ValueError:
+                pass  # larger than the whole cache
+    return fig
+
+def invalidate_figures():
+    """Drops every cached figure (called when the data store changes)."""
+    with _lock:
+        _figures.clear()
+        _stats['invalidations'] += 1
+
+def get_figure_cache_info():
+    with _lock:
+        return dict(_stats, entries=len(_figures), bytes=_figures.currsize, maxsize=_figures.maxsize)
+
+
+# --- Downsampling for long time series ---
+
+def lttb_indices(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets: indices of `threshold` points (first and last
+    included) that keep the visual shape of the series. x must be increasing.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    every = (n - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        next_start, next_end = end, min(int((i + 2) * every) + 1, n)
+        if next_start >= next_end:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+        else:
+            avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+    return indices
+
+def minmax_indices(y, buckets):
+    """Indices of the minimum and maximum of each of `buckets` equal slices, in order."""
+    n = len(y)
+    if buckets * 2 >= n:
+        return np.arange(n)
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    picked = [0, n - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        chunk = y[start:end]
+        picked.extend((start + int(chunk.argmin()), start + int(chunk.argmax())))
+    return np.unique(picked)
+
+def downsample_indices(x, y, n_out):
+    """
+    Indices of about n_out representative points. Very long series are first cut
+    down with a min/max pass (cheap, keeps every peak), then reduced with LTTB.
+    """
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+    if n > MINMAX_PREFILTER_RATIO * n_out:
+        coarse = minmax_indices(y, n_out * 2)
+        return coarse[lttb_indices(x[coarse], y[coarse], n_out)]
+    return lttb_indices(x, y, n_out)
+
+def _x_positions(x):
+    """x as floats for the triangle areas: dates as timestamps, categories by position."""
+    if pd.api.types.is_datetime64_any_dtype(x):
+        return x.astype('int64').to_numpy(dtype=float)
+    numeric = pd.to_numeric(x, errors='coerce')
+    if numeric.notna().all():
+        return numeric.to_numpy(dtype=float)
+    if len(x) and isinstance(x.iloc[0], date):
+        return pd.to_datetime(x).astype('int64').to_numpy(dtype=float)
+    return np.arange(len(x), dtype=float)
+
+def line_trace(x, y, width_px=DEFAULT_CHART_WIDTH_PX, **trace_kwargs):
+    """
+    A line trace over at most POINTS_PER_PIXEL * width_px points of (x, y). Series
+    with more than SCATTERGL_MIN_POINTS raw points use WebGL (go.Scattergl).
+    Missing y values are dropped. The raw point count is kept in trace.meta for
+    points_report().
+    """
+    x = pd.Series(x).reset_index(drop=True)
+    y = pd.to_numeric(pd.Series(y).reset_index(drop=True), errors='coerce')
+    present = y.notna().to_numpy()
+    x, y = x[present].reset_index(drop=True), y[present].reset_index(drop=True)
+    total = len(y)
+
+    keep = downsample_indices(_x_positions(x), y.to_numpy(dtype=float),
+                              max(3, int(width_px * POINTS_PER_PIXEL)))
+    trace_type = go.Scattergl if total > SCATTERGL_MIN_POINTS else go.Scatter
+    return trace_type(x=x.iloc[keep].tolist(), y=y.iloc[keep].tolist(), meta={'points_total': total}, **trace_kwargs)
+
+def points_report(fig):
+    """(points sent, raw points) over the figure's line_trace() traces."""
+    sent = total = 0
+    for trace in fig.data:
+        if isinstance(trace.meta, dict) and 'points_total' in trace.meta:
+            sent += len(trace.x)
+            total += trace.meta['points_total']
+    return sent, total
+
+def render_points_report(fig):
+    """Captions a chart whose series were downsampled with how many points were sent."""
+    sent, total = points_report(fig)
+    if sent < total:
+        st.caption(f"Showing {sent:,} of {total:,} data points (downsampled to the chart width).")
+    return sent, total
+
+
+# --- Chart backends ---
+
+def use_static_charts():
+    """Whether charts are drawn as pre-rendered images for this session."""
+    if not STATIC_CHARTS_AVAILABLE or CHART_BACKEND == 'interactive':
+        return False
+    return CHART_BACKEND == 'static' or bool(_session_setting('offline_mode', False))
+
+def render_chart(fig, width_px=DEFAULT_CHART_WIDTH_PX):
+    """
+    Draws a Plotly figure at container width: as a cached static image when
+    use_static_charts(), else (or if the figure can't be drawn statically) with Plotly.
+    """
+    if fig is not None and use_static_charts():
+        path = render_static_chart(fig.to_json(), width_px, _session_setting('app_theme', 'Light'))
+        if path is not None:
+            name = os.path.basename(path)
+            if static_serving_enabled() and name.endswith('.png'):
+                st.markdown(f'<img src="{static_base_url()}charts/{name}?v={name.split(".")[0]}" '
+                            f'loading="lazy" style="width:100%;height:auto;" alt="">', unsafe_allow_html=True)
+            elif name.endswith('.svg'):
+                with open(path, 'r', encoding='utf-8') as f:
+                    st.image(f.read(), use_container_width=True)
+            else:
+                st.image(path, use_container_width=True)
+            return
+    st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,194 @@
+# utils/compaction_utils.py
+"""
+Background compaction and retention for the parent observation log.
+
+A single daemon thread per process periodically:
+  1. drops superseded (child_name, date) duplicates from the live file, and
+  2. if a retention horizon is configured, rolls observations older than the
+     horizon into per-child weekly aggregates and moves the raw records to
+     compressed cold storage (see Repository.archive_parent_observations).
+     The aggregates are saved through the repository before any record leaves
+     the live store, and records without a valid date are left in place.
+
+Each weekly aggregate lists the observation dates it already includes, so if a
+pass fails after saving the aggregates the next pass skips those records
+instead of counting them twice.
+
+All storage access goes through the configured repository, which serializes it
+with the same lock used by live saves, so the job is safe to run alongside page
+writes.
+"""
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from utils.repository import get_repository
+
+DEFAULT_COMPACTION_INTERVAL_SECONDS = 6 * 60 * 60
+
+# Numeric observation fields averaged into the weekly aggregates
+WEEKLY_SUMMARY_FIELDS = [
+    'homework_completion', 'reading_time', 'behavior_rating', 'mood_rating',
+    'sleep_hours', 'screen_time', 'physical_activity'
+]
+
+_worker_lock = threading.Lock()
+_worker_thread = None
+_last_run = {}
+
+def get_retention_days():
+    """
+    Returns the configured retention horizon in days, or None when retention is off.
+
+    Set 'observation_retention_days' in data/app_settings.json to enable it.
+    """
+    value = get_repository().load_app_settings().get('observation_retention_days')
+    try:
+        days = int(value)
+    except (TypeError, ValueError):
+        return None
+    return days if days > 0 else None
+
+def _week_start(obs_date):
+    """Returns the Monday (ISO string) of the week containing obs_date, or None if it isn't a date."""
+    try:
+        day = date.fromisoformat(str(obs_date)[:10])
+    except ValueError:
+        return None
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+def build_weekly_summaries(observations):
+    """
+    Aggregates raw observations into one record per (child_name, week_start).
+
+    Each summary keeps the observation count, the dates it covers and a
+    per-field sum and count, so summaries for the same week can be merged later
+    without losing precision. Observations without a valid date are skipped.
+    """
+    summaries = {}
+    for obs in observations:
+        week_start = _week_start(obs.get('date'))
+        if week_start is None:
+            continue
+        key = (obs.get('child_name'), week_start)
+        summary = summaries.setdefault(key, {
+            'child_name': key[0],
+            'week_start': key[1],
+            'observation_count': 0,
+            'dates': [],
+            'sums': {},
+            'counts': {},
+        })
+        summary['observation_count'] += 1
+        summary['dates'].append(str(obs.get('date'))[:10])
+        for field in WEEKLY_SUMMARY_FIELDS:
+            value = obs.get(field)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                summary['sums'][field] = summary['sums'].get(field, 0) + value
+                summary['counts'][field] = summary['counts'].get(field, 0) + 1
+    for summary in summaries.values():
+        summary['averages'] = {
+            field: round(summary['sums'][field] / summary['counts'][field], 2)
+            for field in summary['sums']
+        }
+    return summaries
+
+def _is_summarized(stored, obs):
+    """True if obs is already counted in the stored summary for its week."""
+    summary = stored.get((obs.get('child_name'), _week_start(obs.get('date'))))
+    return summary is not None and str(obs.get('date'))[:10] in summary.get('dates', ())
+
+def _merge_weekly_summaries(stored, new):
+    """
+    Combines freshly built summaries with the stored ones for the same weeks.
+    Returns only the weeks that changed, ready to upsert.
+    """
+    changed = []
+    for key, summary in new.items():
+        current = stored.get(key)
+        if current is None:
+            changed.append(summary)
+            continue
+        current = dict(current, sums=dict(current['sums']), counts=dict(current['counts']))
+        current['observation_count'] += summary['observation_count']
+        current['dates'] = sorted(set(current.get('dates', [])) | set(summary['dates']))
+        for field, total in summary['sums'].items():
+            current['sums'][field] = current['sums'].get(field, 0) + total
+            current['counts'][field] = current['counts'].get(field, 0) + summary['counts'][field]
+        current['averages'] = {
+            field: round(current['sums'][field] / current['counts'][field], 2)
+            for field in current['sums']
+        }
+        changed.append(current)
+    return changed
+
+def run_compaction(retention_days=None):
+    """
+    Runs one compaction pass and returns a small report dict.
+
+    Args:
+        retention_days (int, optional): Horizon for rolling up old observations.
+            Defaults to the value from app settings; None disables roll-up.
+    """
+    started = time.perf_counter()
+    report = {'started_at': datetime.now().isoformat(), 'duplicates_removed': 0,
+              'archived': 0, 'weeks_summarized': 0}
+
+    repository = get_repository()
+    report['duplicates_removed'] = repository.compact_parent_observations()
+
+    if retention_days is None:
+        retention_days = get_retention_days()
+    if retention_days:
+        cutoff = date.today() - timedelta(days=retention_days)
+
+        def save_summaries(archived):
+            stored = {(s.get('child_name'), s.get('week_start')): s
+                      for s in repository.load_weekly_observation_summaries()}
+            summaries = build_weekly_summaries(obs for obs in archived if not _is_summarized(stored, obs))
+            changed = _merge_weekly_summaries(stored, summaries)
+            if changed and not repository.save_weekly_observation_summaries(changed):
+                raise RuntimeError("Could not save the weekly observation summaries")
+            report['weeks_summarized'] = len(summaries)
+
+        archived = repository.archive_parent_observations(cutoff, before_remove=save_summaries)
+        report['archived'] = len(archived)
+
+    report['duration_seconds'] = round(time.perf_counter() - started, 3)
+    _last_run.clear()
+    _last_run.update(report)
+    return report
+
+def get_last_compaction_report():
+    """Returns the report from the most recent compaction pass in this process."""
+    return dict(_last_run)
+
+def _compaction_loop(interval_seconds):
+    """Worker body: compact once at startup, then every interval_seconds."""
+    while True:
+        try:
+            run_compaction()
+        except Exception as e:
+            print(f"Error during observation compaction: {e}")
+        time.sleep(interval_seconds)
+
+def start_compaction_worker(interval_seconds=None):
+    """
+    Starts the background compaction thread if it isn't already running.
+
+    Safe to call on every script rerun: only the first call in a process starts
+    a thread. The interval can be overridden with EDUSCAN_COMPACTION_INTERVAL.
+    """
+    global _worker_thread
+    with _worker_lock:
+        if _worker_thread is not None and _worker_thread.is_alive():
+            return _worker_thread
+        if interval_seconds is None:
+            interval_seconds = int(os.environ.get('EDUSCAN_COMPACTION_INTERVAL', DEFAULT_COMPACTION_INTERVAL_SECONDS))
+        _worker_thread = threading.Thread(
+            target=_compaction_loop, args=(interval_seconds,),
+            name="eduscan-compaction", daemon=True
+        )
+        _worker_thread.start()
+        return _worker_thread
@@ -1,27 +1,114 @@
+import bisect
+import gzip
 import json
 import os
-from datetime import datetime
+import threading
+from datetime import date, datetime
 
 # Define file paths
 STUDENT_DATA_FILE = "data/student_data.json"
 PARENT_OBSERVATIONS_FILE = "data/parent_observations.json"
 APP_SETTINGS_FILE = "data/app_settings.json" # Already in use
+OBSERVATION_ARCHIVE_DIR = "data/archive"
 
 def _ensure_data_directory_exists():
     """Ensures that the 'data' directory exists."""
     os.makedirs("data", exist_ok=True)
 
+_JSON_CHUNK_SIZE = 64 * 1024
+_json_decoder = json.JSONDecoder()
+
+def _iter_json_array(file_path, strict=False):
+    """
+    Yields the elements of a top-level JSON array one at a time.
+
+    Reads the file in fixed-size chunks and decodes one element at a time, so
+    peak memory is bounded by the largest single record rather than the whole
+    file. A file holding a single JSON object yields that object, matching
+    _load_json_data. Elements must be separated by commas and nothing but
+    whitespace may follow the closing bracket.
+
+    Args:
+        file_path (str): JSON file to read. Missing or empty files yield nothing.
+        strict (bool): Raise json.JSONDecodeError on malformed input instead of
+            printing a warning and stopping at the last complete record.
+    """
+    if not os.path.exists(file_path) or os.stat(file_path).st_size == 0:
+        return
+    with open(file_path, 'r') as f:
+        buf = ''
+        pos = 0
+        eof = False
+        # What may come next: 'start' (the top-level value), 'first' (an element
+        # or ']' right after '['), 'element' (after ','), 'separator' (',' or ']'),
+        # 'end' (only whitespace)
+        state = 'start'
+
+        def fail(message):
+            if strict:
+                raise json.JSONDecodeError(message, buf, pos)
+            print(f"Warning: {message}. Stopping at the last complete record.")
+
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n':
+                pos += 1
+            if pos == len(buf) and not eof:
+                chunk = f.read(_JSON_CHUNK_SIZE)
+                buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+                continue
+            if pos == len(buf):
+                if state in ('first', 'element', 'separator'):
+                    fail(f"Unterminated JSON array in {file_path}")
+                return
+            char = buf[pos]
+            if state == 'end':
+                fail(f"Unexpected data after the top-level value in {file_path}")
+                return
+            if state == 'separator' or (state == 'first' and char == ']'):
+                if char == ']':
+                    pos += 1
+                    state = 'end'
+                elif char == ',' and state == 'separator':
+                    pos += 1
+                    state = 'element'
+                else:
+                    fail(f"Expected ',' or ']' between array elements in {file_path}")
+                    return
+                continue
+            if state == 'start' and char == '[':
+                pos += 1
+                state = 'first'
+                continue
+            try:
+                value, end = _json_decoder.raw_decode(buf, pos)
+                # A number cut by the chunk edge ('-1.' of '-1.5e3') decodes as a shorter
+                # one; only trust it once a delimiter follows
+                if not eof and (end == len(buf) or (
+                        not isinstance(value, (dict, list, str)) and buf[end] not in ' \t\r\n,]}')):
+                    raise ValueError("value may be truncated")
+            except ValueError as e:
+                if eof:
+                    if strict:
+                        raise
+                    print(f"Warning: JSONDecodeError in {file_path} ({e}). Stopping at the last complete record.")
+                    return
+                chunk = f.read(_JSON_CHUNK_SIZE)
+                buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+                continue
+            pos = end
+            if state == 'start':
+                if value:
+                    yield value
+                state = 'end'
+            else:
+                yield value
+                state = 'separator'
+
 def _load_json_data(file_path):
     """Loads data from a JSON file. Returns an empty list if file doesn't exist or is empty/corrupt."""
     _ensure_data_directory_exists()
-    if not os.path.exists(file_path) or os.stat(file_path).st_size == 0:
-        return []
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-            if not isinstance(data, list): # Ensure it's a list, even if file contained a single object
-                return [data] if data else []
-            return data
+        return list(_iter_json_array(file_path, strict=True))
     except json.JSONDecodeError:
         print(f"Warning: JSONDecodeError in {file_path}. File might be corrupt or empty. Returning empty list.")
         return []
@@ -30,11 +117,17 @@ def _load_json_data(file_path):
         return []
 
 def _save_json_data(file_path, data):
-    """Saves data to a JSON file."""
-    _ensure_data_directory_exists()
+    """Saves data to a JSON file.
+
+    Writes to a temporary file and renames it into place, so concurrent readers
+    (including the background compaction job) never see a half-written file.
+    """
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
     try:
-        with open(file_path, 'w') as f:
+        with open(tmp_path, 'w') as f:
             json.dump(data, f, indent=2)
+        os.replace(tmp_path, file_path)
         return True
     except Exception as e:
         print(f"Error saving to {file_path}: {e}")
@@ -46,23 +139,300 @@ def load_student_data():
     """Loads all student prediction records."""
     return _load_json_data(STUDENT_DATA_FILE)
 
+def iter_student_data():
+    """Yields student prediction records one at a time without loading the whole file."""
+    return _iter_json_array(STUDENT_DATA_FILE)
+
 def save_prediction_data(new_record):
     """Appends a new student prediction record to the data file."""
     records = load_student_data()
     records.append(new_record)
     return _save_json_data(STUDENT_DATA_FILE, records)
 
+# --- Per-child index over Parent Observation Data ---
+
+def _file_signature(file_path):
+    """Returns (mtime_ns, size) for a file, or None if it doesn't exist."""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _to_iso_date(value):
+    """Normalizes a date/datetime/ISO string to a 'YYYY-MM-DD' string."""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)[:10]
+
+def _is_archivable(obs_date, cutoff):
+    """Whether a 'YYYY-MM-DD' key is a real date before cutoff; undated records are never archived."""
+    try:
+        date.fromisoformat(obs_date)
+    except ValueError:
+        return False
+    return obs_date < cutoff
+
+def _observation_key(observation):
+    """Returns the (child_name, date) key an observation is stored under."""
+    return (observation.get('child_name'), _to_iso_date(observation.get('date', '')))
+
+def _index_observation(by_child, offset, observation):
+    """Inserts one record offset into its child's date-sorted offset list."""
+    dates, offsets = by_child.setdefault(observation.get('child_name'), ([], []))
+    obs_date = _to_iso_date(observation.get('date', ''))
+    position = bisect.bisect_right(dates, obs_date)
+    dates.insert(position, obs_date)
+    offsets.insert(position, offset)
+
+def _build_observation_index(observations):
+    """
+    Builds the lookup structures for a list of observations.
+
+    When history holds several records for the same (child_name, date), only the
+    one with the latest timestamp (or, on a tie, the later one in the file) is
+    indexed, so views never see superseded entries.
+
+    Returns:
+        tuple: ({(child_name, date): offset},
+                {child_name: (sorted ISO dates, matching record offsets)})
+    """
+    by_key = {}
+    for offset, observation in enumerate(observations):
+        key = _observation_key(observation)
+        current = by_key.get(key)
+        if current is None or observations[current].get('timestamp', '') <= observation.get('timestamp', ''):
+            by_key[key] = offset
+    entries = {}
+    for (child_name, obs_date), offset in by_key.items():
+        entries.setdefault(child_name, []).append((obs_date, offset))
+    by_child = {}
+    for child_name, child_entries in entries.items():
+        child_entries.sort()
+        by_child[child_name] = ([d for d, _ in child_entries], [o for _, o in child_entries])
+    return by_key, by_child
+
+class ObservationFileStore:
+    """
+    Parent observations kept in one JSON file, with an in-process index.
+
+    The index maps (child_name, date) to a record offset and each child to its
+    date-sorted offsets. It is rebuilt whenever the file changes underneath us
+    and updated incrementally by save().
+    """
+
+    def __init__(self, file_path, archive_dir):
+        self.file_path = file_path
+        self.archive_dir = archive_dir
+        self._lock = threading.RLock()
+        self._index = None
+
+    def _reset_index(self, records):
+        """Replaces the cached index with one built from records. Callers must hold the lock."""
+        by_key, by_child = _build_observation_index(records)
+        self._index = {
+            'signature': _file_signature(self.file_path),
+            'records': records,
+            'by_key': by_key,
+            'by_child': by_child,
+        }
+        return self._index
+
+    def _get_index(self):
+        """Returns the index, rebuilding it if the data file changed on disk. Callers must hold the lock."""
+        signature = _file_signature(self.file_path)
+        if self._index is None or self._index['signature'] != signature:
+            return self._reset_index(_load_json_data(self.file_path))
+        return self._index
+
+    def load_all(self):
+        """Loads all observation records, including superseded ones."""
+        return _load_json_data(self.file_path)
+
+    def iter_all(self):
+        """Yields observation records one at a time without loading the whole file."""
+        return _iter_json_array(self.file_path)
+
+    def load_current(self):
+        """Returns copies of the current record for every (child_name, date), superseded ones dropped."""
+        with self._lock:
+            index = self._get_index()
+            records = index['records']
+            return [dict(records[offset]) for offset in sorted(index['by_key'].values())]
+
+    def load_child(self, child_name, start_date=None, end_date=None):
+        """Returns copies of one child's current observations between the dates (inclusive), oldest first."""
+        with self._lock:
+            index = self._get_index()
+            dates, offsets = index['by_child'].get(child_name, ([], []))
+            lo = bisect.bisect_left(dates, _to_iso_date(start_date)) if start_date else 0
+            hi = bisect.bisect_right(dates, _to_iso_date(end_date)) if end_date else len(dates)
+            records = index['records']
+            return [dict(records[offset]) for offset in offsets[lo:hi]]
+
+    def save(self, new_observation):
+        """Upserts an observation on (child_name, date)."""
+        with self._lock:
+            index = self._get_index()
+            records = index['records']
+            key = _observation_key(new_observation)
+            offset = index['by_key'].get(key)
+            if offset is not None:
+                previous = records[offset]
+                records[offset] = new_observation
+                if not _save_json_data(self.file_path, records):
+                    records[offset] = previous
+                    return False
+            else:
+                records.append(new_observation)
+                if not _save_json_data(self.file_path, records):
+                    records.pop()
+                    return False
+                offset = len(records) - 1
+                index['by_key'][key] = offset
+                _index_observation(index['by_child'], offset, new_observation)
+            index['signature'] = _file_signature(self.file_path)
+            return True
+
+    def delete(self, child_name, obs_date):
+        """
+        Deletes the observation stored for (child_name, obs_date). Returns True if
+        one was removed, False if there was none; raises IOError if the file
+        couldn't be rewritten.
+        """
+        with self._lock:
+            index = self._get_index()
+            key = (child_name, _to_iso_date(obs_date))
+            if key not in index['by_key']:
+                return False
+            records = [obs for obs in index['records'] if _observation_key(obs) != key]
+            if not _save_json_data(self.file_path, records):
+                raise IOError(f"could not rewrite {self.file_path}")
+            self._reset_index(records)
+            return True
+
+    def compact(self):
+        """Rewrites the file without superseded records. Returns how many were removed."""
+        with self._lock:
+            index = self._get_index()
+            records = index['records']
+            kept = [records[offset] for offset in sorted(index['by_key'].values())]
+            removed = len(records) - len(kept)
+            if removed == 0:
+                return 0
+            if not _save_json_data(self.file_path, kept):
+                return 0
+            self._reset_index(kept)
+            return removed
+
+    def archive_before(self, before_date, before_remove=None):
+        """
+        Moves observations dated before before_date into a gzip archive in archive_dir.
+
+        The archive is written before the live file is rewritten, so a failure part
+        way through never loses raw records. before_remove, if given, is called with
+        the records in between; if it raises, the archive is deleted and nothing is
+        removed. Records without a valid date stay in the live file. Returns the
+        archived records.
+        """
+        cutoff = _to_iso_date(before_date)
+        with self._lock:
+            records = self._get_index()['records']
+            archived, kept = [], []
+            for obs in records:
+                (archived if _is_archivable(_to_iso_date(obs.get('date', '')), cutoff) else kept).append(obs)
+            if not archived:
+                return []
+            os.makedirs(self.archive_dir, exist_ok=True)
+            archive_path = os.path.join(
+                self.archive_dir,
+                f"parent_observations_before_{cutoff}_{datetime.now().strftime('%Y%m%dT%H%M%S')}.json.gz"
+            )
+            try:
+                with gzip.open(archive_path, 'wt', encoding='utf-8') as f:
+                    json.dump(archived, f)
+            except Exception as e:
+                print(f"Error writing archive {archive_path}: {e}")
+                return []
+            _before_archive_removal(before_remove, archived, archive_path)
+            if not _save_json_data(self.file_path, kept):
+                return []
+            self._reset_index(kept)
+            return archived
+
+def _before_archive_removal(before_remove, archived, archive_path):
+    """Runs an archive_before() hook, deleting the just-written archive if it raises."""
+    if before_remove is None:
+        return
+    try:
+        before_remove(archived)
+    except Exception:
+        os.remove(archive_path)
+        raise
+
+_observation_store = ObservationFileStore(PARENT_OBSERVATIONS_FILE, OBSERVATION_ARCHIVE_DIR)
+
 # --- Public API for Parent Observation Data ---
 
 def load_parent_observations():
     """Loads all parent observation records."""
-    return _load_json_data(PARENT_OBSERVATIONS_FILE)
+    return _observation_store.load_all()
+
+def iter_parent_observations():
+    """Yields parent observation records one at a time without loading the whole file."""
+    return _observation_store.iter_all()
+
+def load_child_observations(child_name, start_date=None, end_date=None):
+    """
+    Loads one child's observations, oldest first, using the per-child index.
+
+    Args:
+        child_name (str): Child whose observations to return.
+        start_date (date or str, optional): Earliest observation date to include.
+        end_date (date or str, optional): Latest observation date to include.
+    Returns:
+        list: Copies of the matching observation records, sorted by date.
+    """
+    return _observation_store.load_child(child_name, start_date, end_date)
 
 def save_parent_observation(new_observation):
-    """Appends a new parent observation record to the data file."""
-    observations = load_parent_observations()
-    observations.append(new_observation)
-    return _save_json_data(PARENT_OBSERVATIONS_FILE, observations)
+    """
+    Upserts a parent observation: a child has at most one observation per day,
+    so saving again for the same (child_name, date) replaces the earlier record.
+    """
+    return _observation_store.save(new_observation)
+
+def delete_parent_observation(child_name, obs_date):
+    """
+    Deletes the observation stored for (child_name, obs_date). Returns True if one
+    was removed, False if there was none; raises IOError if the file couldn't be
+    rewritten.
+    """
+    return _observation_store.delete(child_name, obs_date)
+
+def compact_parent_observations():
+    """
+    Rewrites the observation file keeping only the current record for each
+    (child_name, date), dropping duplicates left by the old append-only saves.
+
+    Returns:
+        int: Number of superseded records removed.
+    """
+    return _observation_store.compact()
+
+def archive_parent_observations(before_date, before_remove=None):
+    """
+    Moves observations dated before before_date out of the live file into a
+    gzip-compressed archive under OBSERVATION_ARCHIVE_DIR. before_remove is
+    called with the records before they leave the live file (see
+    ObservationFileStore.archive_before).
+
+    Returns:
+        list: The archived records (empty if nothing was old enough).
+    """
+    return _observation_store.archive_before(before_date, before_remove)
 
 # --- Public API for App Settings (Already in utils/language_utils, confirming consistency) ---
 # Note: These are defined in language_utils.py, but shown here for context of data files.
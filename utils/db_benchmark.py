@@ -0,0 +1,236 @@
+# utils/db_benchmark.py
+"""
+Benchmarks for the PostgreSQL access paths in utils/db_utils.
+
+    python -m utils.db_benchmark                 # 100k rows
+    python -m utils.db_benchmark --rows 20000
+    python -m utils.db_benchmark --mapping-only  # no database needed
+
+Row mapping times the old hand-written positional dicts, row_factory()
+and, for reference, namedtuple rows as psycopg2's NamedTupleCursor builds
+them. row_factory() is the slowest of the three (about 1.5x the dict
+literal); it is used so each query's columns are listed once, and the
+repository contract needs plain dicts, which rules out namedtuples. The
+database part inserts the rows one statement at a time
+with plain cur.execute() and with execute_prepared(), then runs the history
+page query both ways; that part runs in a transaction that is rolled back.
+
+The functions themselves are then compared with the versions they replaced:
+save_prediction_to_db() against the previous per-row save (plain execute),
+and a 20-row iter_student_predictions() page against the previous path,
+which always opened a server-side cursor. Those commit, so the benchmark
+student's rows are deleted afterwards.
+"""
+import argparse
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from utils.db_utils import (
+    PREDICTION_COLUMNS, STREAM_ITERSIZE, _convert_prediction, _stream_records, db_connection,
+    execute_prepared, forget_student_id, get_or_create_student_id, iter_student_predictions,
+    prediction_query, row_factory, save_prediction_to_db
+)
+
+BENCHMARK_STUDENT = "Benchmark Student"
+
+INSERT_PREDICTION_SQL = """
+    INSERT INTO predictions (
+        student_id, math_score, reading_score, writing_score,
+        attendance, behavior, literacy, prediction, probability,
+        risk_level, notes, timestamp
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+def _timed(func, count):
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    return elapsed, count / elapsed if elapsed else float('inf')
+
+def _prediction_row(i):
+    """A row shaped like the PREDICTION_COLUMNS select"""
+    return (i, 50 + i % 50, 60 + i % 40, 55 + i % 45, 90.0, 3, 4, i % 2, (i % 100) / 100,
+            ['Low', 'Medium', 'High'][i % 3], '', datetime(2025, 1, 1) + timedelta(minutes=i),
+            f"Student {i % 50}", 'Grade 3')
+
+def _positional_mapping(row):
+    # The style db_utils used before row_factory()
+    return {
+        'id': row[0],
+        'math_score': row[1],
+        'reading_score': row[2],
+        'writing_score': row[3],
+        'attendance': row[4],
+        'behavior': row[5],
+        'literacy': row[6],
+        'prediction': row[7],
+        'probability': row[8],
+        'risk_level': row[9],
+        'notes': row[10],
+        'timestamp': row[11],
+        'student_name': row[12],
+        'grade_level': row[13],
+    }
+
+def benchmark_row_mapping(rows=100_000):
+    """Times row -> record mapping. Returns {method: (seconds, rows_per_second)}."""
+    data = [_prediction_row(i) for i in range(rows)]
+    names = tuple(name for name, _ in PREDICTION_COLUMNS)
+    to_record = row_factory(names)
+    make_row = namedtuple('PredictionRow', names)._make
+    return {
+        "hand-written positional dict": _timed(lambda: [_positional_mapping(row) for row in data], rows),
+        "row_factory()": _timed(lambda: [to_record(row) for row in data], rows),
+        "namedtuple (not a dict)": _timed(lambda: [make_row(row) for row in data], rows),
+    }
+
+def benchmark_prepared_statements(rows=100_000, page_queries=2000):
+    """
+    Times per-row inserts and page selects with and without prepared statements.
+    Returns {operation: (seconds, ops_per_second)}, or None without a database.
+    """
+    timings = {}
+    with db_connection() as conn:
+        if conn is None:
+            return None
+        cur = conn.cursor()
+        try:
+            student_id = get_or_create_student_id(cur, BENCHMARK_STUDENT, 'Grade 3')
+            start = datetime(2030, 1, 1)
+
+            def params(i):
+                return (student_id, 50 + i % 50, 60 + i % 40, 55 + i % 45, 90.0, 3, 4, i % 2,
+                        (i % 100) / 100, ['Low', 'Medium', 'High'][i % 3], '', start + timedelta(seconds=i))
+
+            def plain_inserts():
+                for i in range(rows):
+                    cur.execute(INSERT_PREDICTION_SQL, params(i))
+
+            def prepared_inserts():
+                for i in range(rows, 2 * rows):
+                    execute_prepared(cur, INSERT_PREDICTION_SQL, params(i))
+
+            timings["insert, cur.execute"] = _timed(plain_inserts, rows)
+            timings["insert, execute_prepared"] = _timed(prepared_inserts, rows)
+
+            sql, page_params = prediction_query(BENCHMARK_STUDENT, None, None, 20, True)
+
+            def plain_pages():
+                for _ in range(page_queries):
+                    cur.execute(sql, page_params)
+                    cur.fetchall()
+
+            def prepared_pages():
+                for _ in range(page_queries):
+                    execute_prepared(cur, sql, page_params)
+                    cur.fetchall()
+
+            timings["history page, cur.execute"] = _timed(plain_pages, page_queries)
+            timings["history page, execute_prepared"] = _timed(prepared_pages, page_queries)
+        finally:
+            conn.rollback()
+            forget_student_id(BENCHMARK_STUDENT)
+    return timings
+
+def _previous_save_prediction(prediction_data):
+    """save_prediction_to_db() as it was before prepared statements"""
+    with db_connection() as conn:
+        if conn is None:
+            return False
+        cur = conn.cursor()
+        cur.execute("""
+            INSERT INTO students (name, grade_level) VALUES (%s, %s)
+            ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
+            RETURNING id
+        """, (prediction_data['student_name'], prediction_data['grade_level']))
+        student_id = cur.fetchone()[0]
+        cur.execute(INSERT_PREDICTION_SQL, (
+            student_id, prediction_data['math_score'], prediction_data['reading_score'],
+            prediction_data['writing_score'], prediction_data['attendance'], prediction_data['behavior'],
+            prediction_data['literacy'], prediction_data['prediction'], prediction_data['probability'],
+            prediction_data['risk_level'], prediction_data['notes'],
+            datetime.fromisoformat(prediction_data['timestamp'])
+        ))
+        conn.commit()
+        return True
+
+def _previous_history_page(student_name, limit):
+    """A history page as iter_student_predictions() fetched it before: always through a named cursor"""
+    sql, params = prediction_query(student_name, None, None, limit, True)
+    return list(_stream_records(sql, params, PREDICTION_COLUMNS, _convert_prediction, STREAM_ITERSIZE))
+
+def _delete_benchmark_rows():
+    with db_connection() as conn:
+        if conn is None:
+            return
+        cur = conn.cursor()
+        cur.execute("DELETE FROM predictions WHERE student_id IN (SELECT id FROM students WHERE name = %s)",
+                    (BENCHMARK_STUDENT,))
+        cur.execute("DELETE FROM students WHERE name = %s", (BENCHMARK_STUDENT,))
+        conn.commit()
+    forget_student_id(BENCHMARK_STUDENT)
+
+def benchmark_functions(rows=2000, page_queries=500):
+    """
+    Times the public db_utils functions against the versions they replaced.
+    Returns {operation: (seconds, ops_per_second)}, or None without a database.
+    """
+    with db_connection() as conn:
+        if conn is None:
+            return None
+    start = datetime(2030, 1, 1)
+
+    def record(i):
+        return {'student_name': BENCHMARK_STUDENT, 'grade_level': 'Grade 3', 'math_score': 50 + i % 50,
+                'reading_score': 60 + i % 40, 'writing_score': 55 + i % 45, 'attendance': 90.0,
+                'behavior': 3, 'literacy': 4, 'prediction': i % 2, 'probability': (i % 100) / 100,
+                'risk_level': ['Low', 'Medium', 'High'][i % 3], 'notes': '',
+                'timestamp': (start + timedelta(seconds=i)).isoformat()}
+
+    timings = {}
+    try:
+        timings["save, previous save_prediction_to_db"] = _timed(
+            lambda: [_previous_save_prediction(record(i)) for i in range(rows)], rows)
+        timings["save, save_prediction_to_db"] = _timed(
+            lambda: [save_prediction_to_db(record(i)) for i in range(rows, 2 * rows)], rows)
+        timings["20-row page, previous path"] = _timed(
+            lambda: [_previous_history_page(BENCHMARK_STUDENT, 20) for _ in range(page_queries)], page_queries)
+        timings["20-row page, iter_student_predictions"] = _timed(
+            lambda: [list(iter_student_predictions(BENCHMARK_STUDENT, limit=20)) for _ in range(page_queries)],
+            page_queries)
+    finally:
+        _delete_benchmark_rows()
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark EduScan database access paths.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows mapped and inserted per method")
+    parser.add_argument("--mapping-only", action="store_true", help="Skip the database benchmark")
+    args = parser.parse_args(argv)
+
+    print(f"== row mapping ({args.rows} rows)")
+    for name, (seconds, rate) in benchmark_row_mapping(args.rows).items():
+        print(f"  {name:<34} {seconds:8.3f}s  {rate:12.1f} rows/s")
+
+    if args.mapping_only:
+        return 0
+    print(f"== prepared statements ({args.rows} rows)")
+    timings = benchmark_prepared_statements(args.rows)
+    if timings is None:
+        print("  database unavailable (set DATABASE_URL)")
+        return 1
+    for name, (seconds, rate) in timings.items():
+        print(f"  {name:<38} {seconds:8.3f}s  {rate:12.1f} ops/s")
+
+    function_rows = min(args.rows, 2000)
+    print(f"== db_utils functions vs. the versions they replaced ({function_rows} saves)")
+    for name, (seconds, rate) in benchmark_functions(function_rows).items():
+        print(f"  {name:<38} {seconds:8.3f}s  {rate:12.1f} ops/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
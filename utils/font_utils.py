@@ -0,0 +1,364 @@
+# utils/font_utils.py
+"""
+Self-hosted fonts for the UI: Inter and a Material Symbols subset.
+
+build_fonts() finds every Material Symbols icon the app uses (literal
+get_material_icon_html(...) calls, fallback_icon=/icon_name= arguments and
+<span class="material-symbols-..."> markup in the Python sources), then
+writes into styles/fonts/:
+  - material-symbols.woff2: Material Symbols Outlined cut down to exactly
+    those icons (Google Fonts' icon_names= parameter, or a local copy of
+    the font subset with fontTools), with the FILL axis and the weights the
+    stylesheet uses;
+  - inter-latin.woff2, inter-latin-ext.woff2: the Inter variable font;
+and styles/fonts.css with the @font-face rules for them. The asset
+pipeline (utils/asset_utils.py) puts that CSS at the top of the UI
+stylesheet and serves the font files from static/ like its images.
+
+Without network access and local sources, the icons are cut from the
+static Material Symbols Rounded font that ships with Streamlit (no FILL
+axis, weight 400) and declared as SYMBOLS_FALLBACK_FAMILY rather than as
+Outlined, and Inter is left out. The committed build was made that way.
+get_font_css() @imports whatever the build lacks (Inter, Material Symbols
+Outlined) from Google Fonts, so pages keep their typeface and icon style
+online and fall back to the local subset and sans-serif offline. Rebuild
+with network access to bundle both; EDUSCAN_REMOTE_FONTS=0 turns the
+imports off.
+
+    python -m utils.font_utils build
+    python -m utils.font_utils build --symbols-source MaterialSymbolsOutlined.ttf --inter-source Inter.ttf
+    python -m utils.font_utils icons          # list the icons found
+
+Rebuild after adding an icon; `check` reports icons missing from the subset.
+"""
+import argparse
+import glob
+import io
+import json
+import os
+import re
+from urllib.parse import quote
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STYLES_DIR = os.path.join(ROOT_DIR, "styles")
+FONTS_DIR = os.path.join(STYLES_DIR, "fonts")
+FONT_CSS_FILE = os.path.join(STYLES_DIR, "fonts.css")
+ICONS_FILE = os.path.join(FONTS_DIR, "icons.json")
+# Python sources scanned for icon names
+SOURCE_GLOBS = ("app.py", "pages/*.py", "utils/*.py")
+# Icons whose names are only known at run time
+EXTRA_ICON_NAMES = ()
+
+# Material Symbols axes kept in the subset: the stylesheet uses weights 400-600 and FILL 0/1.
+# In the order Google Fonts requires (alphabetical, lowercase tags first).
+SYMBOLS_AXES = {'opsz': 24, 'wght': (400, 600), 'FILL': (0, 1), 'GRAD': 0}
+INTER_WEIGHTS = (300, 800)
+# Inter's Google Fonts subsets served locally (Somali and English need only Latin)
+INTER_SUBSETS = ('latin', 'latin-ext')
+GOOGLE_FONTS_CSS_URL = "https://fonts.googleapis.com/css2"
+# Google Fonts picks the font format by user agent; this one gets WOFF2
+_WOFF2_USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                     "(KHTML, like Gecko) Chrome/120.0 Safari/537.36")
+
+SYMBOLS_FAMILY = 'Material Symbols Outlined'
+# Family of an icon subset cut from another style (Streamlit's Rounded font), so
+# it neither passes for Outlined nor shadows the Rounded font Streamlit's own UI uses
+SYMBOLS_FALLBACK_FAMILY = 'EduScan Symbols'
+
+# Google Fonts imports for families the build didn't bundle; EDUSCAN_REMOTE_FONTS=0 disables them
+REMOTE_FONTS_ENV = "EDUSCAN_REMOTE_FONTS"
+REMOTE_FONT_IMPORTS = {
+    'Inter': "@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');",
+    SYMBOLS_FAMILY: "@import url('https://fonts.googleapis.com/css2?family=Material+Symbols+Outlined:"
+                    "opsz,wght,FILL,GRAD@20..48,100..700,0..1,-50..200');",
+}
+
+_ICON_PATTERNS = (
+    re.compile(r"get_material_icon_html\(\s*['\"]([a-z0-9_]+)['\"]"),
+    re.compile(r"\b(?:fallback_icon|icon_name)\s*=\s*['\"]([a-z0-9_]+)['\"]"),
+    re.compile(r"class=['\"]material-symbols-[a-z]+['\"][^>]*>\s*([a-z0-9_]+)\s*<"),
+)
+_URL_REFERENCE = re.compile(r"url\(\s*['\"]?([^'\")]+)['\"]?\s*\)")
+_FONT_FAMILY = re.compile(r"font-family:\s*'([^']+)'")
+
+
+def scan_icon_names(root=ROOT_DIR):
+    """Sorted names of the Material Symbols icons used in the app's sources."""
+    names = set(EXTRA_ICON_NAMES)
+    for pattern in SOURCE_GLOBS:
+        for path in glob.glob(os.path.join(root, pattern)):
+            with open(path, 'r', encoding='utf-8') as f:
+                source = f.read()
+            for icon_pattern in _ICON_PATTERNS:
+                names.update(icon_pattern.findall(source))
+    return sorted(names)
+
+
+def _axis_spec(value):
+    return f"{value[0]}..{value[1]}" if isinstance(value, tuple) else str(value)
+
+def _fetch(url, binary=False):
+    import requests
+    response = requests.get(url, headers={'User-Agent': _WOFF2_USER_AGENT}, timeout=30)
+    response.raise_for_status()
+    return response.content if binary else response.text
+
+def _font_faces(css):
+    """[(subset comment, src url, unicode-range or None)] from a Google Fonts stylesheet."""
+    faces = []
+    for comment, body in re.findall(r"(?:/\*\s*([\w-]+)\s*\*/\s*)?@font-face\s*\{([^}]*)\}", css):
+        src = re.search(r"src:\s*url\(([^)]+)\)", body)
+        unicode_range = re.search(r"unicode-range:\s*([^;]+);", body)
+        if src:
+            faces.append((comment or None, src.group(1), unicode_range.group(1).strip() if unicode_range else None))
+    return faces
+
+def fetch_symbols_subset(icon_names):
+    """(WOFF2 bytes, icon names) of Material Symbols Outlined limited to icon_names, from Google Fonts."""
+    axes = ",".join(SYMBOLS_AXES)
+    values = ",".join(_axis_spec(value) for value in SYMBOLS_AXES.values())
+    # icon_names must be sorted alphabetically
+    url = (f"{GOOGLE_FONTS_CSS_URL}?family=Material+Symbols+Outlined:{axes}@{values}"
+           f"&icon_names={quote(','.join(sorted(icon_names)), safe=',')}&display=block")
+    faces = _font_faces(_fetch(url))
+    if not faces:
+        raise ValueError("Google Fonts returned no Material Symbols font")
+    return _fetch(faces[0][1], binary=True), sorted(icon_names)
+
+def fetch_inter():
+    """{subset: (WOFF2 bytes, unicode-range)} for INTER_SUBSETS of the Inter variable font."""
+    url = f"{GOOGLE_FONTS_CSS_URL}?family=Inter:wght@{INTER_WEIGHTS[0]}..{INTER_WEIGHTS[1]}&display=swap"
+    fonts = {}
+    for subset, src, unicode_range in _font_faces(_fetch(url)):
+        if subset in INTER_SUBSETS:
+            fonts[subset] = (_fetch(src, binary=True), unicode_range)
+    if not fonts:
+        raise ValueError("Google Fonts returned no Inter font")
+    return fonts
+
+
+def bundled_symbols_font():
+    """Path of the Material Symbols font bundled with Streamlit, or None."""
+    try:
+        import streamlit
+    except ImportError:
+        return None
+    media_dir = os.path.join(os.path.dirname(streamlit.__file__), "static", "static", "media")
+    paths = sorted(glob.glob(os.path.join(media_dir, "MaterialSymbols-*.woff2")))
+    return paths[0] if paths else None
+
+
+def _woff2(font):
+    font.flavor = 'woff2'
+    buffer = io.BytesIO()
+    font.save(buffer)
+    return buffer.getvalue()
+
+def _ligature_glyphs(font, icon_names):
+    """Names of the glyphs the font's ligatures produce for icon_names (spelled out in letters)."""
+    wanted = set(icon_names)
+    characters = {glyph: chr(codepoint) for codepoint, glyph in font.getBestCmap().items()}
+    glyphs = {}
+    for lookup in font['GSUB'].table.LookupList.Lookup:
+        for subtable in lookup.SubTable:
+            if lookup.LookupType == 7:  # extension lookup
+                subtable = subtable.ExtSubTable
+            for first, ligatures in getattr(subtable, 'ligatures', {}).items():
+                for ligature in ligatures:
+                    text = "".join(characters.get(glyph, "\0") for glyph in [first] + ligature.Component)
+                    if text in wanted:
+                        glyphs[text] = ligature.LigGlyph
+    return glyphs
+
+def subset_symbols(source_path, icon_names):
+    """
+    (WOFF2 bytes, icon names found) of a local Material Symbols font cut down
+    to icon_names and SYMBOLS_AXES, with fontTools.
+    """
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+    from fontTools.varLib import instancer
+
+    font = TTFont(source_path)
+    axes = {axis.axisTag for axis in font['fvar'].axes} if 'fvar' in font else set()
+    limits = {axis: value for axis, value in SYMBOLS_AXES.items() if axis in axes}
+    if limits:
+        font = instancer.instantiateVariableFont(font, limits)
+
+    glyphs = _ligature_glyphs(font, icon_names)
+    missing = sorted(set(icon_names) - set(glyphs))
+    if missing:
+        print(f"Warning: no Material Symbols glyph for {', '.join(missing)}")
+    options = subset.Options()
+    options.layout_closure = False  # otherwise every ligature spelled with the kept letters comes back
+    options.layout_features = ['liga', 'rlig', 'rclt', 'calt']
+    options.notdef_outline = True
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(glyphs=list(glyphs.values()), text="".join(sorted(set("".join(icon_names)))))
+    subsetter.subset(font)
+    return _woff2(font), sorted(glyphs)
+
+# Unicode ranges of Google Fonts' Inter 'latin' and 'latin-ext' subsets
+_INTER_RANGES = {
+    'latin': "U+0000-00FF, U+0131, U+0152-0153, U+02BB-02BC, U+02C6, U+02DA, U+02DC, U+0304, U+0308, "
+             "U+0329, U+2000-206F, U+20AC, U+2122, U+2191, U+2193, U+2212, U+2215, U+FEFF, U+FFFD",
+    'latin-ext': "U+0100-02BA, U+02BD-02C5, U+02C7-02CC, U+02CE-02D7, U+02DD-02FF, U+0304, U+0308, "
+                 "U+0329, U+1D00-1DBF, U+1E00-1E9F, U+1EF2-1EFF, U+2020, U+20A0-20AB, U+20AD-20C0, "
+                 "U+2113, U+2C60-2C7F, U+A720-A7FF",
+}
+
+def subset_inter(source_path):
+    """{subset: (WOFF2 bytes, unicode-range)} cut from a local Inter font (fontTools)."""
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+    from fontTools.varLib import instancer
+
+    fonts = {}
+    for name in INTER_SUBSETS:
+        font = TTFont(source_path)
+        if 'fvar' in font and any(axis.axisTag == 'opsz' for axis in font['fvar'].axes):
+            # Inter 4 adds an optical size axis; Google Fonts serves it pinned to the text size
+            font = instancer.instantiateVariableFont(font, {'opsz': 14})
+        options = subset.Options()
+        options.layout_features = ['*']
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes=subset.parse_unicodes(_INTER_RANGES[name].replace("U+", "").replace(" ", "")))
+        subsetter.subset(font)
+        fonts[name] = (_woff2(font), _INTER_RANGES[name])
+    return fonts
+
+
+def _font_css(inter_fonts, symbols_family):
+    rules = []
+    for subset, (_, unicode_range) in inter_fonts.items():
+        range_rule = f"\n    unicode-range: {unicode_range};" if unicode_range else ""
+        rules.append(f"""@font-face {{
+    font-family: 'Inter';
+    font-style: normal;
+    font-weight: {INTER_WEIGHTS[0]} {INTER_WEIGHTS[1]};
+    font-display: swap;
+    src: url('fonts/inter-{subset}.woff2') format('woff2');{range_rule}
+}}""")
+    rules.append(f"""@font-face {{
+    font-family: '{symbols_family}';
+    font-style: normal;
+    font-weight: {SYMBOLS_AXES['wght'][0]} {SYMBOLS_AXES['wght'][1]};
+    font-display: block;
+    src: url('fonts/material-symbols.woff2') format('woff2');
+}}""")
+    return ("/* Built by utils/font_utils.py; rebuild with `python -m utils.font_utils build`. */\n"
+            + "\n".join(rules) + "\n")
+
+def build_fonts(symbols_source=None, inter_source=None):
+    """
+    Writes the icon subset, Inter and styles/fonts.css. Fonts come from the given
+    local files or else from Google Fonts; if the download fails the icons are
+    cut from Streamlit's bundled font and Inter is skipped. Returns
+    {file name: size in bytes}.
+    """
+    icon_names = scan_icon_names()
+    symbols_family = SYMBOLS_FAMILY
+    if symbols_source:
+        symbols, subset_icons = subset_symbols(symbols_source, icon_names)
+    else:
+        try:
+            symbols, subset_icons = fetch_symbols_subset(icon_names)
+        except Exception as e:
+            if bundled_symbols_font() is None:
+                raise
+            print(f"Could not download Material Symbols ({e}); using the Rounded font bundled with Streamlit")
+            symbols, subset_icons = subset_symbols(bundled_symbols_font(), icon_names)
+            symbols_family = SYMBOLS_FALLBACK_FAMILY
+    if inter_source:
+        inter_fonts = subset_inter(inter_source)
+    else:
+        try:
+            inter_fonts = fetch_inter()
+        except Exception as e:
+            print(f"Could not download Inter ({e}); it will be loaded from Google Fonts at run time")
+            inter_fonts = {}
+
+    os.makedirs(FONTS_DIR, exist_ok=True)
+    for path in glob.glob(os.path.join(FONTS_DIR, "inter-*.woff2")):
+        os.remove(path)
+    files = {'material-symbols.woff2': symbols}
+    files.update({f"inter-{subset}.woff2": data for subset, (data, _) in inter_fonts.items()})
+    for name, data in files.items():
+        with open(os.path.join(FONTS_DIR, name), 'wb') as f:
+            f.write(data)
+    with open(ICONS_FILE, 'w') as f:
+        json.dump(subset_icons, f, indent=2)
+    # Written last: its presence switches the stylesheet over to the local fonts
+    with open(FONT_CSS_FILE, 'w', encoding='utf-8') as f:
+        f.write(_font_css(inter_fonts, symbols_family))
+    return {name: len(data) for name, data in files.items()}
+
+def local_fonts_available():
+    """Whether styles/fonts.css and every font file it references exist."""
+    if not os.path.exists(FONT_CSS_FILE):
+        return False
+    with open(FONT_CSS_FILE, 'r', encoding='utf-8') as f:
+        references = _URL_REFERENCE.findall(f.read())
+    return all(os.path.exists(os.path.join(STYLES_DIR, ref)) for ref in references)
+
+def get_font_css():
+    """
+    @font-face rules for the bundled fonts, preceded by Google Fonts @imports for
+    the families the build doesn't include (all of them if it isn't built).
+    """
+    css = ""
+    if local_fonts_available():
+        with open(FONT_CSS_FILE, 'r', encoding='utf-8') as f:
+            css = f.read()
+    missing = [family for family in REMOTE_FONT_IMPORTS if family not in _FONT_FAMILY.findall(css)]
+    if not missing:
+        return css
+    if os.environ.get(REMOTE_FONTS_ENV) == "0":
+        print(f"Warning: {', '.join(missing)} not bundled (python -m utils.font_utils build); using fallback fonts")
+        return css
+    # @import rules must come before every other rule in the stylesheet
+    return "\n".join(REMOTE_FONT_IMPORTS[family] for family in missing) + "\n" + css
+
+def missing_icons():
+    """Icons used in the sources but not in the built subset (all of them if it isn't built)."""
+    try:
+        with open(ICONS_FILE, 'r') as f:
+            built = set(json.load(f))
+    except (OSError, ValueError):
+        built = set()
+    return [name for name in scan_icon_names() if name not in built]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build EduScan's self-hosted fonts into styles/fonts/.")
+    parser.add_argument("command", choices=["build", "icons", "check"])
+    parser.add_argument("--symbols-source", help="Local Material Symbols Outlined font to subset instead of downloading")
+    parser.add_argument("--inter-source", help="Local Inter font to use instead of downloading")
+    args = parser.parse_args(argv)
+
+    if args.command == "icons":
+        print("\n".join(scan_icon_names()))
+        return 0
+    if args.command == "check":
+        missing = missing_icons()
+        if missing:
+            print(f"Icons missing from the font subset (run `python -m utils.font_utils build`): {', '.join(missing)}")
+            return 1
+        print("Font subset covers every icon in use.")
+        return 0
+
+    try:
+        sizes = build_fonts(args.symbols_source, args.inter_source)
+    except Exception as e:
+        print(f"Error building fonts: {e}")
+        return 1
+    missing = missing_icons()
+    print(f"Subset Material Symbols to {len(scan_icon_names()) - len(missing)} icons"
+          + (f" ({len(missing)} not found in the font)." if missing else "."))
+    for name, size in sizes.items():
+        print(f"  {name:<28} {size} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
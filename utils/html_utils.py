@@ -0,0 +1,258 @@
+# utils/html_utils.py
+"""
+Templated, memoized HTML fragments for the shared UI components.
+
+Templates are plain '{name}' placeholder strings. compile_template() splits
+each into its literal parts and field slots once, so a render only fills the
+slots and joins, and nothing is re-parsed on a rerun. Builders decorated with
+@html_fragment keep their output in a process-wide LRU keyed by the
+function, its arguments and the UI language, so a header or metric card with
+the same inputs is built once and reused by every session.
+
+Fragment builds are timed and their sizes counted per page. The pages send
+their own inline markup through page_markdown(), so those blocks are counted
+too, separately from the fragments:
+
+    get_html_stats()                       # {page: {'calls', 'hits', 'bytes', 'build_ms',
+                                           #         'markdown_calls', 'markdown_bytes', 'markdown_ms'}}
+    python -m utils.html_utils bench       # cached vs uncached build times
+"""
+import argparse
+import functools
+import os
+import string
+import threading
+import time
+
+import streamlit as st
+from cachetools import LRUCache
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+HTML_FRAGMENT_CACHE_SIZE = 2048
+# Larger fragments (e.g. inline data-URI images) are rebuilt rather than pinned in memory
+HTML_FRAGMENT_MAX_BYTES = 64 * 1024
+# Show the per-page HTML stats in the sidebar
+SHOW_HTML_STATS = os.environ.get('EDUSCAN_HTML_STATS', '').lower() in ('1', 'true', 'yes')
+
+TEMPLATES = {
+    'material_icon': '<span class="material-symbols-{style}">{icon_name}</span>',
+    'page_header': """
+    <div class="page-header section-animated-text">
+        <h1 class="page-title">{icon_html} {title}</h1>
+        <p class="page-subtitle">{subtitle}</p>
+        <div class="{status_class}">
+            <div class="status-dot {status_dot_class}"></div>
+            {status_text}
+        </div>
+    </div>
+    """,
+    'metric_card': """
+    <div class="metric-card">
+        <div class="metric-header">
+            <div class="metric-label">{label}</div>
+            <div class="metric-icon {icon_class}">{icon_html}</div>
+        </div>
+        <div class="metric-number">{number}</div>
+        <div class="{change_class}">{change_text}</div>
+    </div>
+    """,
+    'chart_container': """
+    <div class="chart-container">
+        <h3 class="chart-title">{title}</h3>
+        <p class="chart-subtitle">{subtitle}</p>
+        {content_html}
+    </div>
+    """,
+    'image_container': """
+    <div class="image-aspect-ratio-container {object_fit_class}" style="padding-bottom: {padding_bottom};">
+        {img_tag}
+    </div>
+    """,
+    'image_fallback': """
+        <div class="image-aspect-ratio-container animated-fallback" style="padding-bottom: {padding_bottom};">
+            <span class="material-symbols-outlined">{icon_name}</span>
+            <span>{alt_text}</span>
+        </div>
+        """,
+    'status_indicator': """
+        <div class="status-indicator">
+            <div style="display: flex; align-items: center;">
+                <div class="status-dot {status_dot_class}"></div>
+                <span style="font-size: 14px; font-weight: 500;">Status: {status_text}</span>
+            </div>
+        </div>
+        """,
+}
+
+_fragments = LRUCache(maxsize=HTML_FRAGMENT_CACHE_SIZE)
+_stats = {}
+_lock = threading.Lock()
+
+
+def compile_template(text):
+    """
+    Compiles a '{name}' template into a function taking the names as keyword
+    arguments. Format specs, conversions and positional fields are not supported.
+    """
+    parts, slots = [], []
+    for literal, field, spec, conversion in string.Formatter().parse(text):
+        if literal:
+            parts.append(literal)
+        if field is None:
+            continue
+        if not field.isidentifier() or spec or conversion:
+            raise ValueError(f"Unsupported template field {{{field}}}")
+        slots.append((len(parts), field))
+        parts.append('')
+    names = frozenset(field for _, field in slots)
+
+    def render(**values):
+        if values.keys() != names:
+            raise TypeError(f"Template expects {sorted(names)}, got {sorted(values)}")
+        filled = parts.copy()
+        for index, field in slots:
+            filled[index] = str(values[field])
+        return ''.join(filled)
+    return render
+
+@functools.lru_cache(maxsize=None)
+def get_template(name):
+    return compile_template(TEMPLATES[name])
+
+def render_template(name, **values):
+    """Fills a template from TEMPLATES (compiled on first use)."""
+    return get_template(name)(**values)
+
+
+def current_page():
+    """Script file name of the page being run, or '' outside a Streamlit run."""
+    try:
+        ctx = get_script_run_ctx(suppress_warning=True)
+        page = ctx.pages_manager.get_page_script(ctx.pages_manager.current_page_script_hash)
+        return os.path.basename(page['script_path']) if page else ''
+    except Exception:
+        return ''
+
+def _page_stats(page):
+    """The stats entry for page. Callers must hold the lock."""
+    return _stats.setdefault(page, {'calls': 0, 'hits': 0, 'bytes': 0, 'build_ms': 0.0,
+                                    'markdown_calls': 0, 'markdown_bytes': 0, 'markdown_ms': 0.0})
+
+def _record(hit, size, seconds):
+    page = current_page()
+    with _lock:
+        stats = _page_stats(page)
+        stats['calls'] += 1
+        stats['hits'] += hit
+        stats['bytes'] += size
+        stats['build_ms'] += seconds * 1000
+
+def _language():
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return 'English'
+    return st.session_state.get('app_language', 'English')
+
+def html_fragment(func):
+    """
+    Memoizes an HTML builder by (function, arguments, language). The language is
+    the 'language' argument if the builder takes one, else the session's.
+    Calls with unhashable arguments, and fragments over HTML_FRAGMENT_MAX_BYTES,
+    are built every time.
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            key = (name, kwargs.get('language') or _language(), args, tuple(sorted(kwargs.items())))
+            hash(key)
+        except TypeError:
+            key = None
+        with _lock:
+            html = _fragments.get(key) if key is not None else None
+        hit = html is not None
+        if not hit:
+            html = func(*args, **kwargs)
+            if key is not None and len(html) <= HTML_FRAGMENT_MAX_BYTES:
+                with _lock:
+                    _fragments[key] = html
+        _record(hit, len(html), time.perf_counter() - started)
+        return html
+
+    wrapper.uncached = func
+    return wrapper
+
+def page_markdown(body, **kwargs):
+    """
+    st.markdown() for the pages' own blocks, counted in get_html_stats() under
+    'markdown_calls', 'markdown_bytes' and 'markdown_ms' (time to send the block).
+    """
+    started = time.perf_counter()
+    result = st.markdown(body, **kwargs)
+    elapsed = time.perf_counter() - started
+    page = current_page()
+    with _lock:
+        stats = _page_stats(page)
+        stats['markdown_calls'] += 1
+        stats['markdown_bytes'] += len(str(body))
+        stats['markdown_ms'] += elapsed * 1000
+    return result
+
+def get_html_stats():
+    """Per-page totals since start-up (see the module docstring for the keys)."""
+    with _lock:
+        return {page: dict(stats) for page, stats in _stats.items()}
+
+def get_html_cache_info():
+    with _lock:
+        return {'entries': len(_fragments), 'maxsize': _fragments.maxsize}
+
+def clear_html_cache():
+    with _lock:
+        _fragments.clear()
+        _stats.clear()
+
+
+def benchmark_fragments(repeat=20000):
+    """Times each shared builder uncached and cached. Returns {name: (uncached_us, cached_us)}."""
+    from streamlit.logger import set_log_level
+    from utils import exact_ui
+    from utils.icon_utils import get_material_icon_html
+
+    set_log_level("error")  # session state is read outside `streamlit run` here
+
+    icon = get_material_icon_html('group')
+    cases = {
+        'create_exact_metric_card': (exact_ui.create_exact_metric_card,
+                                     ('Total Students', 42, "↑ 3 new this month", icon, 'total')),
+        'page header': (exact_ui._page_header_html,
+                        (icon, 'Educational Assessment Dashboard', 'Comprehensive Learning Analytics Platform',
+                         'English', False)),
+        'get_b64_image_html': (exact_ui.get_b64_image_html, ('academic_performance', "Academic Performance", "16/9")),
+    }
+    results = {}
+    for label, (builder, args) in cases.items():
+        timings = []
+        for func in (builder.uncached, builder):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                func(*args)
+            timings.append((time.perf_counter() - started) / repeat * 1e6)
+        results[label] = tuple(timings)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect EduScan's HTML fragment cache.")
+    parser.add_argument("command", choices=["bench"])
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args(argv)
+    print(f"{'fragment':<30} {'uncached':>10} {'cached':>10}")
+    for label, (uncached, cached) in benchmark_fragments(args.repeat).items():
+        print(f"{label:<30} {uncached:>8.2f}us {cached:>8.2f}us")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,7 +2,11 @@
 """
 Material Symbols icons for EduScan application.
 """
+from functools import lru_cache
 
+from utils.html_utils import render_template
+
+@lru_cache(maxsize=1024)
 def get_material_icon_html(icon_name, style="outlined"):
     """
     Returns HTML for a Material Symbol icon.
@@ -10,8 +14,8 @@ def get_material_icon_html(icon_name, style="outlined"):
     """
     if style == "filled":
         # Filled style uses a different class
-        return f'<span class="material-symbols-fill">{icon_name}</span>'
-    return f'<span class="material-symbols-{style}">{icon_name}</span>'
+        style = "fill"
+    return render_template('material_icon', style=style, icon_name=icon_name)
 
 # Dashboard Icons
 def get_dashboard_icon(): return get_material_icon_html("dashboard")
@@ -2,94 +2,121 @@
 """
 Base64 encoded essential images for reliable display.
 Removed most static images, keeping only background and AI result visuals.
+
+Images are encoded lazily: nothing is read until a key is looked up, and each
+file is encoded once per process and kept in a size-bounded LRU cache keyed by
+(path, mtime), so an edited picture is picked up on the next access.
 """
 import base64
+import mimetypes
 import os
+import threading
+from collections.abc import Mapping
 
-def get_base64_images():
-    """Get base64 encoded essential images (background and AI result visuals)."""
-    
-    def image_to_base64(filename):
-        image_path = os.path.join(os.path.dirname(__file__), '..', 'pictures', filename)
-        try:
-            if os.path.exists(image_path):
-                with open(image_path, 'rb') as img_file:
-                    return base64.b64encode(img_file.read()).decode('utf-8')
-            else:
-                print(f"Warning: Image not found at {image_path}. Skipping base64 encoding.")
-                return None
-        except Exception as e:
-            print(f"Error converting {image_path} to base64: {e}")
-            return None
-    
-    # --- Only load essential images ---
+from cachetools import LRUCache
+
+PICTURES_DIR = os.path.join(os.path.dirname(__file__), '..', 'pictures')
+# Upper bound on the encoded data URIs held in memory, in bytes
+BASE64_CACHE_MAX_BYTES = int(os.environ.get('EDUSCAN_BASE64_CACHE_BYTES', 16 * 1024 * 1024))
+
+# --- Only essential images are mapped ---
+IMAGE_FILES = {
     # 1. Main Background Image
-    image_83d859_b64 = image_to_base64('image_83d859.jpg')
+    'image_83d859': 'image_83d859.jpg',
 
-    # 2. AI Assessment Results Stage Images (as specifically requested to keep)
-    academic_performance_b64 = image_to_base64('academic_performance.png') # Often used as exam/chart visual
-    girl_reading_book_b64 = image_to_base64('girl reading book.jpg') # Can represent student writing/learning
-    smiling_girl_b64 = image_to_base64('smiling girl.jpeg') # Can represent student portrait
+    # 2. AI Assessment Results Stage Images
+    'academic_performance': 'academic_performance.png',
+    'exam_students': 'academic_performance.png', # Reusing as a general "exam" visual
+    'behavioral_social': 'academic_performance.png', # Reusing for consistency
+    'student_writing': 'girl reading book.jpg',
+    'student_portrait': 'smiling girl.jpeg',
 
     # 3. Specific request to keep 'somali-children-in-class.jpg' for recommendations section
-    somali_children_in_class_b64 = image_to_base64('somali-children-in-class.jpg')
-
-    return {
-        'image_83d859': f'data:image/jpeg;base64,{image_83d859_b64}' if image_83d859_b64 else '',
-        
-        # AI Assessment Results specific images
-        'academic_performance': f'data:image/png;base64,{academic_performance_b64}' if academic_performance_b64 else '',
-        'exam_students': f'data:image/png;base64,{academic_performance_b64}' if academic_performance_b64 else '', # Reusing as a general "exam" visual
-        'behavioral_social': f'data:image/png;base64,{academic_performance_b64}' if academic_performance_b64 else '', # Reusing for consistency
-        'student_writing': f'data:image/jpeg;base64,{girl_reading_book_b64}' if girl_reading_book_b64 else '',
-        'student_portrait': f'data:image/jpeg;base64,{smiling_girl_b64}' if smiling_girl_b64 else '',
-        'somali_children_in_class': f'data:image/jpeg;base64,{somali_children_in_class_b64}' if somali_children_in_class_b64 else '',
-
-        # Provide empty strings for keys that are no longer actively mapped to specific images,
-        # but might still be referenced in old page code for safety during refactor.
-        # This prevents KeyError but will show the 'Not Found' fallback.
-        'abc_kids': '', 'girls_in_class': '', 'girls_in_white_hijab': '', 'girls_in_orange_hijab': '',
-        'kindergarten': '', 'small_kids_and_teacher': '', 'three_somali_girls': '',
-        'student_information_2': '', # Was a placeholder header image
-        'daily_tracking': '', 'parent_empowerment': '', 'school_partnership': '',
-        'educational_excellence_1': '', 'global_practices': '', 'learning_science': '', 'intervention_studies': '', 'cultural_adaptation': '',
-        'teacher_with_students': '', 'happy_young_students': '', 'classroom_girls': '', 'boys_in_classroom': '',
-        'engaging_strategies': '', 'assessment_innovation': '',
-    }
-
-def get_b64_image_html(base64_data, alt_text, aspect_ratio="16/9", cover_mode=False):
+    'somali_children_in_class': 'somali-children-in-class.jpg',
+}
+
+# Keys that are no longer mapped to specific images but might still be referenced
+# in old page code. They resolve to '' (the 'Not Found' fallback) instead of KeyError.
+RETIRED_IMAGE_KEYS = [
+    'abc_kids', 'girls_in_class', 'girls_in_white_hijab', 'girls_in_orange_hijab',
+    'kindergarten', 'small_kids_and_teacher', 'three_somali_girls',
+    'student_information_2', # Was a placeholder header image
+    'daily_tracking', 'parent_empowerment', 'school_partnership',
+    'educational_excellence_1', 'global_practices', 'learning_science', 'intervention_studies', 'cultural_adaptation',
+    'teacher_with_students', 'happy_young_students', 'classroom_girls', 'boys_in_classroom',
+    'engaging_strategies', 'assessment_innovation',
+]
+
+# (path, mtime) -> data URI; sized by string length so the bound is roughly bytes
+_encoded = LRUCache(maxsize=BASE64_CACHE_MAX_BYTES, getsizeof=len)
+_encoded_lock = threading.Lock()
+
+def _encode_file(path):
+    mime_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    with open(path, 'rb') as img_file:
+        return f"data:{mime_type};base64,{base64.b64encode(img_file.read()).decode('utf-8')}"
+
+def is_image_key(value):
+    """True for keys of the registry (mapped or retired), as opposed to data URIs."""
+    return value in IMAGE_FILES or value in RETIRED_IMAGE_KEYS
+
+def get_image_path(key):
+    """Path of the picture behind an image key, or None for unknown and retired keys."""
+    filename = IMAGE_FILES.get(key)
+    return os.path.join(PICTURES_DIR, filename) if filename else None
+
+def get_base64_image(key):
     """
-    Generates HTML for a base64 image, wrapped in an aspect-ratio-controlled container.
-    
-    Args:
-        base64_data (str): The base64 encoded image string (e.g., "data:image/jpeg;base64,...").
-        alt_text (str): Alt text for the image.
-        aspect_ratio (str): Aspect ratio as "width/height" (e.g., "16/9", "4/3", "1/1").
-        cover_mode (bool): If True, object-fit is 'cover'. If False, 'contain'.
-    Returns:
-        str: HTML string for the image container.
+    Returns the data URI for one image key, encoding the file on first access.
+    Unknown, retired or missing images return ''.
     """
-    object_fit_class = "object-fit-cover-mode" if cover_mode else ""
-    
-    padding_bottom_percentage = "56.25%" # Default to 16:9
-    if aspect_ratio == "4/3": padding_bottom_percentage = "75%"
-    elif aspect_ratio == "1/1": padding_bottom_percentage = "100%"
-    else:
+    image_path = get_image_path(key)
+    if image_path is None:
+        return ''
+    try:
+        cache_key = (os.path.abspath(image_path), os.path.getmtime(image_path))
+    except OSError:
+        print(f"Warning: Image not found at {image_path}. Skipping base64 encoding.")
+        return ''
+
+    with _encoded_lock:
+        data_uri = _encoded.get(cache_key)
+    if data_uri is not None:
+        return data_uri
+    try:
+        data_uri = _encode_file(cache_key[0])
+    except Exception as e:
+        print(f"Error converting {image_path} to base64: {e}")
+        return ''
+    with _encoded_lock:
         try:
-            w, h = map(int, aspect_ratio.split('/'))
-            padding_bottom_percentage = f"{(h/w * 100):.2f}%"
-        except ValueError: pass
-
-    if not base64_data:
-        # Fallback div if image not found (now with transparent background by default)
-        return f"""
-        <div class="image-aspect-ratio-container" style="padding-bottom: {padding_bottom_percentage}; background: transparent;">
-            <span style="color: var(--gray-500); text-align:center; font-size:0.8em; padding:10px;">Image:<br>{alt_text}<br>(Not Found)</span>
-        </div>
-        """
-    
-    return f"""
-    <div class="image-aspect-ratio-container {object_fit_class}" style="padding-bottom: {padding_bottom_percentage};">
-        <img src="{base64_data}" alt="{alt_text}">
-    </div>
-    """
\ No newline at end of file
+            _encoded[cache_key] = data_uri
+        except ValueError:
+            pass  # larger than the whole cache; hand it out uncached
+    return data_uri
+
+class LazyImageRegistry(Mapping):
+    """Read-only mapping of image keys to data URIs; values are encoded when looked up."""
+
+    def __getitem__(self, key):
+        if key not in IMAGE_FILES and key not in RETIRED_IMAGE_KEYS:
+            raise KeyError(key)
+        return get_base64_image(key)
+
+    def __iter__(self):
+        yield from IMAGE_FILES
+        yield from RETIRED_IMAGE_KEYS
+
+    def __len__(self):
+        return len(IMAGE_FILES) + len(RETIRED_IMAGE_KEYS)
+
+_registry = LazyImageRegistry()
+
+def get_base64_images():
+    """Get the essential images (background and AI result visuals) as a lazy key -> data URI mapping."""
+    return _registry
+
+def get_base64_cache_info():
+    """Entries and bytes currently held by the encoded-image cache."""
+    with _encoded_lock:
+        return {'entries': len(_encoded), 'bytes': _encoded.currsize, 'max_bytes': _encoded.maxsize}
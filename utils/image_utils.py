@@ -1,9 +1,30 @@
 import streamlit as st
+import argparse
 import base64
+import hashlib
+import html
 import os
+import threading
+from functools import lru_cache
 from PIL import Image
 import io
 
+from utils.asset_utils import STATIC_DIR, static_base_url, static_serving_enabled
+
+# Resized variants written to static/img/ (served at /app/static/img/) by content hash
+DERIVATIVES_DIR = os.path.join(STATIC_DIR, "img")
+DERIVATIVE_WIDTHS = (320, 640, 960)
+# (extension, Pillow format, save options), best-compressed first for <source> order
+DERIVATIVE_FORMATS = (
+    ('webp', 'WEBP', {'quality': 75, 'method': 6}),
+    ('jpg', 'JPEG', {'quality': 78, 'optimize': True, 'progressive': True}),
+)
+# Width embedded inline when static serving is off and srcset URLs aren't available
+INLINE_FALLBACK_WIDTH = 640
+DEFAULT_SIZES = "(max-width: 640px) 100vw, 350px"
+
+_derivatives_lock = threading.Lock()
+
 def load_image_as_base64(image_path):
     """Load an image file and convert it to base64 string"""
     try:
@@ -15,8 +36,117 @@ def load_image_as_base64(image_path):
         st.error(f"Error loading image: {str(e)}")
         return None
 
+@lru_cache(maxsize=256)
+def _content_hash(path, mtime):
+    """Hash of the source bytes; memoized per (path, mtime) so files are hashed once."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+def _derivative_path(digest, width, ext):
+    return os.path.join(DERIVATIVES_DIR, f"{digest}-{width}.{ext}")
+
+def build_image_derivatives(image_path, widths=DERIVATIVE_WIDTHS):
+    """
+    Writes resized WebP and JPEG variants of an image to static/img/, named by
+    the hash of the original, and skips variants that already exist. Widths wider
+    than the original are replaced by the original width (never upscaled).
+
+    Returns {'hash', 'width', 'height', 'variants': {ext: [(width, path), ...]}},
+    or None if the image can't be read.
+    """
+    path = os.path.abspath(image_path)
+    try:
+        digest = _content_hash(path, os.path.getmtime(path))
+    except OSError:
+        return None
+
+    with _derivatives_lock:
+        try:
+            with Image.open(path) as original:
+                original_width, original_height = original.size
+                target_widths = sorted({min(w, original_width) for w in widths})
+                expected = [(w, ext) for w in target_widths for ext, _, _ in DERIVATIVE_FORMATS]
+                if any(not os.path.exists(_derivative_path(digest, w, ext)) for w, ext in expected):
+                    os.makedirs(DERIVATIVES_DIR, exist_ok=True)
+                    original.load()
+                    for w in target_widths:
+                        h = max(1, round(original_height * w / original_width))
+                        resized = original if w == original_width else original.resize((w, h), Image.LANCZOS)
+                        for ext, image_format, options in DERIVATIVE_FORMATS:
+                            out_path = _derivative_path(digest, w, ext)
+                            if os.path.exists(out_path):
+                                continue
+                            frame = resized
+                            if image_format == 'JPEG' and frame.mode != 'RGB':
+                                # JPEG has no alpha: flatten onto white
+                                background = Image.new('RGB', frame.size, (255, 255, 255))
+                                rgba = frame.convert('RGBA')
+                                background.paste(rgba, mask=rgba.split()[-1])
+                                frame = background
+                            elif image_format == 'WEBP' and frame.mode not in ('RGB', 'RGBA'):
+                                frame = frame.convert('RGBA')
+                            tmp_path = f"{out_path}.{os.getpid()}.tmp"
+                            frame.save(tmp_path, image_format, **options)
+                            os.replace(tmp_path, out_path)
+        except Exception as e:
+            print(f"Error building derivatives for {image_path}: {e}")
+            return None
+
+    return {
+        'hash': digest,
+        'width': original_width,
+        'height': original_height,
+        'variants': {ext: [(w, _derivative_path(digest, w, ext)) for w in target_widths]
+                     for ext, _, _ in DERIVATIVE_FORMATS},
+    }
+
+def _derivative_url(path):
+    return f"{static_base_url()}img/{os.path.basename(path)}"
+
+def get_responsive_img_tag(image_path, alt_text, sizes=DEFAULT_SIZES, style="", css_class=""):
+    """
+    <picture> markup for an image: WebP and JPEG srcsets at DERIVATIVE_WIDTHS,
+    lazy-loaded, with intrinsic width/height to avoid layout shift. Without
+    static serving, a single INLINE_FALLBACK_WIDTH JPEG is embedded instead of
+    the original. Returns None if the image can't be read.
+    """
+    derivatives = build_image_derivatives(image_path)
+    if derivatives is None:
+        return None
+    alt = html.escape(alt_text, quote=True)
+    attrs = f'alt="{alt}" width="{derivatives["width"]}" height="{derivatives["height"]}" loading="lazy" decoding="async"'
+    if style:
+        attrs += f' style="{style}"'
+    if css_class:
+        attrs += f' class="{css_class}"'
+
+    if not static_serving_enabled():
+        jpegs = derivatives['variants']['jpg']
+        width, path = min(jpegs, key=lambda variant: abs(variant[0] - INLINE_FALLBACK_WIDTH))
+        with open(path, 'rb') as f:
+            return f'<img src="data:image/jpeg;base64,{base64.b64encode(f.read()).decode()}" {attrs}>'
+
+    def srcset(ext):
+        return ", ".join(f"{_derivative_url(path)} {w}w" for w, path in derivatives['variants'][ext])
+
+    fallback_src = _derivative_url(derivatives['variants']['jpg'][-1][1])
+    return (
+        f'<picture>'
+        f'<source type="image/webp" srcset="{srcset("webp")}" sizes="{sizes}">'
+        f'<img src="{fallback_src}" srcset="{srcset("jpg")}" sizes="{sizes}" {attrs}>'
+        f'</picture>'
+    )
+
 def get_image_html(image_path, alt_text="Student Image", width="100%", height="auto", border_radius="15px"):
-    """Generate HTML for displaying an image with styling"""
+    """Generate HTML for displaying an image with styling (resized, lazy-loaded variants)"""
+    img_tag = get_responsive_img_tag(
+        image_path, alt_text,
+        style=f"width: {width}; height: {height}; border-radius: {border_radius}; "
+              "box-shadow: 0 8px 25px rgba(0,0,0,0.2); margin: 1rem 0; object-fit: cover; "
+              "transition: transform 0.3s ease;"
+    )
+    if img_tag:
+        return img_tag
     base64_image = load_image_as_base64(image_path)
     if base64_image:
         return f"""
@@ -54,8 +184,20 @@ def create_image_gallery(image_paths, alt_texts, columns=3):
     
     for i, (image_path, alt_text) in enumerate(zip(image_paths, alt_texts)):
         with cols[i % columns]:
-            base64_image = load_image_as_base64(image_path)
-            if base64_image:
+            img_tag = get_responsive_img_tag(
+                image_path, alt_text, sizes=f"(max-width: 640px) 100vw, {100 // columns}vw",
+                style="width: 100%; height: 200px; border-radius: 15px; "
+                      "box-shadow: 0 8px 25px rgba(0,0,0,0.2); object-fit: cover;"
+            )
+            base64_image = None if img_tag else load_image_as_base64(image_path)
+            if img_tag:
+                st.markdown(f"""
+                <div style="text-align: center; margin: 1rem 0;">
+                    {img_tag}
+                    <p style="margin-top: 0.5rem; font-weight: 500; color: #2c3e50;">{alt_text}</p>
+                </div>
+                """, unsafe_allow_html=True)
+            elif base64_image:
                 st.markdown(f"""
                 <div style="text-align: center; margin: 1rem 0;">
                     <img src="data:image/jpeg;base64,{base64_image}" 
@@ -102,4 +244,32 @@ def get_student_images():
         'focused_student': 'data/Ez0BdyeWUAQeFjt_1751918889659.jpg', 
         'happy_students': 'data/IMG_340E6A-360708-5A7F82-28A32F-B00A0B-5C1E93_1751918889660.jpg',
         'student_portrait': 'data/thumbnail_1751918889660.jpg'
-    }
\ No newline at end of file
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build resized image variants into static/img/.")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--pictures", default=os.path.join(os.path.dirname(STATIC_DIR), "pictures"))
+    args = parser.parse_args(argv)
+
+    total_original = total_largest = 0
+    for filename in sorted(os.listdir(args.pictures)):
+        path = os.path.join(args.pictures, filename)
+        derivatives = build_image_derivatives(path)
+        if derivatives is None:
+            continue
+        original = os.path.getsize(path)
+        sizes = {ext: [os.path.getsize(p) for _, p in variants] for ext, variants in derivatives['variants'].items()}
+        total_original += original
+        total_largest += sizes['webp'][-1]
+        print(f"  {filename:<40} {original:>9} B -> webp {'/'.join(str(s) for s in sizes['webp'])} B, "
+              f"jpg {'/'.join(str(s) for s in sizes['jpg'])} B")
+    if total_original:
+        print(f"  originals {total_original} B, largest WebP variants {total_largest} B "
+              f"({total_original / max(total_largest, 1):.1f}x smaller)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,30 +1,14 @@
 import streamlit as st
-import json
-import os
+
+from utils.repository import get_repository
 
 def load_app_settings():
-    """Load application settings from file"""
-    settings_file = "data/app_settings.json"
-    if os.path.exists(settings_file):
-        try:
-            with open(settings_file, 'r') as f:
-                return json.load(f)
-        except:
-            pass
-    return {'language': 'English', 'theme': 'Modern', 'offline_mode': False}
+    """Load application settings from the configured storage backend"""
+    return get_repository().load_app_settings()
 
 def save_app_settings(settings):
-    """Save application settings to file"""
-    settings_file = "data/app_settings.json"
-    try:
-        # Ensure data directory exists
-        os.makedirs(os.path.dirname(settings_file), exist_ok=True)
-        with open(settings_file, 'w') as f:
-            json.dump(settings, f, indent=2)
-        return True
-    except Exception as e:
-        print(f"Error saving settings: {e}")
-        return False
+    """Save application settings to the configured storage backend"""
+    return get_repository().save_app_settings(settings)
 
 def get_text(key, language=None):
     """Get localized text based on language setting"""
@@ -0,0 +1,304 @@
+# utils/lottie_optimizer.py
+"""
+Shrinks Lottie animations before they are sent to the browser.
+
+optimize_lottie() returns a smaller copy of an animation:
+  - metadata the player ignores is dropped ('meta', match names, property
+    indexes, and layer/shape names when no expression could refer to them),
+    as are markers, which are only read through player API calls that
+    streamlit-lottie doesn't expose;
+  - properties left at the player's defaults are dropped (hd=false, bm=0,
+    ddd=0, ao=0, sr=1);
+  - hidden layers and shapes, and layers that are never on screen, are removed
+    unless another layer uses them as a parent or track matte;
+  - floats are rounded to a configurable number of decimals, and keyframe
+    easing handles to EASING_PRECISION; per-dimension handles that are all
+    equal become one value (the player applies it to every dimension), and
+    hold keyframes lose the handles the player never reads;
+  - identical precomps are merged and unreferenced assets removed (Lottie can
+    only share content between layers through precomp assets).
+The result's meta.g (Lottie's "generator" field) records the optimizer and
+precision, so is_optimized() can skip files that were already processed.
+
+check_visual_regression() samples frames and compares every visible layer's
+evaluated property values between two versions, so an optimization that
+moves, recolours or hides something is caught.
+
+    python -m utils.lottie_optimizer assets/teacher.json --precision 2
+"""
+import argparse
+import copy
+import json
+import os
+
+DEFAULT_PRECISION = int(os.environ.get('EDUSCAN_LOTTIE_PRECISION', 3))
+# Easing handles are 0-1 timing-curve controls; beyond 2 decimals no frame changes visibly
+EASING_PRECISION = 2
+
+# Keys the player never reads (without expressions)
+_METADATA_KEYS = ('mn', 'ix', 'cix', 'np', 'cl', 'ln')
+# key -> value the player assumes when the key is missing
+_DEFAULTS = {'hd': False, 'bm': 0, 'ddd': 0, 'ao': 0, 'sr': 1}
+
+
+def _has_expressions(node):
+    """Expressions are strings under 'x'; they can look layers up by name."""
+    if isinstance(node, dict):
+        return any((key == 'x' and isinstance(value, str)) or _has_expressions(value)
+                   for key, value in node.items())
+    if isinstance(node, list):
+        return any(_has_expressions(item) for item in node)
+    return False
+
+def _round_floats(node, precision):
+    if isinstance(node, float):
+        value = round(node, precision)
+        return int(value) if value.is_integer() else value
+    if isinstance(node, dict):
+        return {key: _round_floats(value, precision) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_round_floats(item, precision) for item in node]
+    return node
+
+def _easing_value(value, precision):
+    if isinstance(value, list):
+        value = [round(v, precision) for v in value]
+        if value and all(v == value[0] for v in value):
+            value = value[0]
+    elif isinstance(value, float):
+        value = round(value, precision)
+    return int(value) if isinstance(value, float) and value.is_integer() else value
+
+def _compact_easing(node, precision):
+    if isinstance(node, dict):
+        if 't' in node and ('i' in node or 'o' in node):
+            if node.get('h') == 1:
+                node.pop('i', None)
+                node.pop('o', None)
+            for key in ('i', 'o'):
+                if isinstance(node.get(key), dict):
+                    node[key] = {axis: _easing_value(value, precision) for axis, value in node[key].items()}
+        for value in node.values():
+            _compact_easing(value, precision)
+    elif isinstance(node, list):
+        for item in node:
+            _compact_easing(item, precision)
+
+def _strip_metadata(node, keep_names):
+    if isinstance(node, dict):
+        for key in _METADATA_KEYS + (() if keep_names else ('nm',)):
+            node.pop(key, None)
+        for key, default in _DEFAULTS.items():
+            if key in node and node[key] == default and type(node[key]) is type(default):
+                del node[key]
+        for value in node.values():
+            _strip_metadata(value, keep_names)
+    elif isinstance(node, list):
+        for item in node:
+            _strip_metadata(item, keep_names)
+
+def _strip_hidden_shapes(shapes):
+    kept = []
+    for shape in shapes:
+        if shape.get('hd') is True:
+            continue
+        if shape.get('ty') == 'gr' and 'it' in shape:
+            shape['it'] = _strip_hidden_shapes(shape['it'])
+        kept.append(shape)
+    return kept
+
+def _prune_layers(layers, comp_ip, comp_op):
+    """Drops hidden or never-visible layers that nothing depends on. Returns the removed count."""
+    parents = {layer.get('parent') for layer in layers if 'parent' in layer}
+    kept, removed = [], 0
+    for position, layer in enumerate(layers):
+        never_visible = layer.get('op', comp_op) <= comp_ip or layer.get('ip', comp_ip) >= comp_op
+        is_matte = layer.get('td') or (position + 1 < len(layers) and layers[position + 1].get('tt'))
+        if (layer.get('hd') is True or never_visible) and layer.get('ind') not in parents and not is_matte:
+            removed += 1
+            continue
+        if 'shapes' in layer:
+            layer['shapes'] = _strip_hidden_shapes(layer['shapes'])
+        kept.append(layer)
+    layers[:] = kept
+    return removed
+
+def _dedupe_assets(animation):
+    """Points layers at one copy of identical precomps and drops unreferenced assets."""
+    assets = animation.get('assets', [])
+    canonical, alias = {}, {}
+    for asset in assets:
+        if 'layers' not in asset:
+            continue
+        signature = json.dumps(asset['layers'], sort_keys=True)
+        alias[asset['id']] = canonical.setdefault(signature, asset['id'])
+
+    def retarget(layers):
+        for layer in layers:
+            if layer.get('refId') in alias:
+                layer['refId'] = alias[layer['refId']]
+
+    retarget(animation.get('layers', []))
+    for asset in assets:
+        retarget(asset.get('layers', []))
+
+    referenced = set()
+    def collect(layers):
+        for layer in layers:
+            if 'refId' in layer:
+                referenced.add(layer['refId'])
+    collect(animation.get('layers', []))
+    for asset in assets:
+        collect(asset.get('layers', []))
+    animation['assets'] = [asset for asset in assets if asset.get('id') in referenced]
+    return len(assets) - len(animation['assets'])
+
+def optimize_lottie(animation, precision=DEFAULT_PRECISION):
+    """Returns an optimized deep copy of a Lottie animation (the input is not modified)."""
+    optimized = copy.deepcopy(animation)
+    keep_names = _has_expressions(optimized)
+    optimized.pop('meta', None)
+    optimized.pop('markers', None)
+
+    comp_ip, comp_op = optimized.get('ip', 0), optimized.get('op', float('inf'))
+    _prune_layers(optimized.get('layers', []), comp_ip, comp_op)
+    for asset in optimized.get('assets', []):
+        if 'layers' in asset:
+            # Precomp layers use their own timeline; only hidden layers are pruned there
+            _prune_layers(asset['layers'], float('-inf'), float('inf'))
+    _dedupe_assets(optimized)
+    _strip_metadata(optimized, keep_names)
+    optimized = _round_floats(optimized, precision)
+    _compact_easing(optimized, min(precision, EASING_PRECISION))
+    optimized['meta'] = {'g': _generator(precision)}
+    return optimized
+
+def _generator(precision):
+    return f"utils.lottie_optimizer 2 p{precision}"
+
+def is_optimized(animation, precision=DEFAULT_PRECISION):
+    """Whether optimize_lottie() already produced this animation at this precision."""
+    return (animation.get('meta') or {}).get('g') == _generator(precision)
+
+
+def _numbers(value):
+    if isinstance(value, bool):
+        return []
+    if isinstance(value, (int, float)):
+        return [float(value)]
+    if isinstance(value, dict):
+        return [n for key in sorted(value) for n in _numbers(value[key])]
+    if isinstance(value, list):
+        return [n for item in value for n in _numbers(item)]
+    return []
+
+def _property_at(prop, frame):
+    """Value of an animatable property at a frame (linear between keyframes)."""
+    keyframes = prop.get('k')
+    if not (isinstance(keyframes, list) and keyframes and isinstance(keyframes[0], dict) and 't' in keyframes[0]):
+        return _numbers(keyframes)
+    previous = keyframes[0]
+    for keyframe in keyframes[1:]:
+        if keyframe['t'] > frame:
+            start = _numbers(previous.get('s', []))
+            end = _numbers(previous['e']) if 'e' in previous else _numbers(keyframe.get('s', []))
+            if previous.get('h') or len(start) != len(end) or keyframe['t'] == previous['t']:
+                return start
+            progress = max(0.0, (frame - previous['t']) / (keyframe['t'] - previous['t']))
+            return [a + (b - a) * progress for a, b in zip(start, end)]
+        previous = keyframe
+    return _numbers(previous.get('s', previous.get('e', [])))
+
+def _evaluate(node, frame, out):
+    """Collects every animatable property's value in document order."""
+    if isinstance(node, dict):
+        if 'k' in node and 'a' in node:
+            out.append(_property_at(node, frame))
+            return
+        for key in sorted(node):
+            if key not in ('nm', 'mn', 'ix', 'cix', 'np', 'cl', 'ln', 'refId', 'ind', 'parent', 'hd'):
+                _evaluate(node[key], frame, out)
+    elif isinstance(node, list):
+        for item in node:
+            _evaluate(item, frame, out)
+
+def _scene(animation, layers, frame, depth=0):
+    """[(layer signature, property values)] for the layers visible at a frame, precomps expanded."""
+    assets = {asset.get('id'): asset for asset in animation.get('assets', [])}
+    scene = []
+    for layer in layers:
+        if layer.get('hd') is True or not (layer.get('ip', frame) <= frame < layer.get('op', frame + 1)):
+            continue
+        shapes = _strip_hidden_shapes(copy.deepcopy(layer.get('shapes', [])))
+        values = []
+        _evaluate({'ks': layer.get('ks', {}), 'shapes': shapes, 'ef': layer.get('ef', [])}, frame, values)
+        scene.append((layer.get('ty'), values))
+        if layer.get('refId') in assets and 'layers' in assets[layer['refId']] and depth < 8:
+            local_frame = (frame - layer.get('st', 0)) / (layer.get('sr', 1) or 1)
+            scene.extend(_scene(animation, assets[layer['refId']]['layers'], local_frame, depth + 1))
+    return scene
+
+def check_visual_regression(original, optimized, frames=5, tolerance=None):
+    """
+    Compares two versions of an animation at `frames` evenly spaced frames.
+
+    At each frame the visible layers must match one to one, and every evaluated
+    property value may differ by at most `tolerance` (default: a little more
+    than the rounding error of DEFAULT_PRECISION, scaled by the value).
+    Returns {'passed', 'max_difference', 'frames': [(frame, max_difference, ok)]}.
+    """
+    tolerance = tolerance if tolerance is not None else 10 ** -DEFAULT_PRECISION
+    ip, op = original.get('ip', 0), original.get('op', 1)
+    sample_frames = [ip + (op - ip) * n / max(frames - 1, 1) * 0.999 for n in range(frames)]
+    report, worst, passed = [], 0.0, True
+    for frame in sample_frames:
+        before = _scene(original, original.get('layers', []), frame)
+        after = _scene(optimized, optimized.get('layers', []), frame)
+        ok = [(kind, [len(v) for v in values]) for kind, values in before] == \
+             [(kind, [len(v) for v in values]) for kind, values in after]
+        difference = 0.0
+        if ok:
+            for (_, values_before), (_, values_after) in zip(before, after):
+                for a_values, b_values in zip(values_before, values_after):
+                    for a, b in zip(a_values, b_values):
+                        difference = max(difference, abs(a - b) / max(1.0, abs(a)))
+            ok = difference <= tolerance
+        worst = max(worst, difference)
+        passed = passed and ok
+        report.append((round(frame, 2), difference, ok))
+    return {'passed': passed, 'max_difference': worst, 'frames': report}
+
+def payload_size(animation):
+    """Bytes of the JSON Streamlit sends for an animation."""
+    return len(json.dumps(animation).encode('utf-8'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Optimize Lottie animations and check them for visual changes.")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--precision", type=int, default=DEFAULT_PRECISION)
+    parser.add_argument("--frames", type=int, default=5, help="Frames compared by the regression check")
+    parser.add_argument("--write", action="store_true", help="Overwrite the files with the optimized version")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for path in args.files:
+        with open(path, 'r', encoding='utf-8') as f:
+            original = json.load(f)
+        optimized = optimize_lottie(original, args.precision)
+        check = check_visual_regression(original, optimized, args.frames, tolerance=10 ** -args.precision)
+        before, after = payload_size(original), payload_size(optimized)
+        print(f"{path}: {before} -> {after} bytes ({100 * (1 - after / before):.1f}% smaller), "
+              f"regression check {'PASS' if check['passed'] else 'FAIL'} "
+              f"(max relative difference {check['max_difference']:.2g})")
+        for frame, difference, ok in check['frames']:
+            print(f"  frame {frame:>8}: {'ok' if ok else 'CHANGED'} ({difference:.2g})")
+        failures += not check['passed']
+        if args.write and check['passed']:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(optimized, f, separators=(',', ':'))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
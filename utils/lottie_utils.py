@@ -0,0 +1,326 @@
+# utils/lottie_utils.py
+"""
+Lottie animations without blocking page renders on the network.
+
+get_lottie(source) resolves an animation in this order and never waits for a
+download:
+  1. the local bundle: a name like "teacher" (assets/teacher.json), or a URL
+     listed in assets/lottie_index.json;
+  2. the disk cache of earlier downloads (data/lottie_cache/);
+  3. otherwise it returns None and queues a background download, so the
+     animation appears on a later rerun.
+
+Downloads run in parallel on a small thread pool. Cached files are revalidated
+in the background with If-None-Match/If-Modified-Since once they are older
+than LOTTIE_REVALIDATE_SECONDS. URLs that fail are not retried until
+LOTTIE_RETRY_FAILED_SECONDS have passed. In offline mode nothing is fetched.
+
+Animations are run through utils.lottie_optimizer before they are stored:
+downloads when they are written to the cache, and bundled files when fetch or
+bundle adds them (the committed ones were optimized with
+`python -m utils.lottie_optimizer --write`). A file that isn't marked as
+optimized yet, such as a cache entry from an older version, is optimized when
+it is first loaded and, if it's in the cache, rewritten.
+
+The pages' lottie.host URLs are found by scanning the sources. Each one is
+either listed in assets/lottie_index.json or fetched in the background on
+first use.
+
+    python -m utils.lottie_utils fetch    # download every unbundled page URL into assets/lottie/
+    python -m utils.lottie_utils bundle   # copy cached downloads into the bundle
+    python -m utils.lottie_utils check    # list page URLs that aren't bundled
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+from cachetools import LRUCache
+
+try:
+    from streamlit_lottie import st_lottie
+    import requests
+    LOTTIE_AVAILABLE = True
+except ImportError:
+    LOTTIE_AVAILABLE = False
+
+from utils.lottie_optimizer import DEFAULT_PRECISION, is_optimized, optimize_lottie
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOTTIE_BUNDLE_DIR = os.path.join(ROOT_DIR, "assets")
+LOTTIE_INDEX_FILE = os.path.join(LOTTIE_BUNDLE_DIR, "lottie_index.json")
+# Python sources scanned for animation URLs
+SOURCE_GLOBS = ("app.py", "pages/*.py", "utils/*.py")
+LOTTIE_CACHE_DIR = os.environ.get('EDUSCAN_LOTTIE_CACHE', os.path.join(ROOT_DIR, "data", "lottie_cache"))
+LOTTIE_FETCH_TIMEOUT = 10
+LOTTIE_FETCH_WORKERS = 4
+LOTTIE_REVALIDATE_SECONDS = 7 * 24 * 60 * 60
+LOTTIE_RETRY_FAILED_SECONDS = 24 * 60 * 60
+LOTTIE_PRECISION = DEFAULT_PRECISION
+
+_executor = ThreadPoolExecutor(max_workers=LOTTIE_FETCH_WORKERS, thread_name_prefix="eduscan-lottie")
+_inflight = set()
+_lock = threading.Lock()
+# (path, mtime) -> optimized animation, shared read-only between sessions
+_parsed = LRUCache(maxsize=64)
+_LOTTIE_URL = re.compile(r"https://lottie\.host/[\w./-]+\.json")
+
+
+def _cache_paths(url):
+    stem = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(LOTTIE_CACHE_DIR, f"{stem}.json"), os.path.join(LOTTIE_CACHE_DIR, f"{stem}.meta.json")
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def _optimized(animation):
+    """The animation run through the optimizer, unless it already was."""
+    if is_optimized(animation, LOTTIE_PRECISION):
+        return animation
+    try:
+        return optimize_lottie(animation, LOTTIE_PRECISION)
+    except Exception as e:
+        print(f"Error optimizing Lottie animation: {e}")
+        return animation
+
+def _load_animation(path):
+    """Parses an animation file once per (path, mtime), with its background removed."""
+    try:
+        cache_key = (path, os.path.getmtime(path))
+    except OSError:
+        return None
+    with _lock:
+        animation = _parsed.get(cache_key)
+    if animation is None:
+        animation = _read_json(path)
+        if not isinstance(animation, dict):
+            return None
+        if not is_optimized(animation, LOTTIE_PRECISION):
+            animation = _optimized(animation)
+            if os.path.abspath(os.path.dirname(path)) == os.path.abspath(LOTTIE_CACHE_DIR) and is_optimized(animation, LOTTIE_PRECISION):
+                _write_json(path, animation)  # cached before downloads were optimized
+        animation['bg'] = None  # render on the page background
+        with _lock:
+            _parsed[cache_key] = animation
+    return animation
+
+def _bundle_index():
+    return _read_json(LOTTIE_INDEX_FILE) or {}
+
+def _save_bundle_index(index):
+    with open(LOTTIE_INDEX_FILE, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(index.items())), f, indent=2)
+        f.write("\n")
+
+def scan_lottie_urls(root=ROOT_DIR):
+    """Sorted animation URLs that appear in the app's sources."""
+    urls = set()
+    for pattern in SOURCE_GLOBS:
+        for path in glob.glob(os.path.join(root, pattern)):
+            with open(path, 'r', encoding='utf-8') as f:
+                urls.update(_LOTTIE_URL.findall(f.read()))
+    return sorted(urls)
+
+def _bundled_path(source):
+    if "://" not in source:
+        return os.path.join(LOTTIE_BUNDLE_DIR, f"{source}.json")
+    filename = _bundle_index().get(source)
+    return os.path.join(LOTTIE_BUNDLE_DIR, filename) if filename else None
+
+def _fetch(url):
+    """Downloads or revalidates one URL into the disk cache (runs on the pool)."""
+    data_path, meta_path = _cache_paths(url)
+    meta = _read_json(meta_path) or {'url': url}
+    headers = {}
+    if os.path.exists(data_path):
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+    try:
+        response = requests.get(url, headers=headers, timeout=LOTTIE_FETCH_TIMEOUT)
+        if response.status_code == 304:
+            meta['checked_at'] = time.time()
+        elif response.status_code == 200:
+            _write_json(data_path, _optimized(response.json()))
+            meta.update({'etag': response.headers.get('ETag'),
+                         'last_modified': response.headers.get('Last-Modified'),
+                         'checked_at': time.time(), 'failed_at': None, 'error': None})
+        else:
+            meta.update({'failed_at': time.time(), 'error': f"HTTP {response.status_code}"})
+    except Exception as e:
+        meta.update({'failed_at': time.time(), 'error': str(e)})
+    finally:
+        with _lock:
+            _inflight.discard(url)
+    _write_json(meta_path, meta)
+
+def _schedule_fetch(url):
+    with _lock:
+        if url in _inflight:
+            return
+        _inflight.add(url)
+    _executor.submit(_fetch, url)
+
+def _is_offline():
+    try:
+        return bool(st.session_state.get('offline_mode', False))
+    except Exception:
+        return False
+
+def get_lottie(source, allow_fetch=None):
+    """
+    Returns the animation for a bundle name or URL, or None if it isn't available
+    locally yet (a background download is queued unless offline). Never blocks
+    on the network. The returned dict is shared; don't modify it.
+    """
+    bundled = _bundled_path(source)
+    if bundled and os.path.exists(bundled):
+        return _load_animation(bundled)
+    if "://" not in source:
+        return None
+
+    if allow_fetch is None:
+        allow_fetch = LOTTIE_AVAILABLE and not _is_offline()
+    data_path, meta_path = _cache_paths(source)
+    meta = _read_json(meta_path) or {}
+    now = time.time()
+    animation = _load_animation(data_path) if os.path.exists(data_path) else None
+
+    if allow_fetch:
+        failed_recently = meta.get('failed_at') and now - meta['failed_at'] < LOTTIE_RETRY_FAILED_SECONDS
+        stale = animation is not None and now - (meta.get('checked_at') or 0) > LOTTIE_REVALIDATE_SECONDS
+        if (animation is None and not failed_recently) or (stale and not failed_recently):
+            _schedule_fetch(source)
+    return animation
+
+def prefetch_lotties(urls):
+    """Queues background downloads for URLs that aren't bundled or cached yet."""
+    for url in urls:
+        get_lottie(url)
+
+def render_lottie(url, height=200, key=None, fallback_icon="school", fallback_text="Loading..."):
+    """Simple Lottie renderer with fallback"""
+    if LOTTIE_AVAILABLE:
+        lottie_json = get_lottie(url)
+        if lottie_json:
+            try:
+                st_lottie(lottie_json, height=height, key=key, speed=1, loop=True, quality="high")
+                return True
+            except Exception:
+                pass
+
+    # Elegant fallback
+    st.markdown(f"""
+    <div style="height: {height}px; display: flex; flex-direction: column; align-items: center; justify-content: center;
+         background: linear-gradient(135deg, rgba(139, 92, 246, 0.1), rgba(59, 130, 246, 0.1));
+         border-radius: 12px; text-align: center; border: 2px dashed rgba(139, 92, 246, 0.3);">
+        <span class="material-symbols-outlined" style="font-size: 3rem; color: var(--primary-purple); margin-bottom: 0.5rem; animation: pulse 2s infinite;">{fallback_icon}</span>
+        <p style="color: var(--gray-600); margin: 0; font-weight: 500;">{fallback_text}</p>
+    </div>
+    """, unsafe_allow_html=True)
+    return False
+
+
+def _add_to_bundle(index, url, animation):
+    """Writes a downloaded animation to assets/lottie/ and lists it in the index."""
+    target = os.path.join("lottie", os.path.basename(_cache_paths(url)[0]))
+    _write_json(os.path.join(LOTTIE_BUNDLE_DIR, target), _optimized(animation))
+    index[url] = target
+
+def fetch_lotties(urls=None):
+    """
+    Downloads every animation URL used in the sources (or the given ones) that
+    isn't bundled yet into assets/lottie/. Returns (added URLs, {url: error}).
+    """
+    index = _bundle_index()
+    added, failed = [], {}
+    for url in urls if urls is not None else scan_lottie_urls():
+        if url in index:
+            continue
+        try:
+            response = requests.get(url, timeout=LOTTIE_FETCH_TIMEOUT)
+            response.raise_for_status()
+            _add_to_bundle(index, url, response.json())
+            added.append(url)
+        except Exception as e:
+            failed[url] = str(e)
+    if added:
+        _save_bundle_index(index)
+    return added, failed
+
+def unbundled_lottie_urls():
+    """Animation URLs used in the sources that have no bundled file."""
+    return [url for url in scan_lottie_urls() if not os.path.exists(_bundled_path(url) or "")]
+
+def bundle_cached_lotties():
+    """
+    Copies every successfully downloaded animation into assets/lottie/ and lists
+    it in assets/lottie_index.json, so a deployment works fully offline.
+    Returns the URLs added.
+    """
+    index = _bundle_index()
+    added = []
+    if not os.path.isdir(LOTTIE_CACHE_DIR):
+        return added
+    for filename in sorted(os.listdir(LOTTIE_CACHE_DIR)):
+        if not filename.endswith(".meta.json"):
+            continue
+        meta = _read_json(os.path.join(LOTTIE_CACHE_DIR, filename)) or {}
+        url = meta.get('url')
+        data_path, _ = _cache_paths(url) if url else (None, None)
+        if not url or url in index or not os.path.exists(data_path):
+            continue
+        animation = _read_json(data_path)
+        if isinstance(animation, dict):
+            _add_to_bundle(index, url, animation)
+            added.append(url)
+    if added:
+        _save_bundle_index(index)
+    return added
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage bundled Lottie animations.")
+    parser.add_argument("command", choices=["bundle", "fetch", "check"])
+    args = parser.parse_args(argv)
+
+    if args.command == "check":
+        missing = unbundled_lottie_urls()
+        if missing:
+            print("Animations not bundled (run `python -m utils.lottie_utils fetch`):"
+                  + "".join(f"\n  {url}" for url in missing))
+            return 1
+        print("Every animation in use is bundled.")
+        return 0
+    if args.command == "fetch":
+        if not LOTTIE_AVAILABLE:
+            parser.error("requests and streamlit-lottie are required to fetch animations")
+        added, failed = fetch_lotties()
+        for url, error in failed.items():
+            print(f"  failed {url}: {error}")
+    else:
+        added, failed = bundle_cached_lotties(), {}
+    print(f"Bundled {len(added)} animation(s)" + "".join(f"\n  {url}" for url in added))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,292 @@
+# utils/migration_utils.py
+"""
+Versioned schema migrations for the PostgreSQL backend.
+
+Migrations are numbered SQL files in migrations/ (0001_initial_schema.sql, ...).
+Each one runs in its own transaction and is recorded in schema_migrations, so
+running the migrator again only applies new files. A file named
+NNNN_name.partitioned.sql replaces NNNN_name.sql when monthly partitioning is
+enabled (EDUSCAN_DB_PARTITIONING=monthly); that only matters for a new database.
+
+    python -m utils.migration_utils migrate        # apply pending migrations, then check-indexes
+    python -m utils.migration_utils status         # list applied/pending versions
+    python -m utils.migration_utils partitions     # create upcoming monthly partitions
+    python -m utils.migration_utils check-indexes  # EXPLAIN the hot queries
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+from datetime import date
+
+from utils.db_utils import db_connection, observation_query, prediction_query
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+PARTITIONING_ENV = "EDUSCAN_DB_PARTITIONING"
+# Arbitrary key for pg_advisory_lock so only one process migrates at a time
+MIGRATION_LOCK_KEY = 727_001
+
+# Tables that can be range partitioned by month, with their partition key
+PARTITIONED_TABLES = {
+    'predictions': 'timestamp',
+    'parent_observations': 'date',
+}
+
+_MIGRATION_FILE = re.compile(r"^(\d{4})_([a-z0-9_]+?)(\.partitioned)?\.sql$")
+
+
+def partitioning_enabled():
+    """True when EDUSCAN_DB_PARTITIONING=monthly."""
+    return os.environ.get(PARTITIONING_ENV, "").strip().lower() == "monthly"
+
+def discover_migrations(partitioned=None):
+    """
+    Returns [(version, name, path)] sorted by version.
+
+    Args:
+        partitioned (bool, optional): Prefer *.partitioned.sql variants. Defaults
+            to partitioning_enabled().
+    """
+    if partitioned is None:
+        partitioned = partitioning_enabled()
+    found = {}
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = _MIGRATION_FILE.match(filename)
+        if not match:
+            continue
+        version, name, variant = int(match.group(1)), match.group(2), bool(match.group(3))
+        if variant and not partitioned:
+            continue
+        if version in found and not variant:
+            continue  # the partitioned variant already won
+        found[version] = (version, name, os.path.join(MIGRATIONS_DIR, filename))
+    return [found[v] for v in sorted(found)]
+
+def _checksum(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _known_checksums(version):
+    """Checksums of every variant of a migration version (plain and partitioned)."""
+    return {
+        _checksum(os.path.join(MIGRATIONS_DIR, filename))
+        for filename in os.listdir(MIGRATIONS_DIR)
+        if (match := _MIGRATION_FILE.match(filename)) and int(match.group(1)) == version
+    }
+
+def _ensure_migrations_table(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            checksum TEXT NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+        )
+    """)
+
+def get_applied_migrations():
+    """Returns {version: {'name', 'checksum', 'applied_at'}} for this database."""
+    with db_connection() as conn:
+        if conn is None:
+            return {}
+        cur = conn.cursor()
+        _ensure_migrations_table(cur)
+        cur.execute("SELECT version, name, checksum, applied_at FROM schema_migrations ORDER BY version")
+        applied = {row[0]: {'name': row[1], 'checksum': row[2], 'applied_at': row[3].isoformat()}
+                   for row in cur.fetchall()}
+        conn.commit()
+        return applied
+
+def apply_migrations(partitioned=None):
+    """
+    Applies pending migrations in version order and returns the versions applied.
+
+    Stops at the first failure (that migration is rolled back). Applied files
+    whose contents changed since are reported with a warning, not re-run.
+    """
+    applied_now = []
+    with db_connection() as conn:
+        if conn is None:
+            return applied_now
+        cur = conn.cursor()
+        cur.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+        try:
+            _ensure_migrations_table(cur)
+            conn.commit()
+            cur.execute("SELECT version, checksum FROM schema_migrations")
+            applied = dict(cur.fetchall())
+
+            for version, name, path in discover_migrations(partitioned):
+                if version in applied:
+                    if applied[version] not in _known_checksums(version):
+                        logger.warning(f"Migration {version:04d}_{name} changed after it was applied")
+                    continue
+                with open(path, 'r') as f:
+                    sql = f.read()
+                checksum = _checksum(path)
+                try:
+                    cur.execute(sql)
+                    cur.execute(
+                        "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                        (version, name, checksum)
+                    )
+                    conn.commit()
+                    applied_now.append(version)
+                    logger.info(f"Applied migration {version:04d}_{name}")
+                except Exception as e:
+                    conn.rollback()
+                    logger.error(f"Migration {version:04d}_{name} failed: {e}")
+                    break
+        finally:
+            cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
+            conn.commit()
+    return applied_now
+
+def _month_start(day, offset=0):
+    month_index = day.year * 12 + day.month - 1 + offset
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+def ensure_monthly_partitions(months_back=12, months_ahead=3, today=None):
+    """
+    Creates monthly partitions for the partitioned tables around today.
+
+    Rows already sitting in a table's DEFAULT partition for a new month are moved
+    into it (Postgres refuses to attach a partition the default still overlaps).
+    Does nothing for tables that aren't partitioned. Returns the partitions created.
+    """
+    today = today or date.today()
+    created = []
+    with db_connection() as conn:
+        if conn is None:
+            return created
+        cur = conn.cursor()
+        for table, key in PARTITIONED_TABLES.items():
+            cur.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", (table,))
+            if cur.fetchone() is None:
+                continue
+            for offset in range(-months_back, months_ahead + 1):
+                start, end = _month_start(today, offset), _month_start(today, offset + 1)
+                partition = f"{table}_{start:%Y_%m}"
+                cur.execute("SELECT to_regclass(%s)", (partition,))
+                if cur.fetchone()[0] is not None:
+                    continue
+                try:
+                    cur.execute(f"CREATE TABLE {partition} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+                    cur.execute(f"""
+                        WITH moved AS (
+                            DELETE FROM {table}_default WHERE {key} >= %s AND {key} < %s RETURNING *
+                        )
+                        INSERT INTO {partition} SELECT * FROM moved
+                    """, (start, end))
+                    cur.execute(f"ALTER TABLE {table} ATTACH PARTITION {partition} FOR VALUES FROM (%s) TO (%s)",
+                                (start, end))
+                    conn.commit()
+                    created.append(partition)
+                except Exception as e:
+                    conn.rollback()
+                    logger.error(f"Could not create partition {partition}: {e}")
+    return created
+
+def _plan_indexes(plan):
+    """Collects the index names used anywhere in an EXPLAIN (FORMAT JSON) plan tree."""
+    indexes = set()
+    if plan.get('Index Name'):
+        indexes.add(plan['Index Name'])
+    for child in plan.get('Plans', []):
+        indexes |= _plan_indexes(child)
+    return indexes
+
+def hot_queries():
+    """The queries the app runs most, as (label, sql, params, expected index prefix)."""
+    today = date.today().isoformat()
+    predictions_sql, predictions_params = prediction_query(None, None, None, 50, True)
+    child_sql, child_params = observation_query("Check Child", "2025-01-01", today, None, True)
+    return [
+        ("student lookup by name", "SELECT id FROM students WHERE name = %s", ["Check Student"],
+         "idx_students_name"),
+        ("latest predictions for a student",
+         "SELECT id FROM predictions WHERE student_id = %s ORDER BY timestamp DESC LIMIT 20", [1],
+         "idx_predictions_student_timestamp"),
+        ("newest predictions page", predictions_sql, predictions_params, "idx_predictions_timestamp"),
+        ("observation for a student and day",
+         "SELECT id FROM parent_observations WHERE student_id = %s AND date = %s", [1, today],
+         "idx_parent_observations_student_date"),
+        ("child observations in a date range", child_sql, child_params, "idx_parent_observations_child_date"),
+        ("login by username", "SELECT id FROM users WHERE username = %s AND password = %s",
+         ["admin", "x"], "idx_users_username"),
+    ]
+
+def check_index_usage():
+    """
+    EXPLAINs each hot query and reports whether the planner can serve it from
+    the expected index. Sequential scans are disabled for the check, because on
+    small tables the planner rightly prefers them; what matters is that a
+    matching index exists and is usable.
+
+    Returns a list of (label, passed, indexes_used) tuples.
+    """
+    results = []
+    with db_connection() as conn:
+        if conn is None:
+            return results
+        cur = conn.cursor()
+        cur.execute("SET LOCAL enable_seqscan = off")
+        for label, sql, params, expected in hot_queries():
+            cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            plan = cur.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            used = _plan_indexes(plan[0]['Plan'])
+            # On partitioned tables the plan names each partition's index; map them to the parent index
+            if used:
+                cur.execute("""
+                    SELECT parent.relname FROM pg_inherits i
+                    JOIN pg_class child ON child.oid = i.inhrelid
+                    JOIN pg_class parent ON parent.oid = i.inhparent
+                    WHERE child.relname = ANY(%s)
+                """, (list(used),))
+                used |= {row[0] for row in cur.fetchall()}
+            results.append((label, expected in used, sorted(used)))
+        conn.rollback()
+    return results
+
+def _report_index_usage():
+    """Prints check_index_usage() results. Returns 0 if every hot query uses its index."""
+    results = check_index_usage()
+    for label, passed, used in results:
+        print(f"  [{'PASS' if passed else 'FAIL'}] {label}: {', '.join(used) or 'no index'}")
+    return 0 if results and all(passed for _, passed, _ in results) else 1
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the EduScan PostgreSQL schema.")
+    parser.add_argument("command", choices=["migrate", "status", "partitions", "check-indexes"])
+    parser.add_argument("--partitioned", action="store_true",
+                        help=f"Use monthly partitioning (same as {PARTITIONING_ENV}=monthly)")
+    args = parser.parse_args(argv)
+    partitioned = args.partitioned or partitioning_enabled()
+
+    if args.command == "migrate":
+        applied = apply_migrations(partitioned)
+        print(f"Applied {len(applied)} migration(s): {applied}" if applied else "Schema is up to date")
+        if partitioned:
+            print(f"Created partitions: {ensure_monthly_partitions()}")
+        print("Checking that the hot queries use their indexes:")
+        return _report_index_usage()
+    elif args.command == "status":
+        applied = get_applied_migrations()
+        for version, name, _ in discover_migrations(partitioned):
+            state = f"applied {applied[version]['applied_at']}" if version in applied else "pending"
+            print(f"  {version:04d}_{name:<32} {state}")
+    elif args.command == "partitions":
+        print(f"Created partitions: {ensure_monthly_partitions()}")
+    else:
+        return _report_index_usage()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,1051 @@
+# utils/repository.py
+"""
+Pluggable storage layer for EduScan.
+
+Pages talk to a single Repository interface covering student predictions,
+parent observations, users and app settings. The concrete backend is chosen
+once per process from the EDUSCAN_STORAGE_BACKEND environment variable:
+
+    json      JSON array files in data/ (default, the original format)
+    jsonl     append-only JSON Lines files in data/
+    sqlite    a single SQLite database file (EDUSCAN_SQLITE_PATH)
+    postgres  PostgreSQL via utils/db_utils (DATABASE_URL)
+
+Every backend follows the same contract, checked by utils/repository_checks.py:
+  - records round-trip as plain dicts in the JSON-file field layout
+  - predictions are yielded oldest first
+  - a prediction with a 'write_id' is stored at most once; saving it again
+    counts as saved (see utils/write_queue_utils.py)
+  - a child has at most one observation per date; saving again replaces it
+  - deleting returns False only when there was nothing to delete; a delete
+    the store couldn't carry out raises IOError
+  - weekly observation summaries are upserted on (child_name, week_start)
+  - load_child_observations returns records sorted by date, bounds inclusive
+  - page_* methods return (records, next_cursor), newest first; pass
+    next_cursor back as `before` for the following page (None = last page)
+"""
+import abc
+import bisect
+import gzip
+import heapq
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from utils.data_utils import (
+    PARENT_OBSERVATIONS_FILE, ObservationFileStore, _before_archive_removal, _is_archivable,
+    _iter_json_array, _load_json_data, _save_json_data, _observation_key, _observation_store,
+    _to_iso_date
+)
+
+STORAGE_BACKEND_ENV = "EDUSCAN_STORAGE_BACKEND"
+SQLITE_PATH_ENV = "EDUSCAN_SQLITE_PATH"
+SYNC_SERVER_ENV = "EDUSCAN_SYNC_SERVER"
+CHANGE_JOURNAL_FILE = "sync_journal.jsonl"
+WEEKLY_SUMMARY_FILE = "parent_observation_weekly.json"
+DEFAULT_DATA_DIR = "data"
+# Rows SqliteRepository fetches per batch when iterating a whole table
+ITER_BATCH_SIZE = 500
+DEFAULT_SETTINGS = {'language': 'English', 'theme': 'Light', 'offline_mode': False}
+
+# Users created the first time a file-based backend starts without a users store
+DEFAULT_USERS = [
+    {"username": "teacher1", "password": "password123", "role": "teacher"},
+    {"username": "parent1", "password": "password123", "role": "parent"},
+    {"username": "admin", "password": "adminpassword", "role": "admin"}
+]
+
+
+class Repository(abc.ABC):
+    """Storage interface shared by all backends."""
+
+    name = "base"
+
+    # ChangeJournal of local writes for utils.sync_utils (None when not syncing)
+    journal = None
+
+    def enable_change_journal(self):
+        """Starts recording saves and deletes in the data directory's sync journal."""
+        if self.journal is None:
+            self.journal = ChangeJournal(os.path.join(self.data_dir, CHANGE_JOURNAL_FILE))
+        return self.journal
+
+    def _journal(self, kind, records, deleted=False):
+        if self.journal is not None:
+            self.journal.record(kind, records, deleted)
+
+    # --- Student predictions ---
+
+    @abc.abstractmethod
+    def iter_student_data(self):
+        """Yields student prediction records, oldest first."""
+
+    def load_student_data(self):
+        """Loads all student prediction records."""
+        return list(self.iter_student_data())
+
+    @abc.abstractmethod
+    def save_prediction_data(self, new_record):
+        """Saves one student prediction record. Returns True on success."""
+
+    def save_predictions_bulk(self, records):
+        """Saves many prediction records in one write. Returns how many were saved."""
+        return sum(1 for record in records if self.save_prediction_data(record))
+
+    def page_student_data(self, limit, before=None, start=None):
+        """
+        Returns one page of predictions, newest first, as (records, next_cursor).
+
+        The cursor is a (timestamp, id) pair; file backends use the record's
+        position in the file as its id. Only records strictly older than `before`
+        and (optionally) no older than `start` are returned. This default streams
+        the store once and keeps only limit + 1 candidates in memory.
+        """
+        start = start.isoformat() if hasattr(start, 'isoformat') else start
+        candidates = (
+            ((str(record.get('timestamp', '')), position), record)
+            for position, record in enumerate(self.iter_student_data())
+        )
+        candidates = (
+            (key, record) for key, record in candidates
+            if (before is None or key < tuple(before)) and (start is None or key[0] >= start)
+        )
+        page = heapq.nlargest(limit + 1, candidates, key=lambda item: item[0])
+        return _keyset_page(page, limit)
+
+    def page_child_observations(self, child_name, limit, before=None, behavior_rating=None):
+        """
+        Returns one page of a child's observations, newest date first, as
+        (records, next_cursor). The cursor is the last date on the page.
+        """
+        records = [
+            obs for obs in reversed(self.load_child_observations(child_name))
+            if (before is None or obs['date'] < before)
+            and (behavior_rating is None or obs.get('behavior_rating') == behavior_rating)
+        ]
+        return _observation_page(records[:limit + 1], limit)
+
+    def iter_child_observations(self, child_name, behavior_rating=None, page_size=500):
+        """Yields every observation page_child_observations() would page through, newest date first."""
+        before = None
+        while True:
+            records, before = self.page_child_observations(
+                child_name, page_size, before=before, behavior_rating=behavior_rating)
+            yield from records
+            if before is None:
+                return
+
+    # --- Parent observations ---
+
+    @abc.abstractmethod
+    def iter_parent_observations(self):
+        """Yields the current parent observation records."""
+
+    @abc.abstractmethod
+    def load_child_observations(self, child_name, start_date=None, end_date=None):
+        """Returns one child's observations between the dates (inclusive), sorted by date."""
+
+    @abc.abstractmethod
+    def save_parent_observation(self, observation):
+        """Upserts an observation on (child_name, date). Returns True on success."""
+
+    @abc.abstractmethod
+    def delete_parent_observation(self, child_name, obs_date):
+        """
+        Deletes the observation for (child_name, obs_date). Returns True if one was
+        removed and False if there was none; raises IOError if the store failed.
+        """
+
+    def compact_parent_observations(self):
+        """Drops superseded observation records. Returns how many were removed."""
+        return 0
+
+    def archive_parent_observations(self, before_date, before_remove=None):
+        """
+        Moves observations older than before_date to cold storage and returns them.
+        before_remove(records) runs before the records leave live storage; if it
+        raises, nothing is moved. Records without a valid date are never archived.
+        """
+        return []
+
+    def load_weekly_observation_summaries(self, child_name=None):
+        """Loads the weekly aggregates of archived observations, optionally for one child."""
+        summaries = _load_json_data(os.path.join(self.data_dir, WEEKLY_SUMMARY_FILE))
+        if child_name is None:
+            return summaries
+        return [s for s in summaries if s.get('child_name') == child_name]
+
+    def save_weekly_observation_summaries(self, summaries):
+        """
+        Creates or replaces weekly aggregates keyed by (child_name, week_start);
+        other weeks are kept. Returns True on success.
+        """
+        merged = {(s.get('child_name'), s.get('week_start')): s for s in self.load_weekly_observation_summaries()}
+        merged.update({(s['child_name'], s['week_start']): s for s in summaries})
+        ordered = sorted(merged.values(), key=lambda s: (s.get('child_name') or '', s.get('week_start') or ''))
+        return _save_json_data(os.path.join(self.data_dir, WEEKLY_SUMMARY_FILE), ordered)
+
+    # --- Users ---
+
+    @abc.abstractmethod
+    def load_users(self):
+        """Loads all user records ({'username', 'password', 'role', ...})."""
+
+    @abc.abstractmethod
+    def save_user(self, user):
+        """Creates or replaces a user keyed by username. Returns True on success."""
+
+    def authenticate_user(self, username, password):
+        """Returns the matching user record, or None if the credentials are wrong."""
+        for user in self.load_users():
+            if user.get("username") == username and user.get("password") == password:
+                return user
+        return None
+
+    # --- App settings ---
+
+    @abc.abstractmethod
+    def load_app_settings(self):
+        """Loads the application settings dict."""
+
+    @abc.abstractmethod
+    def save_app_settings(self, settings):
+        """Saves the application settings dict. Returns True on success."""
+
+
+def _keyset_page(rows, limit):
+    """Splits limit + 1 fetched (cursor, record) rows into (records, next_cursor)."""
+    records = [record for _, record in rows[:limit]]
+    next_cursor = tuple(rows[limit - 1][0]) if len(rows) > limit else None
+    return records, next_cursor
+
+def _observation_page(records, limit):
+    """Same as _keyset_page for observation pages, whose cursor is the date."""
+    next_cursor = records[limit - 1]['date'] if len(records) > limit else None
+    return records[:limit], next_cursor
+
+def _unsaved_predictions(records, saved_write_ids):
+    """Drops predictions whose write_id is in saved_write_ids, adding the ids of the rest."""
+    fresh = []
+    for record in records:
+        write_id = record.get('write_id')
+        if write_id is not None:
+            if write_id in saved_write_ids:
+                continue
+            saved_write_ids.add(write_id)
+        fresh.append(record)
+    return fresh
+
+def _load_settings_file(file_path):
+    """Reads a settings dict from a JSON file, falling back to the defaults."""
+    if os.path.exists(file_path):
+        try:
+            with open(file_path, 'r') as f:
+                settings = json.load(f)
+            if isinstance(settings, dict):
+                return settings
+        except Exception as e:
+            print(f"Error loading settings from {file_path}: {e}")
+    return dict(DEFAULT_SETTINGS)
+
+def _save_settings_file(file_path, settings):
+    """Writes a settings dict to a JSON file."""
+    try:
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        with open(file_path, 'w') as f:
+            json.dump(settings, f, indent=2)
+        return True
+    except Exception as e:
+        print(f"Error saving settings: {e}")
+        return False
+
+
+class ChangeJournal:
+    """
+    Append-only JSON Lines log of local saves and deletes, which utils.sync_utils
+    pushes to the central server and then discards. Each line is
+    {'kind', 'record', 'deleted', 'at'}; a delete's record holds only its key
+    fields. Writes made inside paused() (records arriving from the server) are
+    not recorded, so they aren't sent back.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def paused(self):
+        self._local.paused = True
+        try:
+            yield
+        finally:
+            self._local.paused = False
+
+    def append(self, entries):
+        if not entries or getattr(self._local, 'paused', False):
+            return
+        os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+        with self._lock, open(self.file_path, 'a') as f:
+            f.write("".join(json.dumps(entry, default=str) + "\n" for entry in entries))
+
+    def record(self, kind, records, deleted=False):
+        now = datetime.now().isoformat()
+        self.append([{'kind': kind, 'record': record, 'deleted': deleted, 'at': now} for record in records])
+
+    def read(self):
+        """Returns (entries, offset); pass offset to discard() once they are pushed."""
+        with self._lock:
+            try:
+                with open(self.file_path, 'rb') as f:
+                    data = f.read()
+            except FileNotFoundError:
+                return [], 0
+        offset = data.rfind(b"\n") + 1  # a line still being written is left for next time
+        return [json.loads(line) for line in data[:offset].splitlines() if line.strip()], offset
+
+    def discard(self, offset):
+        """Drops the first offset bytes, keeping entries appended since read()."""
+        if not offset:
+            return
+        with self._lock:
+            with open(self.file_path, 'rb') as f:
+                f.seek(offset)
+                rest = f.read()
+            tmp_path = f"{self.file_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(rest)
+            os.replace(tmp_path, self.file_path)
+
+
+class JsonRepository(Repository):
+    """The original JSON array files (student_data.json, parent_observations.json, ...)."""
+
+    name = "json"
+
+    def __init__(self, data_dir=DEFAULT_DATA_DIR):
+        self.data_dir = data_dir
+        self.student_file = os.path.join(data_dir, "student_data.json")
+        self.users_file = os.path.join(data_dir, "users.json")
+        self.settings_file = os.path.join(data_dir, "app_settings.json")
+        observations_file = os.path.join(data_dir, "parent_observations.json")
+        if os.path.abspath(observations_file) == os.path.abspath(PARENT_OBSERVATIONS_FILE):
+            # Share the module store (and its lock) with the data_utils functions
+            self.observations = _observation_store
+        else:
+            self.observations = ObservationFileStore(observations_file, os.path.join(data_dir, "archive"))
+        self._student_lock = threading.Lock()
+        self._users_lock = threading.RLock()  # save_user holds it across load_users
+
+    def iter_student_data(self):
+        return _iter_json_array(self.student_file)
+
+    def load_student_data(self):
+        return _load_json_data(self.student_file)
+
+    def save_prediction_data(self, new_record):
+        return self.save_predictions_bulk([new_record]) == 1
+
+    def save_predictions_bulk(self, records):
+        records = list(records)
+        with self._student_lock:
+            existing = _load_json_data(self.student_file)
+            fresh = _unsaved_predictions(records, {r['write_id'] for r in existing if r.get('write_id')})
+            saved = not fresh or _save_json_data(self.student_file, existing + fresh)
+        if saved:
+            self._journal('prediction', fresh)
+        return len(records) if saved else 0
+
+    def iter_parent_observations(self):
+        return iter(self.observations.load_current())
+
+    def load_child_observations(self, child_name, start_date=None, end_date=None):
+        return self.observations.load_child(child_name, start_date, end_date)
+
+    def save_parent_observation(self, observation):
+        saved = self.observations.save(observation)
+        if saved:
+            self._journal('observation', [observation])
+        return saved
+
+    def delete_parent_observation(self, child_name, obs_date):
+        deleted = self.observations.delete(child_name, obs_date)
+        if deleted:
+            self._journal('observation', [{'child_name': child_name, 'date': _to_iso_date(obs_date)}], deleted=True)
+        return deleted
+
+    def compact_parent_observations(self):
+        return self.observations.compact()
+
+    def archive_parent_observations(self, before_date, before_remove=None):
+        return self.observations.archive_before(before_date, before_remove)
+
+    def load_users(self):
+        with self._users_lock:
+            if not os.path.exists(self.users_file) or os.stat(self.users_file).st_size == 0:
+                _save_json_data(self.users_file, DEFAULT_USERS)
+                return [dict(user) for user in DEFAULT_USERS]
+            return _load_json_data(self.users_file)
+
+    def save_user(self, user):
+        with self._users_lock:
+            users = [u for u in self.load_users() if u.get("username") != user.get("username")]
+            users.append(user)
+            return _save_json_data(self.users_file, users)
+
+    def load_app_settings(self):
+        return _load_settings_file(self.settings_file)
+
+    def save_app_settings(self, settings):
+        return _save_settings_file(self.settings_file, settings)
+
+
+class _JsonlObservationLog:
+    """
+    Parent observations as an append-only JSON Lines log.
+
+    Every save appends one line; the latest line for a (child_name, date) wins and
+    a line with "_deleted": true removes the key. The index is caught up by reading
+    only the bytes appended since the last read, so other writers' appends are
+    picked up without rescanning the file.
+    """
+
+    def __init__(self, file_path, archive_dir):
+        self.file_path = file_path
+        self.archive_dir = archive_dir
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._records = {}    # (child_name, date) -> record
+        self._by_child = {}   # child_name -> sorted list of dates
+        self._line_count = 0
+        self._read_pos = 0
+        self._inode = None
+
+    def _apply(self, record):
+        key = _observation_key(record)
+        child_dates = self._by_child.setdefault(key[0], [])
+        if record.get("_deleted"):
+            if self._records.pop(key, None) is not None:
+                child_dates.pop(bisect.bisect_left(child_dates, key[1]))
+            return
+        if key not in self._records:
+            bisect.insort(child_dates, key[1])
+        self._records[key] = record
+
+    def _catch_up(self):
+        """Applies lines appended since the last read. Callers must hold the lock."""
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            self._reset()
+            return
+        if stat.st_ino != self._inode or stat.st_size < self._read_pos:
+            self._reset()
+            self._inode = stat.st_ino
+        if stat.st_size == self._read_pos:
+            return
+        with open(self.file_path, 'rb') as f:
+            f.seek(self._read_pos)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # a writer is still appending this line
+                self._read_pos += len(line)
+                if not line.strip():
+                    continue
+                self._line_count += 1
+                try:
+                    self._apply(json.loads(line))
+                except json.JSONDecodeError:
+                    print(f"Warning: skipping malformed line in {self.file_path}")
+
+    def _append(self, records):
+        with open(self.file_path, 'a') as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+
+    def _rewrite(self, records):
+        """Replaces the log with one line per record. Callers must hold the lock."""
+        tmp_path = f"{self.file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        os.replace(tmp_path, self.file_path)
+        self._reset()
+        self._catch_up()
+
+    def iter_current(self):
+        with self._lock:
+            self._catch_up()
+            return [dict(record) for record in self._records.values()]
+
+    def load_child(self, child_name, start_date=None, end_date=None):
+        with self._lock:
+            self._catch_up()
+            dates = self._by_child.get(child_name, [])
+            lo = bisect.bisect_left(dates, _to_iso_date(start_date)) if start_date else 0
+            hi = bisect.bisect_right(dates, _to_iso_date(end_date)) if end_date else len(dates)
+            return [dict(self._records[(child_name, d)]) for d in dates[lo:hi]]
+
+    def save(self, observation):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+            try:
+                self._catch_up()
+                self._append([observation])
+            except Exception as e:
+                print(f"Error saving to {self.file_path}: {e}")
+                return False
+            self._catch_up()
+            return True
+
+    def delete(self, child_name, obs_date):
+        with self._lock:
+            self._catch_up()
+            key = (child_name, _to_iso_date(obs_date))
+            if key not in self._records:
+                return False
+            self._append([{"child_name": child_name, "date": key[1], "_deleted": True,
+                           "timestamp": datetime.now().isoformat()}])
+            self._catch_up()
+            return True
+
+    def compact(self):
+        with self._lock:
+            self._catch_up()
+            removed = self._line_count - len(self._records)
+            if removed > 0:
+                self._rewrite(list(self._records.values()))
+            return max(removed, 0)
+
+    def archive_before(self, before_date, before_remove=None):
+        cutoff = _to_iso_date(before_date)
+        with self._lock:
+            self._catch_up()
+            archived = [r for key, r in self._records.items() if _is_archivable(key[1], cutoff)]
+            if not archived:
+                return []
+            os.makedirs(self.archive_dir, exist_ok=True)
+            archive_path = os.path.join(
+                self.archive_dir,
+                f"parent_observations_before_{cutoff}_{datetime.now().strftime('%Y%m%dT%H%M%S')}.jsonl.gz"
+            )
+            with gzip.open(archive_path, 'wt', encoding='utf-8') as f:
+                for record in archived:
+                    f.write(json.dumps(record) + "\n")
+            _before_archive_removal(before_remove, archived, archive_path)
+            self._rewrite([r for key, r in self._records.items() if not _is_archivable(key[1], cutoff)])
+            return archived
+
+
+class JsonlRepository(Repository):
+    """Append-only JSON Lines files: saves cost one appended line instead of a full rewrite."""
+
+    name = "jsonl"
+
+    def __init__(self, data_dir=DEFAULT_DATA_DIR):
+        self.data_dir = data_dir
+        self.student_file = os.path.join(data_dir, "student_data.jsonl")
+        self.users_file = os.path.join(data_dir, "users.jsonl")
+        self.settings_file = os.path.join(data_dir, "app_settings.json")
+        self.observations = _JsonlObservationLog(
+            os.path.join(data_dir, "parent_observations.jsonl"),
+            os.path.join(data_dir, "archive")
+        )
+        self._write_lock = threading.Lock()
+        self._prediction_lock = threading.Lock()
+        self._users_lock = threading.RLock()  # save_user holds it across load_users
+        self._write_ids = None  # write_ids already in student_file, read on the first save
+
+    def _iter_lines(self, file_path):
+        if not os.path.exists(file_path):
+            return
+        with open(file_path, 'r') as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        print(f"Warning: skipping malformed line in {file_path}")
+
+    def _append_lines(self, file_path, records):
+        try:
+            os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+            with self._write_lock, open(file_path, 'a') as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+            return True
+        except Exception as e:
+            print(f"Error saving to {file_path}: {e}")
+            return False
+
+    def iter_student_data(self):
+        return self._iter_lines(self.student_file)
+
+    def save_prediction_data(self, new_record):
+        return self.save_predictions_bulk([new_record]) == 1
+
+    def save_predictions_bulk(self, records):
+        records = list(records)
+        with self._prediction_lock:
+            if self._write_ids is None:
+                self._write_ids = {r['write_id'] for r in self._iter_lines(self.student_file) if r.get('write_id')}
+            write_ids = set(self._write_ids)
+            fresh = _unsaved_predictions(records, write_ids)
+            if fresh and not self._append_lines(self.student_file, fresh):
+                return 0
+            self._write_ids = write_ids
+        self._journal('prediction', fresh)
+        return len(records)
+
+    def iter_parent_observations(self):
+        return iter(self.observations.iter_current())
+
+    def load_child_observations(self, child_name, start_date=None, end_date=None):
+        return self.observations.load_child(child_name, start_date, end_date)
+
+    def save_parent_observation(self, observation):
+        saved = self.observations.save(observation)
+        if saved:
+            self._journal('observation', [observation])
+        return saved
+
+    def delete_parent_observation(self, child_name, obs_date):
+        deleted = self.observations.delete(child_name, obs_date)
+        if deleted:
+            self._journal('observation', [{'child_name': child_name, 'date': _to_iso_date(obs_date)}], deleted=True)
+        return deleted
+
+    def compact_parent_observations(self):
+        return self.observations.compact()
+
+    def archive_parent_observations(self, before_date, before_remove=None):
+        return self.observations.archive_before(before_date, before_remove)
+
+    def load_users(self):
+        with self._users_lock:
+            if not os.path.exists(self.users_file):
+                self._append_lines(self.users_file, DEFAULT_USERS)
+        users = {}
+        for user in self._iter_lines(self.users_file):
+            users[user.get("username")] = user  # later lines replace earlier ones
+        return list(users.values())
+
+    def save_user(self, user):
+        with self._users_lock:  # so concurrent first saves can't both write the defaults
+            self.load_users()  # make sure the defaults are written first
+            return self._append_lines(self.users_file, [user])
+
+    def load_app_settings(self):
+        return _load_settings_file(self.settings_file)
+
+    def save_app_settings(self, settings):
+        return _save_settings_file(self.settings_file, settings)
+
+
+class SqliteRepository(Repository):
+    """
+    A single SQLite database file. Each record is stored whole as JSON next to the
+    columns it is looked up by, so records round-trip exactly.
+    """
+
+    name = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS predictions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_name TEXT,
+            timestamp TEXT,
+            record TEXT NOT NULL,
+            write_id TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_predictions_student_timestamp
+            ON predictions (student_name, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_predictions_timestamp_id
+            ON predictions (timestamp, id);
+        CREATE TABLE IF NOT EXISTS parent_observations (
+            child_name TEXT NOT NULL,
+            date TEXT NOT NULL,
+            timestamp TEXT,
+            record TEXT NOT NULL,
+            PRIMARY KEY (child_name, date)
+        );
+        CREATE TABLE IF NOT EXISTS weekly_observation_summaries (
+            child_name TEXT NOT NULL,
+            week_start TEXT NOT NULL,
+            summary TEXT NOT NULL,
+            PRIMARY KEY (child_name, week_start)
+        );
+        CREATE TABLE IF NOT EXISTS users (
+            username TEXT PRIMARY KEY,
+            password TEXT,
+            role TEXT,
+            record TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS app_settings (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            settings TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.environ.get(SQLITE_PATH_ENV, os.path.join(DEFAULT_DATA_DIR, "eduscan.sqlite3"))
+        self.data_dir = os.path.dirname(self.db_path) or "."
+        os.makedirs(self.data_dir, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = self._connect()
+        with self._lock:
+            self._conn.executescript(self.SCHEMA)
+            if 'write_id' not in {row[1] for row in self._conn.execute("PRAGMA table_info(predictions)")}:
+                self._conn.execute("ALTER TABLE predictions ADD COLUMN write_id TEXT")
+            self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_predictions_write_id ON predictions (write_id)")
+            if self._conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 0:
+                for user in DEFAULT_USERS:
+                    self._put_user(user)
+            self._conn.commit()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _write(self, sql, params=()):
+        try:
+            with self._lock:
+                cur = self._conn.execute(sql, params)
+                self._conn.commit()
+                return cur.rowcount
+        except sqlite3.Error as e:
+            print(f"SQLite error: {e}")
+            return None
+
+    def _iter_query(self, table, key_columns, batch_size=ITER_BATCH_SIZE):
+        """
+        Yields a table's decoded records in key order, fetching batch_size rows at
+        a time after the last key seen. The lock is held only while a batch is
+        fetched and no cursor stays open between batches, so long scans don't
+        block writers and an abandoned iteration leaves nothing to close.
+        """
+        columns = ", ".join(key_columns)
+        placeholders = ", ".join("?" for _ in key_columns)
+        last_key = None
+        while True:
+            if last_key is None:
+                sql, params = f"SELECT {columns}, record FROM {table}", ()
+            else:
+                sql, params = f"SELECT {columns}, record FROM {table} WHERE ({columns}) > ({placeholders})", last_key
+            with self._lock:
+                rows = self._conn.execute(f"{sql} ORDER BY {columns} LIMIT ?", (*params, batch_size)).fetchall()
+            for row in rows:
+                yield json.loads(row[-1])
+            if len(rows) < batch_size:
+                return
+            last_key = rows[-1][:-1]
+
+    def iter_student_data(self):
+        return self._iter_query("predictions", ("id",))
+
+    def save_prediction_data(self, new_record):
+        inserted = self._write(
+            "INSERT OR IGNORE INTO predictions (student_name, timestamp, record, write_id) VALUES (?, ?, ?, ?)",
+            (new_record.get("student_name"), new_record.get("timestamp"), json.dumps(new_record),
+             new_record.get("write_id"))
+        )
+        if inserted:
+            self._journal('prediction', [new_record])
+        return inserted is not None
+
+    def save_predictions_bulk(self, records):
+        records = list(records)
+        rows = [(r.get("student_name"), r.get("timestamp"), json.dumps(r), r.get("write_id")) for r in records]
+        try:
+            with self._lock:
+                with self._conn:  # one transaction for the whole batch
+                    # Row by row so replays that INSERT OR IGNORE skipped stay out of the journal
+                    inserted = [
+                        record for record, row in zip(records, rows)
+                        if self._conn.execute(
+                            "INSERT OR IGNORE INTO predictions (student_name, timestamp, record, write_id) "
+                            "VALUES (?, ?, ?, ?)", row
+                        ).rowcount
+                    ]
+            self._journal('prediction', inserted)
+            return len(rows)
+        except sqlite3.Error as e:
+            print(f"SQLite error: {e}")
+            return 0
+
+    def page_student_data(self, limit, before=None, start=None):
+        sql = "SELECT timestamp, id, record FROM predictions WHERE 1 = 1"
+        params = []
+        if before is not None:
+            sql += " AND (timestamp, id) < (?, ?)"
+            params.extend(before)
+        if start is not None:
+            sql += " AND timestamp >= ?"
+            params.append(start.isoformat() if hasattr(start, 'isoformat') else start)
+        sql += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return _keyset_page([((ts, row_id), json.loads(record)) for ts, row_id, record in rows], limit)
+
+    def iter_parent_observations(self):
+        return self._iter_query("parent_observations", ("child_name", "date"))
+
+    def page_child_observations(self, child_name, limit, before=None, behavior_rating=None):
+        sql = "SELECT record FROM parent_observations WHERE child_name = ?"
+        params = [child_name]
+        if before is not None:
+            sql += " AND date < ?"
+            params.append(before)
+        if behavior_rating is not None:
+            sql += " AND json_extract(record, '$.behavior_rating') = ?"
+            params.append(behavior_rating)
+        sql += " ORDER BY date DESC LIMIT ?"
+        params.append(limit + 1)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return _observation_page([json.loads(record) for (record,) in rows], limit)
+
+    def load_child_observations(self, child_name, start_date=None, end_date=None):
+        sql = "SELECT record FROM parent_observations WHERE child_name = ?"
+        params = [child_name]
+        if start_date:
+            sql += " AND date >= ?"
+            params.append(_to_iso_date(start_date))
+        if end_date:
+            sql += " AND date <= ?"
+            params.append(_to_iso_date(end_date))
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY date", params).fetchall()
+        return [json.loads(record) for (record,) in rows]
+
+    def save_parent_observation(self, observation):
+        child_name, obs_date = _observation_key(observation)
+        saved = self._write(
+            """INSERT INTO parent_observations (child_name, date, timestamp, record) VALUES (?, ?, ?, ?)
+               ON CONFLICT (child_name, date) DO UPDATE SET timestamp = excluded.timestamp, record = excluded.record""",
+            (child_name, obs_date, observation.get("timestamp"), json.dumps(observation))
+        ) is not None
+        if saved:
+            self._journal('observation', [observation])
+        return saved
+
+    def delete_parent_observation(self, child_name, obs_date):
+        obs_date = _to_iso_date(obs_date)
+        deleted = self._write(
+            "DELETE FROM parent_observations WHERE child_name = ? AND date = ?", (child_name, obs_date)
+        )
+        if deleted is None:
+            raise IOError(f"could not delete the observation for {child_name} on {obs_date}")
+        deleted = deleted > 0
+        if deleted:
+            self._journal('observation', [{'child_name': child_name, 'date': obs_date}], deleted=True)
+        return deleted
+
+    def archive_parent_observations(self, before_date, before_remove=None):
+        cutoff = _to_iso_date(before_date)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT child_name, date, record FROM parent_observations WHERE date < ? ORDER BY child_name, date",
+                (cutoff,)
+            ).fetchall()
+            rows = [row for row in rows if _is_archivable(row[1], cutoff)]
+            if not rows:
+                return []
+            archived = [json.loads(record) for _, _, record in rows]
+            archive_dir = os.path.join(self.data_dir, "archive")
+            os.makedirs(archive_dir, exist_ok=True)
+            archive_path = os.path.join(
+                archive_dir,
+                f"parent_observations_before_{cutoff}_{datetime.now().strftime('%Y%m%dT%H%M%S')}.json.gz"
+            )
+            with gzip.open(archive_path, 'wt', encoding='utf-8') as f:
+                json.dump(archived, f)
+            _before_archive_removal(before_remove, archived, archive_path)
+            self._conn.executemany(
+                "DELETE FROM parent_observations WHERE child_name = ? AND date = ?",
+                [(child_name, obs_date) for child_name, obs_date, _ in rows]
+            )
+            self._conn.commit()
+            return archived
+
+    def load_weekly_observation_summaries(self, child_name=None):
+        sql, params = "SELECT summary FROM weekly_observation_summaries", ()
+        if child_name is not None:
+            sql, params = sql + " WHERE child_name = ?", (child_name,)
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY child_name, week_start", params).fetchall()
+        return [json.loads(summary) for (summary,) in rows]
+
+    def save_weekly_observation_summaries(self, summaries):
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    """INSERT INTO weekly_observation_summaries (child_name, week_start, summary) VALUES (?, ?, ?)
+                       ON CONFLICT (child_name, week_start) DO UPDATE SET summary = excluded.summary""",
+                    [(s['child_name'], s['week_start'], json.dumps(s)) for s in summaries]
+                )
+                self._conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"SQLite error: {e}")
+            return False
+
+    def _put_user(self, user):
+        self._conn.execute(
+            """INSERT INTO users (username, password, role, record) VALUES (?, ?, ?, ?)
+               ON CONFLICT (username) DO UPDATE SET password = excluded.password,
+                   role = excluded.role, record = excluded.record""",
+            (user.get("username"), user.get("password"), user.get("role"), json.dumps(user))
+        )
+
+    def load_users(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT record FROM users ORDER BY username").fetchall()
+        return [json.loads(record) for (record,) in rows]
+
+    def save_user(self, user):
+        try:
+            with self._lock:
+                self._put_user(user)
+                self._conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"SQLite error: {e}")
+            return False
+
+    def authenticate_user(self, username, password):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM users WHERE username = ? AND password = ?", (username, password)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def load_app_settings(self):
+        with self._lock:
+            row = self._conn.execute("SELECT settings FROM app_settings WHERE id = 1").fetchone()
+        return json.loads(row[0]) if row else dict(DEFAULT_SETTINGS)
+
+    def save_app_settings(self, settings):
+        return self._write(
+            "INSERT INTO app_settings (id, settings) VALUES (1, ?) "
+            "ON CONFLICT (id) DO UPDATE SET settings = excluded.settings",
+            (json.dumps(settings),)
+        ) is not None
+
+
+class PostgresRepository(Repository):
+    """
+    PostgreSQL through utils/db_utils. Records are normalized to the JSON-file field
+    layout (e.g. users' 'user_type' is exposed as 'role'). The schema has no
+    settings or weekly summary tables, so those stay in local files.
+    """
+
+    name = "postgres"
+
+    def __init__(self, data_dir=DEFAULT_DATA_DIR):
+        # Imported here so the psycopg2 dependency is only needed for this backend
+        from utils import db_utils
+        self.db = db_utils
+        self.data_dir = data_dir
+        self.settings_file = os.path.join(data_dir, "app_settings.json")
+
+    def iter_student_data(self):
+        return self.db.iter_student_predictions(newest_first=False)
+
+    def save_prediction_data(self, new_record):
+        return self.db.save_prediction_to_db(new_record)
+
+    def save_predictions_bulk(self, records):
+        stats = self.db.save_predictions_bulk(list(records))
+        return stats['rows'] if stats else 0
+
+    def page_student_data(self, limit, before=None, start=None):
+        start = start.isoformat() if hasattr(start, 'isoformat') else start
+        rows = self.db.iter_student_predictions(start=start, before=before, limit=limit + 1)
+        return _keyset_page([((r['timestamp'], r['id']), r) for r in rows], limit)
+
+    def iter_parent_observations(self):
+        return self.db.iter_parent_observation_records()
+
+    def page_child_observations(self, child_name, limit, before=None, behavior_rating=None):
+        records = list(self.db.page_parent_observations(child_name, limit + 1, before, behavior_rating))
+        return _observation_page(records, limit)
+
+    def load_child_observations(self, child_name, start_date=None, end_date=None):
+        records = self.db.iter_parent_observation_records(
+            child_name,
+            _to_iso_date(start_date) if start_date else None,
+            _to_iso_date(end_date) if end_date else None
+        )
+        return sorted(records, key=lambda obs: obs['date'])
+
+    def save_parent_observation(self, observation):
+        return self.db.save_parent_observation_to_db(observation)
+
+    def delete_parent_observation(self, child_name, obs_date):
+        deleted = self.db.delete_parent_observation_from_db(child_name, _to_iso_date(obs_date))
+        if deleted is None:
+            raise IOError(f"could not delete the observation for {child_name} on {obs_date}")
+        return deleted
+
+    def load_users(self):
+        return [self._normalize_user(user) for user in self.db.load_users_from_db()]
+
+    def save_user(self, user):
+        return self.db.save_user_to_db(user)
+
+    def authenticate_user(self, username, password):
+        user = self.db.authenticate_user_db(username, password)
+        return self._normalize_user(user) if user else None
+
+    @staticmethod
+    def _normalize_user(user):
+        user = dict(user)
+        user.setdefault('role', user.get('user_type'))
+        return user
+
+    def load_app_settings(self):
+        return _load_settings_file(self.settings_file)
+
+    def save_app_settings(self, settings):
+        return _save_settings_file(self.settings_file, settings)
+
+
+REPOSITORY_BACKENDS = {
+    "json": JsonRepository,
+    "jsonl": JsonlRepository,
+    "sqlite": SqliteRepository,
+    "postgres": PostgresRepository,
+}
+
+_repository = None
+_repository_lock = threading.Lock()
+
+def create_repository(backend, **kwargs):
+    """Creates a repository for the named backend ('json', 'jsonl', 'sqlite' or 'postgres')."""
+    try:
+        repository_class = REPOSITORY_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown storage backend '{backend}'. Choose one of: {', '.join(REPOSITORY_BACKENDS)}")
+    return repository_class(**kwargs)
+
+def get_repository():
+    """Returns the process-wide repository, creating it from EDUSCAN_STORAGE_BACKEND on first use."""
+    global _repository
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                repository = create_repository(os.environ.get(STORAGE_BACKEND_ENV, "json").strip().lower())
+                if os.environ.get(SYNC_SERVER_ENV, "").strip() and repository.name != 'postgres':
+                    # Journal from the first write, before the sync worker starts
+                    repository.enable_change_journal()
+                _repository = repository
+    return _repository
@@ -0,0 +1,246 @@
+# utils/repository_checks.py
+"""
+Conformance checks and a small benchmark shared by every repository backend.
+
+Run against throwaway storage (never the live data directory):
+
+    python -m utils.repository_checks                      # json, jsonl, sqlite
+    python -m utils.repository_checks --bench --records 5000
+    python -m utils.repository_checks --backends postgres  # uses DATABASE_URL; writes test rows
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from utils.repository import REPOSITORY_BACKENDS, create_repository
+
+
+def _prediction(i, student_name="Check Student"):
+    return {
+        'student_name': student_name,
+        'teacher_name': 'Check Teacher',
+        'grade_level': 'Grade 3',
+        'math_score': 50 + i % 50,
+        'reading_score': 60 + i % 40,
+        'writing_score': 55 + i % 45,
+        'attendance': 90.0,
+        'behavior': 3,
+        'literacy': 4,
+        'prediction': i % 2,
+        'probability': round((i % 100) / 100, 2),
+        'risk_level': ['Low', 'Medium', 'High'][i % 3],
+        'notes': '',
+        'timestamp': (datetime(2025, 1, 1) + timedelta(minutes=i)).isoformat()
+    }
+
+def _observation(child_name, obs_date, homework=70):
+    return {
+        'child_name': child_name,
+        'date': obs_date.isoformat(),
+        'homework_completion': homework,
+        'reading_time': 20,
+        'focus_level': 'Good',
+        'subjects_struggled': ['Math'],
+        'behavior_rating': 4,
+        'mood_rating': 4,
+        'sleep_hours': 9.0,
+        'energy_level': 'Normal',
+        'screen_time': 1.5,
+        'physical_activity': 45,
+        'medication_taken': False,
+        'timestamp': datetime.now().isoformat()
+    }
+
+def _subset_equal(expected, actual):
+    """True if every field of expected round-tripped into actual (backends may add e.g. 'id')."""
+    return actual is not None and all(actual.get(k) == v for k, v in expected.items())
+
+
+def run_conformance_checks(repository):
+    """
+    Exercises the Repository contract against an empty repository.
+
+    Returns a list of (check_name, passed, detail) tuples.
+    """
+    results = []
+
+    def check(name, passed, detail=""):
+        results.append((name, bool(passed), detail))
+
+    # Predictions
+    saved = [_prediction(i, f"Student {i % 3}") for i in range(6)]
+    check("save_prediction_data returns True", all(repository.save_prediction_data(r) for r in saved))
+    loaded = repository.load_student_data()
+    check("predictions round-trip", len(loaded) == len(saved) and
+          all(_subset_equal(e, a) for e, a in zip(saved, loaded)),
+          f"{len(loaded)} loaded")
+    check("iter_student_data matches load_student_data",
+          [r['timestamp'] for r in repository.iter_student_data()] == [r['timestamp'] for r in loaded])
+    bulk = [_prediction(i, f"Bulk Student {i % 4}") for i in range(6, 16)]
+    check("save_predictions_bulk reports every row", repository.save_predictions_bulk(bulk) == len(bulk))
+    loaded = repository.load_student_data()
+    check("bulk predictions follow earlier ones", len(loaded) == len(saved) + len(bulk) and
+          all(_subset_equal(e, a) for e, a in zip(saved + bulk, loaded)),
+          f"{len(loaded)} loaded")
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = repository.page_student_data(5, before=cursor)
+        pages.append(page)
+        if cursor is None:
+            break
+    paged = [r['timestamp'] for page in pages for r in page]
+    check("page_student_data walks every record newest first",
+          paged == sorted((r['timestamp'] for r in saved + bulk), reverse=True) and len(pages) == 4,
+          f"{len(pages)} pages")
+    since = bulk[4]['timestamp']
+    page, cursor = repository.page_student_data(50, start=since)
+    check("page_student_data honours start", [r['timestamp'] for r in page] ==
+          sorted((r['timestamp'] for r in bulk[4:]), reverse=True) and cursor is None)
+
+    # Observations
+    day = date(2025, 3, 10)
+    days = [day + timedelta(days=n) for n in range(5)]
+    for d in days:
+        repository.save_parent_observation(_observation("Amina", d))
+    repository.save_parent_observation(_observation("Hodan", day))
+    child = repository.load_child_observations("Amina")
+    check("observations sorted by date", [o['date'] for o in child] == [d.isoformat() for d in days])
+
+    repository.save_parent_observation(_observation("Amina", days[2], homework=95))
+    child = repository.load_child_observations("Amina")
+    check("save upserts on (child_name, date)",
+          len(child) == len(days) and child[2]['homework_completion'] == 95,
+          f"{len(child)} records")
+
+    ranged = repository.load_child_observations("Amina", days[1], days[3])
+    check("date range is inclusive", [o['date'] for o in ranged] == [d.isoformat() for d in days[1:4]])
+    check("date range accepts ISO strings",
+          len(repository.load_child_observations("Amina", days[1].isoformat(), days[3].isoformat())) == 3)
+    check("children are isolated", len(repository.load_child_observations("Hodan")) == 1)
+    first, cursor = repository.page_child_observations("Amina", 2)
+    second, cursor2 = repository.page_child_observations("Amina", 2, before=cursor)
+    last, cursor3 = repository.page_child_observations("Amina", 2, before=cursor2)
+    check("page_child_observations walks dates newest first",
+          [o['date'] for o in first + second + last] == [d.isoformat() for d in reversed(days)]
+          and cursor3 is None)
+    filtered, _ = repository.page_child_observations("Amina", 10, behavior_rating=5)
+    check("page_child_observations filters by behavior rating", filtered == [])
+    check("unknown child is empty", repository.load_child_observations("Nobody") == [])
+    check("observation fields round-trip",
+          _subset_equal(_observation("Hodan", day) | {'timestamp': None},
+                        repository.load_child_observations("Hodan")[0] | {'timestamp': None}))
+
+    check("delete removes the record", repository.delete_parent_observation("Amina", days[0]) is True)
+    check("delete of a missing record is False", repository.delete_parent_observation("Amina", days[0]) is False)
+    check("iter_parent_observations sees current records",
+          sorted((o['child_name'], o['date']) for o in repository.iter_parent_observations()) ==
+          sorted([("Amina", d.isoformat()) for d in days[1:]] + [("Hodan", day.isoformat())]))
+    repository.compact_parent_observations()
+    check("compaction keeps current records", len(repository.load_child_observations("Amina")) == 4)
+    week = {'child_name': 'Amina', 'week_start': '2025-03-10', 'observation_count': 1, 'dates': ['2025-03-10']}
+    repository.save_weekly_observation_summaries([week, dict(week, child_name='Hodan')])
+    repository.save_weekly_observation_summaries([dict(week, observation_count=2)])
+    check("weekly summaries upsert on (child_name, week_start)",
+          [s['observation_count'] for s in repository.load_weekly_observation_summaries("Amina")] == [2]
+          and len(repository.load_weekly_observation_summaries()) == 2)
+
+    # Users
+    check("default users exist", any(u.get('username') == 'admin' for u in repository.load_users()))
+    repository.save_user({'username': 'check_user', 'password': 'secret', 'role': 'teacher'})
+    user = repository.authenticate_user('check_user', 'secret')
+    check("authenticate_user accepts valid credentials", user is not None and user.get('role') == 'teacher')
+    check("authenticate_user rejects a wrong password", repository.authenticate_user('check_user', 'nope') is None)
+    repository.save_user({'username': 'check_user', 'password': 'changed', 'role': 'parent'})
+    user = repository.authenticate_user('check_user', 'changed')
+    check("save_user replaces an existing user", user is not None and user.get('role') == 'parent')
+
+    # Settings
+    settings = repository.load_app_settings()
+    check("settings have defaults", settings.get('language') == 'English')
+    settings.update({'language': 'Somali', 'offline_mode': True})
+    repository.save_app_settings(settings)
+    check("settings round-trip", repository.load_app_settings() == settings)
+
+    return results
+
+
+def benchmark_repository(repository, records=1000, children=20, lookups=200):
+    """
+    Times the operations the pages perform most. Returns {operation: (seconds, ops_per_second)}.
+    """
+    timings = {}
+
+    def timed(name, count, func):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        timings[name] = (elapsed, count / elapsed if elapsed else float('inf'))
+
+    def save_predictions():
+        for i in range(records):
+            repository.save_prediction_data(_prediction(i, f"Student {i % children}"))
+
+    def save_observations():
+        for i in range(records):
+            repository.save_parent_observation(
+                _observation(f"Child {i % children}", date(2024, 1, 1) + timedelta(days=i // children)))
+
+    def child_lookups():
+        for i in range(lookups):
+            repository.load_child_observations(f"Child {i % children}", date(2024, 1, 1), date(2024, 3, 31))
+
+    def authenticate():
+        for _ in range(lookups):
+            repository.authenticate_user('admin', 'adminpassword')
+
+    timed("save_prediction_data", records, save_predictions)
+    timed("save_predictions_bulk", records, lambda: repository.save_predictions_bulk(
+        [_prediction(i, f"Student {i % children}") for i in range(records)]))
+    timed("iter_student_data", records, lambda: sum(1 for _ in repository.iter_student_data()))
+    timed("save_parent_observation", records, save_observations)
+    timed("load_child_observations (90 days)", lookups, child_lookups)
+    timed("authenticate_user", lookups, authenticate)
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check and benchmark EduScan storage backends.")
+    parser.add_argument("--backends", default="json,jsonl,sqlite",
+                        help="Comma-separated backends (postgres writes test rows to DATABASE_URL)")
+    parser.add_argument("--bench", action="store_true", help="Also run the benchmark")
+    parser.add_argument("--records", type=int, default=1000, help="Records written by the benchmark")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for backend in [b.strip() for b in args.backends.split(",") if b.strip()]:
+        if backend not in REPOSITORY_BACKENDS:
+            parser.error(f"unknown backend '{backend}'")
+        for phase in ["conformance"] + (["benchmark"] if args.bench else []):
+            workdir = tempfile.mkdtemp(prefix=f"eduscan-{backend}-")
+            try:
+                if backend == "sqlite":
+                    repository = create_repository(backend, db_path=os.path.join(workdir, "eduscan.sqlite3"))
+                else:
+                    repository = create_repository(backend, data_dir=workdir)
+
+                if phase == "conformance":
+                    print(f"== {backend}: conformance")
+                    for name, passed, detail in run_conformance_checks(repository):
+                        failures += not passed
+                        print(f"  [{'PASS' if passed else 'FAIL'}] {name}" + (f" ({detail})" if detail else ""))
+                else:
+                    print(f"== {backend}: benchmark ({args.records} records)")
+                    for name, (seconds, rate) in benchmark_repository(repository, records=args.records).items():
+                        print(f"  {name:<36} {seconds:8.3f}s  {rate:12.1f} ops/s")
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,362 @@
+# utils/static_charts.py
+"""
+Static (pre-rendered image) backend for the app's Plotly charts.
+
+render_static_chart() redraws a Plotly figure with matplotlib as a PNG (or
+SVG), so a device in offline mode or an old tablet receives one small image
+instead of running the Plotly JS runtime. The trace types the pages use are
+supported: scatter/scattergl lines and markers, bar, pie/donut, heatmap,
+scatterpolar (radar) and the gauge indicator. For other figures it returns
+None and the caller falls back to the interactive chart.
+
+Images are cached on disk in static/charts/, named by a hash of the figure
+JSON (which contains the data), the theme and the output size, so each chart
+version is drawn once and then served from disk. With static serving on
+they're sent as long-cacheable URLs; otherwise the bytes are sent inline.
+Images for superseded data are never requested again; prune them with:
+
+    python -m utils.static_charts prune --max-age-days 30
+"""
+import argparse
+import base64
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.colors import LinearSegmentedColormap, to_rgba
+from matplotlib.figure import Figure
+from matplotlib.patches import Wedge
+
+from utils.asset_utils import STATIC_DIR, STYLES_DIR
+
+STATIC_CHARTS_DIR = os.path.join(STATIC_DIR, "charts")
+STATIC_CHART_FORMAT = os.environ.get('EDUSCAN_STATIC_CHART_FORMAT', 'png').lower()  # png | svg
+STATIC_CHART_DPI = 100
+# Plotly's default colorway, for traces without an explicit colour
+DEFAULT_COLORWAY = ['#636efa', '#EF553B', '#00cc96', '#ab63fa', '#FFA15A',
+                    '#19d3f3', '#FF6692', '#B6E880', '#FF97FF', '#FECB52']
+SUPPORTED_TRACE_TYPES = {'scatter', 'scattergl', 'bar', 'pie', 'heatmap', 'scatterpolar', 'indicator'}
+
+_render_lock = threading.Lock()
+
+
+@lru_cache(maxsize=2)
+def _css_variables(theme):
+    """CSS custom properties from styles/exact_ui.css (:root, overlaid with the dark block for Dark)."""
+    with open(os.path.join(STYLES_DIR, "exact_ui.css"), 'r', encoding='utf-8') as f:
+        css = f.read()
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    variables = {}
+    for selector, body in re.findall(r"([^{};]+)\{([^{}]*)\}", css):
+        selector = selector.strip()
+        if selector == ":root" or (theme == "Dark" and 'data-theme="Dark"' in selector):
+            variables.update(re.findall(r"--([\w-]+)\s*:\s*(#[0-9a-fA-F]{3,8})\s*;", body))
+    return variables
+
+def _color(value, theme, default=None):
+    """A matplotlib colour for a Plotly colour string (hex, name, rgb(a)(), var(--x))."""
+    if value is None:
+        return default
+    if not isinstance(value, str):
+        return value
+    value = value.strip()
+    var = re.fullmatch(r"var\(--([\w-]+)\)", value)
+    if var:
+        return _css_variables(theme).get(var.group(1), default or '#6b7280')
+    rgb = re.fullmatch(r"rgba?\(([^)]*)\)", value)
+    if rgb:
+        parts = [float(p) for p in rgb.group(1).split(',')]
+        return tuple(p / 255 for p in parts[:3]) + ((parts[3],) if len(parts) > 3 else ())
+    try:
+        to_rgba(value)
+        return value
+    except ValueError:
+        return default
+
+def _decode_arrays(node):
+    """Expands Plotly 6's typed-array encoding ({'dtype', 'bdata', 'shape'}) back into lists."""
+    if isinstance(node, dict):
+        if 'bdata' in node and 'dtype' in node:
+            array = np.frombuffer(base64.b64decode(node['bdata']), dtype=node['dtype'])
+            if 'shape' in node:
+                array = array.reshape([int(n) for n in str(node['shape']).split(',')])
+            return array.tolist()
+        return {key: _decode_arrays(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_decode_arrays(item) for item in node]
+    return node
+
+def _colormap(colorscale, theme):
+    """A matplotlib colormap for a Plotly colorscale ([[position, colour], ...]); viridis if none."""
+    if not colorscale:
+        return matplotlib.colormaps['viridis']
+    return LinearSegmentedColormap.from_list("plotly", [(position, _color(c, theme)) for position, c in colorscale])
+
+def _values(values):
+    """Trace x/y values as something matplotlib can plot: dates parsed, else as given."""
+    if values is None:
+        return []
+    if values and isinstance(values[0], str):
+        try:
+            return list(pd.to_datetime(values, format='ISO8601'))
+        except (ValueError, TypeError):
+            return values
+    return values
+
+def _text(node):
+    if isinstance(node, dict):
+        return node.get('text') or ''
+    return node or ''
+
+
+def _draw_cartesian(ax, traces, layout, theme, colorway):
+    categories = []  # shared categorical axis for bars
+    bars = [t for t in traces if t['type'] == 'bar']
+    for trace in bars:
+        axis_values = trace.get('y') if trace.get('orientation') == 'h' else trace.get('x')
+        for value in axis_values or []:
+            if value not in categories:
+                categories.append(value)
+    barmode = layout.get('barmode', 'group')
+    stacked_base = {}
+
+    for index, trace in enumerate(traces):
+        color = _color((trace.get('line') or {}).get('color') or (trace.get('marker') or {}).get('color'),
+                       theme, colorway[index % len(colorway)])
+        name = trace.get('name')
+        if trace['type'] in ('scatter', 'scattergl'):
+            mode = trace.get('mode', 'lines+markers')
+            x, y = _values(trace.get('x')), trace.get('y') or []
+            if not x:
+                x = list(range(len(y)))
+            width = (trace.get('line') or {}).get('width', 2)
+            ax.plot(x, y, color=color, linewidth=width if 'lines' in mode else 0,
+                    marker='o' if 'markers' in mode and len(y) <= 200 else None, markersize=4, label=name)
+        elif trace['type'] == 'bar':
+            horizontal = trace.get('orientation') == 'h'
+            cats = trace.get('y') if horizontal else trace.get('x')
+            vals = trace.get('x') if horizontal else trace.get('y')
+            positions = [categories.index(c) for c in cats]
+            marker_color = (trace.get('marker') or {}).get('color')
+            if isinstance(marker_color, list) and all(isinstance(c, (int, float)) for c in marker_color):
+                # Continuous colour ('color=<column>' in plotly express) through the colour axis
+                low, high = min(marker_color), max(marker_color)
+                cmap = _colormap((layout.get('coloraxis') or {}).get('colorscale'), theme)
+                colors = [cmap((c - low) / ((high - low) or 1)) for c in marker_color]
+            elif isinstance(marker_color, list):
+                colors = [_color(c, theme, color) for c in marker_color]
+            else:
+                colors = color
+            if barmode in ('stack', 'relative'):
+                bottoms = [stacked_base.get(p, 0) for p in positions]
+                for p, v in zip(positions, vals):
+                    stacked_base[p] = stacked_base.get(p, 0) + (v or 0)
+                offset, width = 0, 0.8
+            else:
+                bottoms = 0
+                width = 0.8 / max(len(bars), 1)
+                offset = (bars.index(trace) - (len(bars) - 1) / 2) * width
+            shifted = [p + offset for p in positions]
+            if horizontal:
+                ax.barh(shifted, vals, height=width, left=bottoms, color=colors, label=name)
+            else:
+                ax.bar(shifted, vals, width=width, bottom=bottoms, color=colors, label=name)
+        elif trace['type'] == 'heatmap':
+            z = trace.get('z') or []
+            cmap = _colormap(trace.get('colorscale') or (layout.get('coloraxis') or {}).get('colorscale'), theme)
+            image = ax.imshow(z, cmap=cmap, aspect='auto')
+            x_labels, y_labels = trace.get('x'), trace.get('y')
+            if x_labels:
+                ax.set_xticks(range(len(x_labels)), labels=x_labels, rotation=30, ha='right')
+            if y_labels:
+                ax.set_yticks(range(len(y_labels)), labels=y_labels)
+            if trace.get('texttemplate'):
+                decimals = re.search(r"%\{z:\.(\d+)f\}", trace['texttemplate'])
+                for row, values in enumerate(z):
+                    for col, value in enumerate(values):
+                        if value is not None:
+                            r, g, b, _ = image.cmap(image.norm(value))
+                            ax.text(col, row, f"{value:.{decimals.group(1) if decimals else 2}f}", ha='center',
+                                    va='center', fontsize=8,
+                                    color='white' if 0.299 * r + 0.587 * g + 0.114 * b < 0.55 else 'black')
+            ax.figure.colorbar(image, ax=ax)
+
+    if bars and categories:
+        set_ticks = ax.set_yticks if bars[0].get('orientation') == 'h' else ax.set_xticks
+        step = max(1, len(categories) // 12)  # at most ~12 labels, like Plotly's auto ticks
+        set_ticks(range(0, len(categories), step), labels=[str(c) for c in categories[::step]])
+
+    xaxis, yaxis = layout.get('xaxis') or {}, layout.get('yaxis') or {}
+    ax.set_xlabel(_text(xaxis.get('title')))
+    ax.set_ylabel(_text(yaxis.get('title')))
+    if yaxis.get('range') and None not in yaxis['range']:
+        ax.set_ylim(*yaxis['range'])
+    if not any(t['type'] == 'heatmap' for t in traces):
+        ax.grid(True, color=_color('var(--gray-200)', theme), linewidth=0.6)
+    ax.set_axisbelow(True)
+    for side in ('top', 'right'):
+        ax.spines[side].set_visible(False)
+    named = [t for t in traces if t.get('name') and t['type'] != 'heatmap']
+    if layout.get('showlegend', len(named) > 1) and named:
+        ax.legend(frameon=False, fontsize=9)
+    ax.figure.autofmt_xdate() if any(isinstance(v, pd.Timestamp) for t in traces for v in _values(t.get('x'))[:1]) else None
+
+def _draw_pie(ax, trace, theme, colorway):
+    values, labels = trace.get('values') or [], trace.get('labels') or []
+    marker_colors = (trace.get('marker') or {}).get('colors')
+    colors = ([_color(c, theme) for c in marker_colors] if marker_colors
+              else [colorway[i % len(colorway)] for i in range(len(values))])
+    if trace.get('sort', True) and len(labels) == len(values):
+        # Plotly draws the largest slice first
+        order = sorted(range(len(values)), key=lambda i: -values[i])
+        values, labels, colors = [values[i] for i in order], [labels[i] for i in order], [colors[i] for i in order]
+    hole = trace.get('hole') or 0
+    show_percent = 'percent' in (trace.get('textinfo') or 'percent')
+    ax.pie(values, labels=labels or None, colors=colors,
+           autopct='%1.0f%%' if show_percent else None, startangle=90, counterclock=False,
+           wedgeprops={'width': 1 - hole} if hole else None, textprops={'fontsize': 9})
+    ax.set_aspect('equal')
+
+def _draw_radar(ax, traces, layout, theme, colorway):
+    for index, trace in enumerate(traces):
+        theta, r = trace.get('theta') or [], trace.get('r') or []
+        angles = np.linspace(0, 2 * np.pi, len(theta), endpoint=False).tolist()
+        color = _color((trace.get('line') or {}).get('color'), theme, colorway[index % len(colorway)])
+        ax.plot(angles + angles[:1], list(r) + list(r[:1]), color=color, linewidth=2)
+        if trace.get('fill'):
+            ax.fill(angles + angles[:1], list(r) + list(r[:1]),
+                    color=_color(trace.get('fillcolor'), theme, color), alpha=None if trace.get('fillcolor') else 0.3)
+        ax.set_xticks(angles, labels=theta, fontsize=9)
+    radial = ((layout.get('polar') or {}).get('radialaxis') or {})
+    if radial.get('range') and None not in radial['range']:
+        ax.set_ylim(*radial['range'])
+
+def _draw_gauge(ax, trace, theme):
+    gauge = trace.get('gauge') or {}
+    low, high = ((gauge.get('axis') or {}).get('range') or [0, 100])
+    low, high = low or 0, high or 100
+    value = trace.get('value') or 0
+
+    def angle(v):
+        return 180 - 180 * (min(max(v, low), high) - low) / ((high - low) or 1)
+
+    for step in gauge.get('steps') or []:
+        a, b = step.get('range', [low, high])
+        ax.add_patch(Wedge((0, 0), 1, angle(b), angle(a), width=0.3, color=_color(step.get('color'), theme, '#e5e7eb')))
+    ax.add_patch(Wedge((0, 0), 0.93, angle(value), 180, width=0.16,
+                       color=_color((gauge.get('bar') or {}).get('color'), theme, '#8b5cf6')))
+    threshold = gauge.get('threshold') or {}
+    if 'value' in threshold:
+        import math
+        t = math.radians(angle(threshold['value']))
+        ax.plot([0.68 * math.cos(t), math.cos(t)], [0.68 * math.sin(t), math.sin(t)],
+                color=_color((threshold.get('line') or {}).get('color'), theme, '#dc2626'), linewidth=3)
+    ax.text(0, 0.1, f"{value:.1f}", ha='center', va='center', fontsize=26, fontweight='bold',
+            color=_color('var(--gray-700)', theme))
+    ax.set_title(_text(trace.get('title')), fontsize=12)
+    ax.set_xlim(-1.1, 1.1)
+    ax.set_ylim(-0.15, 1.1)
+    ax.set_aspect('equal')
+    ax.axis('off')
+
+def draw_figure(figure_json, width_px, theme="Light"):
+    """A matplotlib Figure redrawing a Plotly figure (as to_json() output), or None if unsupported."""
+    spec = _decode_arrays(json.loads(figure_json))
+    traces = spec.get('data') or []
+    layout = spec.get('layout') or {}
+    if not traces or any(t.get('type', 'scatter') not in SUPPORTED_TRACE_TYPES for t in traces):
+        return None
+    for trace in traces:
+        trace.setdefault('type', 'scatter')
+    template_layout = (layout.get('template') or {}).get('layout') or {}
+    colorway = (layout.get('piecolorway') if traces[0]['type'] == 'pie' else None) \
+        or layout.get('colorway') or template_layout.get('colorway') or DEFAULT_COLORWAY
+    colorway = [_color(c, theme, '#6b7280') for c in colorway]
+
+    height_px = layout.get('height') or 450
+    fig = Figure(figsize=(width_px / STATIC_CHART_DPI, height_px / STATIC_CHART_DPI), dpi=STATIC_CHART_DPI)
+    fig.patch.set_alpha(0)
+    text_color = _color('var(--gray-700)', theme)
+    kinds = {t['type'] for t in traces}
+    with matplotlib.rc_context({'text.color': text_color, 'axes.labelcolor': text_color,
+                                'xtick.color': text_color, 'ytick.color': text_color,
+                                'axes.edgecolor': _color('var(--gray-300)', theme)}):
+        if kinds == {'pie'}:
+            _draw_pie(fig.add_subplot(), traces[0], theme, colorway)
+        elif kinds == {'indicator'}:
+            _draw_gauge(fig.add_subplot(), traces[0], theme)
+        elif kinds == {'scatterpolar'}:
+            _draw_radar(fig.add_subplot(projection='polar'), traces, layout, theme, colorway)
+        elif kinds & {'pie', 'indicator', 'scatterpolar'}:
+            return None  # mixed subplot layouts aren't redrawn
+        else:
+            ax = fig.add_subplot()
+            ax.patch.set_alpha(0)
+            _draw_cartesian(ax, traces, layout, theme, colorway)
+        title = _text(layout.get('title'))
+        if title:
+            fig.suptitle(title, fontsize=13)
+        fig.tight_layout()
+    return fig
+
+def render_static_chart(figure_json, width_px, theme="Light", image_format=None):
+    """
+    Path of the cached image for a figure, drawing it first if needed.
+    Returns None for figures this backend can't draw.
+    """
+    image_format = image_format or STATIC_CHART_FORMAT
+    key = hashlib.sha1(f"{figure_json}|{theme}|{width_px}|{STATIC_CHART_DPI}".encode('utf-8')).hexdigest()[:20]
+    path = os.path.join(STATIC_CHARTS_DIR, f"{key}.{image_format}")
+    if os.path.exists(path):
+        return path
+    with _render_lock:
+        if os.path.exists(path):
+            return path
+        fig = draw_figure(figure_json, width_px, theme)
+        if fig is None:
+            return None
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=image_format, transparent=True,
+                    metadata={'Date': None} if image_format == 'svg' else None)
+        os.makedirs(STATIC_CHARTS_DIR, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(buffer.getvalue())
+        os.replace(tmp_path, path)
+    return path
+
+def prune_static_charts(max_age_days=30):
+    """Deletes cached chart images not modified in max_age_days. Returns the number removed."""
+    if not os.path.isdir(STATIC_CHARTS_DIR):
+        return 0
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for name in os.listdir(STATIC_CHARTS_DIR):
+        path = os.path.join(STATIC_CHARTS_DIR, name)
+        if os.path.getmtime(path) < cutoff:
+            os.remove(path)
+            removed += 1
+    return removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage EduScan's pre-rendered chart images.")
+    parser.add_argument("command", choices=["prune"])
+    parser.add_argument("--max-age-days", type=float, default=30)
+    args = parser.parse_args(argv)
+    print(f"Removed {prune_static_charts(args.max_age_days)} chart images from {STATIC_CHARTS_DIR}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,577 @@
+# utils/sync_utils.py
+"""
+Offline-first sync between a school's local store and the central database.
+
+Schools keep working against their local repository (json, jsonl or sqlite);
+while offline mode is off, a background worker reconciles it with a sync
+server in two steps:
+
+  push  The repository journals every local save and delete (see
+        ChangeJournal); the entries written since the last push are sent in
+        compressed batches and then dropped from the journal. The first push
+        sends every local record. The server keeps the current version of
+        every record in sync_records, each stamped with an increasing seq.
+  pull  The client asks for records with seq greater than the last one it saw,
+        so only rows changed elsewhere come back.
+
+Records are keyed by (student_name, timestamp) for predictions, which are
+never edited, and by (child_name, date) for parent observations. When both
+sides changed the same observation since the client's last sync, the version
+with the newer 'timestamp' wins (the server's on a tie). Only explicit deletes
+become tombstones, stamped with the time of the delete; records that leave the
+local store any other way (e.g. archived by retention) stay on the server.
+
+The server is PostgreSQL (EDUSCAN_SYNC_SERVER=postgres, using DATABASE_URL
+and migrations/0004_sync_records.sql) or, for testing and small deployments,
+an SQLite file (EDUSCAN_SYNC_SERVER=sqlite:///path/to/server.sqlite3).
+
+    python -m utils.sync_utils sync    # one sync pass for the local store
+    python -m utils.sync_utils check   # two clients against a throwaway SQLite server
+"""
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from datetime import date, datetime
+
+from utils.chart_utils import invalidate_figures
+from utils.repository import SYNC_SERVER_ENV, create_repository, get_repository
+
+SYNC_STATE_FILE = os.environ.get('EDUSCAN_SYNC_STATE', 'data/sync_state.json')
+SYNC_BATCH_SIZE = 500
+DEFAULT_SYNC_INTERVAL_SECONDS = 5 * 60
+
+SQLITE_SERVER_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sync_records (
+        record_key TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        payload TEXT,
+        deleted INTEGER NOT NULL DEFAULT 0,
+        updated_at TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        origin TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_sync_records_seq ON sync_records (seq);
+"""
+
+
+def encode_batch(message):
+    """Serializes a sync message as zlib-compressed JSON."""
+    return zlib.compress(json.dumps(message, default=str, separators=(',', ':')).encode('utf-8'), 6)
+
+def decode_batch(data):
+    return json.loads(zlib.decompress(data).decode('utf-8'))
+
+def record_key(kind, record):
+    """Stable key of a record: predictions by (student_name, timestamp), observations by (child_name, date)."""
+    if kind == 'prediction':
+        return json.dumps([kind, record.get('student_name'), record.get('timestamp')])
+    return json.dumps([kind, record.get('child_name'), str(record.get('date'))[:10]])
+
+def _change_time(change):
+    """When a change was made: a record's own timestamp, or the time of a delete."""
+    if change['deleted']:
+        return change['at']
+    return str(change['record'].get('timestamp') or '')
+
+
+class SyncServer:
+    """
+    The central side of the protocol. push() and pull() take and return
+    compressed batches, so the same object can sit behind an HTTP endpoint.
+
+    Args:
+        connect: Context manager factory yielding a DB-API connection.
+        dialect (str): 'sqlite' or 'postgres'.
+        apply (callable, optional): apply(cursor, changes) writes accepted
+            changes to the central tables on the push's own cursor, so they
+            commit or roll back together with sync_records.
+    """
+
+    def __init__(self, connect, dialect, apply=None):
+        self._connect = connect
+        self.dialect = dialect
+        self.apply = apply
+
+    def _sql(self, sql):
+        return sql.replace('%s', '?') if self.dialect == 'sqlite' else sql
+
+    def _begin_write(self, cur):
+        """Serializes pushes so seq values become visible in order."""
+        if self.dialect == 'sqlite':
+            cur.execute("BEGIN IMMEDIATE")
+        else:
+            cur.execute("LOCK TABLE sync_records IN SHARE ROW EXCLUSIVE MODE")
+
+    def push(self, batch):
+        """
+        Applies a batch of client changes. Each change carries the seq the client
+        last saw for that key; if the server has moved past it, the newer
+        updated_at wins. Returns a batch of accepted keys (with their seq) and
+        rejected changes (with the server's winning version).
+        """
+        message = decode_batch(batch)
+        origin = message['client_id']
+        accepted, rejected, applied = [], [], []
+        with self._connect() as conn:
+            cur = conn.cursor()
+            self._begin_write(cur)
+            try:
+                cur.execute("SELECT COALESCE(MAX(seq), 0) FROM sync_records")
+                seq = cur.fetchone()[0]
+                for change in message['changes']:
+                    cur.execute(self._sql(
+                        "SELECT payload, deleted, updated_at, seq FROM sync_records WHERE record_key = %s"
+                    ), (change['key'],))
+                    current = cur.fetchone()
+                    if current is not None:
+                        payload, deleted, updated_at, current_seq = current
+                        current_record = None if deleted else json.loads(payload)
+                        if current_record == change['record'] and bool(deleted) == change['deleted']:
+                            accepted.append({'key': change['key'], 'seq': current_seq})
+                            continue
+                        if current_seq > change.get('base_seq', 0) and change['updated_at'] <= updated_at:
+                            rejected.append({'key': change['key'], 'kind': change['kind'],
+                                             'record': current_record, 'deleted': bool(deleted),
+                                             'updated_at': updated_at, 'seq': current_seq})
+                            continue
+                    seq += 1
+                    cur.execute(self._sql("""
+                        INSERT INTO sync_records (record_key, kind, payload, deleted, updated_at, seq, origin)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s)
+                        ON CONFLICT (record_key) DO UPDATE SET
+                            kind = EXCLUDED.kind, payload = EXCLUDED.payload, deleted = EXCLUDED.deleted,
+                            updated_at = EXCLUDED.updated_at, seq = EXCLUDED.seq, origin = EXCLUDED.origin
+                    """), (change['key'], change['kind'],
+                           None if change['deleted'] else json.dumps(change['record'], default=str),
+                           change['deleted'], change['updated_at'], seq, origin))
+                    accepted.append({'key': change['key'], 'seq': seq})
+                    applied.append(change)
+                if self.apply is not None:
+                    # Same transaction: if the central tables reject a change the
+                    # whole push rolls back and the client sends it again
+                    self.apply(cur, applied)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        if self.apply is not None and applied:
+            invalidate_figures()
+        return encode_batch({'accepted': accepted, 'rejected': rejected})
+
+    def pull(self, batch):
+        """
+        Returns records changed after the client's cursor, oldest seq first,
+        leaving out the client's own changes. The new cursor covers every row
+        scanned, so the next pull starts where this one stopped.
+        """
+        message = decode_batch(batch)
+        limit = message.get('limit', SYNC_BATCH_SIZE)
+        with self._connect() as conn:
+            cur = conn.cursor()
+            cur.execute(self._sql("""
+                SELECT record_key, kind, payload, deleted, updated_at, seq, origin
+                FROM sync_records WHERE seq > %s ORDER BY seq LIMIT %s
+            """), (message['cursor'], limit + 1))
+            rows = cur.fetchall()
+            conn.rollback()
+        more = len(rows) > limit
+        rows = rows[:limit]
+        changes = [
+            {'key': key, 'kind': kind, 'record': None if deleted else json.loads(payload),
+             'deleted': bool(deleted), 'updated_at': updated_at, 'seq': seq}
+            for key, kind, payload, deleted, updated_at, seq, origin in rows
+            if origin != message['client_id']
+        ]
+        cursor = rows[-1][5] if rows else message['cursor']
+        return encode_batch({'changes': changes, 'cursor': cursor, 'more': more})
+
+
+def _sqlite_connector(db_path):
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(SQLITE_SERVER_SCHEMA)
+
+    @contextmanager
+    def connect():
+        conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+    return connect
+
+def _postgres_connector():
+    from utils.db_utils import db_connection
+
+    @contextmanager
+    def connect():
+        with db_connection() as conn:
+            if conn is None:
+                raise ConnectionError("central database is unavailable")
+            yield conn
+    return connect
+
+def create_sync_server(url=None):
+    """
+    Builds the SyncServer named by url (default: EDUSCAN_SYNC_SERVER), or
+    returns None when no sync server is configured.
+    """
+    url = (url if url is not None else os.environ.get(SYNC_SERVER_ENV, "")).strip()
+    if not url:
+        return None
+    if url.startswith("sqlite:///"):
+        return SyncServer(_sqlite_connector(url[len("sqlite:///"):]), 'sqlite')
+    if url == "postgres":
+        return SyncServer(_postgres_connector(), 'postgres', apply=apply_changes_to_db)
+    raise ValueError(f"Unknown sync server '{url}' (use 'postgres' or 'sqlite:///path')")
+
+
+def apply_changes_to_db(cur, changes):
+    """
+    Writes accepted changes into the central PostgreSQL tables on the push's
+    cursor. Nothing is committed here, so a failure part way through leaves no
+    change applied and a retried push can't insert a prediction twice.
+    """
+    from utils import db_utils
+
+    predictions = [c['record'] for c in changes if c['kind'] == 'prediction' and not c['deleted']]
+    names = {record.get('student_name') for record in predictions}
+    try:
+        if predictions:
+            db_utils.insert_predictions(cur, predictions)
+        for change in changes:
+            if change['kind'] != 'observation':
+                continue
+            _, child_name, obs_date = json.loads(change['key'])
+            names.add(child_name)
+            if change['deleted']:
+                db_utils.delete_parent_observation_row(cur, child_name, obs_date)
+            else:
+                db_utils.upsert_parent_observation(cur, change['record'])
+    except Exception:
+        for name in names:
+            db_utils.forget_student_id(name)  # ids cached by this transaction are rolled back
+        raise
+
+def apply_changes_to_repository(repository, changes):
+    """
+    Writes synced records into a repository (upserting observations, appending
+    predictions). Raises when the repository reports a failed write, including
+    a failed delete, so the caller doesn't acknowledge the changes; a delete
+    of a record that is already gone is fine.
+    """
+    predictions = [c['record'] for c in changes if c['kind'] == 'prediction' and not c['deleted']]
+    if predictions and repository.save_predictions_bulk(predictions) != len(predictions):
+        raise RuntimeError(f"failed to save {len(predictions)} synced predictions")
+    for change in changes:
+        if change['kind'] != 'observation':
+            continue
+        if change['deleted']:
+            _, child_name, obs_date = json.loads(change['key'])
+            repository.delete_parent_observation(child_name, obs_date)
+        elif not repository.save_parent_observation(change['record']):
+            raise RuntimeError(f"failed to save synced observation {change['key']}")
+    if changes:
+        invalidate_figures()
+
+
+class SyncClient:
+    """
+    The school side. Changes to push come from the repository's change journal;
+    the state file only holds the client id, the server cursor and whether the
+    initial full push has happened.
+    """
+
+    def __init__(self, server, repository=None, state_path=SYNC_STATE_FILE):
+        self.server = server
+        self._repository = repository
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        if repository is not None:
+            repository.enable_change_journal()
+
+    @property
+    def repository(self):
+        return self._repository or get_repository()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            state = {}
+        # Older state files kept a fingerprint per record; those re-seed once
+        return {'client_id': state.get('client_id') or uuid.uuid4().hex,
+                'cursor': state.get('cursor', 0), 'seeded': state.get('seeded', False)}
+
+    def _save_state(self, state):
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def _local_records(self):
+        """Every local record as a journal-style entry, for the first push."""
+        for record in self.repository.iter_student_data():
+            yield {'kind': 'prediction', 'record': record, 'deleted': False}
+        for record in self.repository.iter_parent_observations():
+            yield {'kind': 'observation', 'record': record, 'deleted': False}
+
+    @staticmethod
+    def _latest_by_key(entries):
+        """{key: entry} keeping the last journal entry for each record."""
+        latest = {}
+        for entry in entries:
+            latest[entry.get('key') or record_key(entry['kind'], entry['record'])] = entry
+        return latest
+
+    def local_changes(self, state, entries):
+        """Changes to push: the latest journal entry per record, plus every local record on the first push."""
+        pending = self._latest_by_key(entries)
+        if not state['seeded']:
+            seed = self._latest_by_key(self._local_records())
+            seed.update(pending)
+            pending = seed
+        return [
+            {'key': key, 'kind': entry['kind'], 'record': None if entry['deleted'] else entry['record'],
+             'deleted': entry['deleted'], 'updated_at': _change_time(entry), 'base_seq': state['cursor']}
+            for key, entry in pending.items() if not entry.get('synced')
+        ]
+
+    def sync(self):
+        """Runs one push/pull pass and returns a report dict."""
+        with self._lock:
+            started = time.perf_counter()
+            report = {'started_at': datetime.now().isoformat(), 'pushed': 0, 'conflicts': 0,
+                      'pulled': 0, 'bytes_sent': 0, 'bytes_received': 0, 'raw_bytes': 0}
+            state = self._load_state()
+            journal = self.repository.enable_change_journal()
+            entries, offset = journal.read()
+
+            changes = self.local_changes(state, entries)
+            # Predictions are only ever appended, so one already here is never applied again
+            local_predictions = {c['key'] for c in changes if c['kind'] == 'prediction'}
+            for i in range(0, len(changes), SYNC_BATCH_SIZE):
+                chunk = changes[i:i + SYNC_BATCH_SIZE]
+                batch = encode_batch({'client_id': state['client_id'], 'changes': chunk})
+                report['bytes_sent'] += len(batch)
+                report['raw_bytes'] += len(json.dumps(chunk, default=str))
+                response = self.server.push(batch)
+                report['bytes_received'] += len(response)
+                result = decode_batch(response)
+                report['pushed'] += len(result['accepted'])
+                report['conflicts'] += len(result['rejected'])
+                self._apply_remote(journal, result['rejected'], {}, local_predictions)
+            journal.discard(offset)
+            state['seeded'] = True
+            self._save_state(state)
+
+            while True:
+                response = self.server.pull(encode_batch({
+                    'client_id': state['client_id'], 'cursor': state['cursor'], 'limit': SYNC_BATCH_SIZE}))
+                report['bytes_received'] += len(response)
+                result = decode_batch(response)
+                # Writes made since the push started; a newer one is kept over the server's
+                pending = self._latest_by_key(journal.read()[0])
+                report['pulled'] += self._apply_remote(journal, result['changes'], pending, local_predictions)
+                state['cursor'] = result['cursor']
+                self._save_state(state)
+                if not result['more']:
+                    break
+
+            report['duration_seconds'] = round(time.perf_counter() - started, 3)
+            return report
+
+    def _apply_remote(self, journal, changes, pending, local_predictions):
+        """Applies server versions locally unless a pending local write is newer. Returns the count."""
+        to_apply = []
+        for change in changes:
+            if change['kind'] == 'prediction' and change['key'] in local_predictions:
+                continue
+            local = pending.get(change['key'])
+            if local is not None and not local.get('synced') and _change_time(local) > change['updated_at']:
+                continue  # our newer write is pushed on the next pass
+            to_apply.append(change)
+        with journal.paused():
+            apply_changes_to_repository(self.repository, to_apply)
+        # A pending write the server's version replaced must not be pushed later
+        journal.append([{'key': c['key'], 'synced': True} for c in to_apply if c['key'] in pending])
+        return len(to_apply)
+
+
+_sync_wakeup = threading.Event()
+_sync_worker_lock = threading.Lock()
+_sync_worker_thread = None
+_last_sync = {}
+
+def get_last_sync_report():
+    """Returns the report (or error) from the most recent sync in this process."""
+    return dict(_last_sync)
+
+def request_sync():
+    """Wakes the sync worker, e.g. right after offline mode is switched off."""
+    _sync_wakeup.set()
+
+def _sync_loop(client, interval_seconds):
+    while True:
+        try:
+            if not get_repository().load_app_settings().get('offline_mode', False):
+                report = client.sync()
+                _last_sync.clear()
+                _last_sync.update(report)
+        except Exception as e:
+            print(f"Error during sync: {e}")
+            _last_sync['error'] = str(e)
+            _last_sync['failed_at'] = datetime.now().isoformat()
+        _sync_wakeup.wait(interval_seconds)
+        _sync_wakeup.clear()
+
+def start_sync_worker(interval_seconds=None):
+    """
+    Starts the background sync thread if a sync server is configured and the
+    local store isn't the central database itself. Safe to call on every rerun.
+    The interval can be overridden with EDUSCAN_SYNC_INTERVAL.
+    """
+    global _sync_worker_thread
+    with _sync_worker_lock:
+        if _sync_worker_thread is not None and _sync_worker_thread.is_alive():
+            return _sync_worker_thread
+        if get_repository().name == 'postgres':
+            return None
+        try:
+            server = create_sync_server()
+        except Exception as e:
+            print(f"Sync server unavailable: {e}")
+            return None
+        if server is None:
+            return None
+        if interval_seconds is None:
+            interval_seconds = int(os.environ.get('EDUSCAN_SYNC_INTERVAL', DEFAULT_SYNC_INTERVAL_SECONDS))
+        _sync_worker_thread = threading.Thread(
+            target=_sync_loop, args=(SyncClient(server), interval_seconds),
+            name="eduscan-sync", daemon=True
+        )
+        _sync_worker_thread.start()
+        return _sync_worker_thread
+
+
+def run_sync_checks():
+    """
+    Syncs two json-backed clients through a throwaway SQLite server.
+    Returns a list of (check_name, passed, detail) tuples.
+    """
+    from utils.repository_checks import _observation, _prediction
+
+    results = []
+
+    def check(name, passed, detail=""):
+        results.append((name, bool(passed), detail))
+
+    workdir = tempfile.mkdtemp(prefix="eduscan-sync-")
+    try:
+        server = create_sync_server("sqlite:///" + os.path.join(workdir, "server.sqlite3"))
+        clients = []
+        for name in ("school_a", "school_b"):
+            repository = create_repository('json', data_dir=os.path.join(workdir, name))
+            clients.append(SyncClient(server, repository, os.path.join(workdir, name, "sync_state.json")))
+        a, b = clients
+        day = date(2025, 5, 1)
+
+        a.repository.save_predictions_bulk([_prediction(i) for i in range(300)])
+        a.repository.save_parent_observation(_observation("Amina", day))
+        report = a.sync()
+        check("first push sends every record", report['pushed'] == 301, f"{report['pushed']} pushed")
+        check("batches are compressed", report['bytes_sent'] < report['raw_bytes'] / 3,
+              f"{report['bytes_sent']} of {report['raw_bytes']} bytes")
+        report = b.sync()
+        check("second client pulls them", report['pulled'] == 301 and
+              len(b.repository.load_student_data()) == 300 and
+              len(b.repository.load_child_observations("Amina")) == 1)
+        report = a.sync()
+        check("unchanged data transfers nothing", report['pushed'] == 0 and report['pulled'] == 0)
+
+        b.repository.save_parent_observation(_observation("Amina", day, homework=80) | {'timestamp': '2025-05-01T18:00:00'})
+        a.repository.save_parent_observation(_observation("Amina", day, homework=90) | {'timestamp': '2025-05-01T19:00:00'})
+        b.sync()
+        report = a.sync()
+        check("newer conflicting edit wins on the server", report['conflicts'] == 0 and report['pushed'] == 1)
+        b.sync()
+        check("both clients converge on the newer edit",
+              [o['homework_completion'] for c in clients for o in c.repository.load_child_observations("Amina")] == [90, 90])
+
+        b.repository.delete_parent_observation("Amina", day)
+        b.repository.save_parent_observation(_observation("Hodan", day))
+        report = b.sync()
+        check("delete and new record are pushed", report['pushed'] == 2, f"{report['pushed']} pushed")
+        a.sync()
+        check("delete propagates", a.repository.load_child_observations("Amina") == [] and
+              len(a.repository.load_child_observations("Hodan")) == 1)
+
+        b.repository.save_parent_observation(_observation("Hodan", day, homework=60) | {'timestamp': '2025-05-02T08:00:00'})
+        a.repository.save_parent_observation(_observation("Hodan", day, homework=40) | {'timestamp': '2025-05-02T07:00:00'})
+        b.sync()
+        report = a.sync()
+        check("stale edit loses to the server's newer one", report['conflicts'] == 1 and
+              a.repository.load_child_observations("Hodan")[0]['homework_completion'] == 60)
+        check("pushed journal entries are dropped", a.repository.journal.read()[0] == [])
+
+        a.repository.archive_parent_observations(date(2025, 6, 1))
+        report = a.sync()
+        b.sync()
+        check("archived records aren't deleted on the server", report['pushed'] == 0 and
+              len(b.repository.load_child_observations("Hodan")) == 1)
+
+        def rejecting_apply(cur, changes):
+            cur.execute("CREATE TABLE central_observations (record_key TEXT)")
+            cur.executemany("INSERT INTO central_observations VALUES (?)", [(c['key'],) for c in changes])
+            raise RuntimeError("central tables rejected the batch")
+
+        server.apply = rejecting_apply
+        a.repository.save_parent_observation(_observation("Faisal", day))
+        try:
+            a.sync()
+            rejected = False
+        except RuntimeError:
+            rejected = True
+        server.apply = None
+        with sqlite3.connect(os.path.join(workdir, "server.sqlite3")) as conn:
+            central = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'central_observations'").fetchone()[0]
+        check("a push the central tables reject is rolled back and resent", rejected and central == 0 and
+              b.sync()['pulled'] == 0 and a.sync()['pushed'] == 1 and b.sync()['pulled'] == 1)
+        with open(a.state_path) as f:
+            check("state file stays constant-size", set(json.load(f)) == {'client_id', 'cursor', 'seeded'})
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sync the local EduScan store with the central database.")
+    parser.add_argument("command", choices=["sync", "check"])
+    parser.add_argument("--server", help=f"Sync server (defaults to {SYNC_SERVER_ENV})")
+    args = parser.parse_args(argv)
+
+    if args.command == "check":
+        results = run_sync_checks()
+        for name, passed, detail in results:
+            print(f"  [{'PASS' if passed else 'FAIL'}] {name}" + (f" ({detail})" if detail else ""))
+        return 0 if all(passed for _, passed, _ in results) else 1
+
+    server = create_sync_server(args.server)
+    if server is None:
+        parser.error(f"no sync server configured (set {SYNC_SERVER_ENV} or pass --server)")
+    print(SyncClient(server).sync())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,288 @@
+# utils/write_queue_utils.py
+"""
+Durable write-behind queue for saves made from the pages.
+
+enqueue_write() appends the write to a local spool file (fsynced, so it
+survives a crash or restart) and returns a WriteHandle straight away; a
+single background thread applies queued writes to the repository in order,
+in batches, retrying with exponential backoff when the store is unreachable.
+A write is acknowledged in the spool only after the repository accepted it,
+so delivery is at-least-once: after a crash mid-flush the last batch may be
+applied again. Observation saves are upserts and deletes are idempotent;
+queued predictions carry the entry id as 'write_id', which every repository
+backend stores at most once, so a replayed one is skipped.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from tenacity import Retrying, stop_after_attempt, wait_exponential
+
+from utils.chart_utils import invalidate_figures
+from utils.repository import get_repository
+
+SPOOL_FILE = os.environ.get('EDUSCAN_WRITE_SPOOL', 'data/write_spool.jsonl')
+FLUSH_BATCH_SIZE = 200
+FLUSH_INTERVAL_SECONDS = 0.25
+RETRY_ATTEMPTS = 5
+# Pause before retrying a batch whose retries were exhausted (doubles up to the max)
+FAILED_BATCH_PAUSE_SECONDS = 5
+MAX_FAILED_BATCH_PAUSE_SECONDS = 300
+# Rewrite the spool without acknowledged entries once it has this many ack lines
+SPOOL_COMPACT_AFTER_ACKS = 1000
+# How long a page waits for a queued write before reporting it as queued instead of saved
+UI_CONFIRM_WAIT_SECONDS = 0.5
+
+WRITE_OPERATIONS = ('save_prediction', 'save_parent_observation', 'delete_parent_observation')
+
+
+class WriteHandle:
+    """Status of one queued write, for the UI to show or wait on."""
+
+    def __init__(self, entry_id, op):
+        self.id = entry_id
+        self.op = op
+        self.status = 'queued'   # queued -> written, or retrying while the store is failing
+        self.attempts = 0
+        self.error = None
+        self._written = threading.Event()
+
+    @property
+    def done(self):
+        return self._written.is_set()
+
+    def wait(self, timeout=None):
+        """Blocks until the write reached the repository or timeout passes. Returns done."""
+        return self._written.wait(timeout)
+
+    def _mark_written(self):
+        self.status = 'written'
+        self.error = None
+        self._written.set()
+
+
+class WriteBehindQueue:
+    """An append-only spool file plus the worker that drains it into a repository."""
+
+    def __init__(self, spool_path=SPOOL_FILE, repository=None):
+        self.spool_path = spool_path
+        self._repository = repository
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pending = {}   # id -> entry, in enqueue order
+        self._handles = {}   # id -> WriteHandle for pending entries
+        self._ack_lines = 0
+        self._stats = {'written': 0, 'failures': 0, 'last_flush_at': None, 'last_error': None}
+        self._thread = None
+        self._recover()
+
+    @property
+    def repository(self):
+        return self._repository or get_repository()
+
+    def _recover(self):
+        """Reloads writes that were queued but never acknowledged (e.g. before a restart)."""
+        if not os.path.exists(self.spool_path):
+            return
+        torn = False
+        with open(self.spool_path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    torn = True  # a partial line from a crash mid-append
+                    continue
+                if 'ack' in entry:
+                    self._pending.pop(entry['ack'], None)
+                    self._ack_lines += 1
+                else:
+                    self._pending[entry['id']] = entry
+        for entry_id, entry in self._pending.items():
+            self._handles[entry_id] = WriteHandle(entry_id, entry['op'])
+        if torn:
+            # Drop the partial line so the next append starts on a fresh line
+            self._rewrite_spool()
+
+    def _append(self, entries):
+        """Appends spool lines and fsyncs them. Callers must hold the lock."""
+        os.makedirs(os.path.dirname(self.spool_path) or ".", exist_ok=True)
+        with open(self.spool_path, 'a') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _rewrite_spool(self):
+        """Replaces the spool with just the pending entries. Callers must hold the lock."""
+        tmp_path = f"{self.spool_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            for entry in self._pending.values():
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.spool_path)
+        self._ack_lines = 0
+
+    def enqueue(self, op, payload):
+        """Durably queues one write and returns its WriteHandle."""
+        if op not in WRITE_OPERATIONS:
+            raise ValueError(f"Unknown write operation '{op}'")
+        entry_id = uuid.uuid4().hex
+        if op == 'save_prediction':
+            payload = dict(payload, write_id=entry_id)  # idempotency key for replays
+        entry = {'id': entry_id, 'op': op, 'payload': payload,
+                 'enqueued_at': datetime.now().isoformat()}
+        handle = WriteHandle(entry['id'], op)
+        with self._lock:
+            self._append([entry])
+            self._pending[entry['id']] = entry
+            self._handles[entry['id']] = handle
+            self._wakeup.notify()
+        return handle
+
+    def get_handle(self, entry_id):
+        with self._lock:
+            return self._handles.get(entry_id)
+
+    def _acknowledge(self, entries):
+        with self._lock:
+            self._append([{'ack': entry['id']} for entry in entries])
+            self._ack_lines += len(entries)
+            for entry in entries:
+                self._pending.pop(entry['id'], None)
+                handle = self._handles.pop(entry['id'], None)
+                if handle is not None:
+                    handle._mark_written()
+            self._stats['written'] += len(entries)
+            self._stats['last_flush_at'] = datetime.now().isoformat()
+            if not self._pending:
+                open(self.spool_path, 'w').close()  # everything delivered
+                self._ack_lines = 0
+            elif self._ack_lines >= SPOOL_COMPACT_AFTER_ACKS:
+                self._rewrite_spool()
+
+    def _apply_group(self, op, entries):
+        """Applies consecutive writes of one kind; raises if the repository rejects them."""
+        repository = self.repository
+        if op == 'save_prediction':
+            records = [entry['payload'] for entry in entries]
+            if len(records) == 1:
+                saved = 1 if repository.save_prediction_data(records[0]) else 0
+            else:
+                saved = repository.save_predictions_bulk(records)
+            if saved != len(records):
+                raise IOError(f"saved {saved} of {len(records)} predictions")
+        elif op == 'save_parent_observation':
+            for entry in entries:
+                if not repository.save_parent_observation(entry['payload']):
+                    raise IOError("parent observation was not saved")
+        else:
+            for entry in entries:
+                # False means there was nothing to delete; a failed delete raises and is retried
+                repository.delete_parent_observation(entry['payload']['child_name'], entry['payload']['date'])
+        invalidate_figures()
+
+    def _next_batch(self):
+        """Waits for pending writes and returns up to FLUSH_BATCH_SIZE of them, oldest first."""
+        with self._lock:
+            while not self._pending:
+                self._wakeup.wait()
+            batch = list(self._pending.values())[:FLUSH_BATCH_SIZE]
+            handles = [self._handles.get(entry['id']) for entry in batch]
+        return batch, handles
+
+    def flush_once(self):
+        """
+        Applies one batch, grouping consecutive writes of the same kind. Stops at
+        the first group that still fails after retries, so writes stay in order.
+        Returns True if the whole batch was written.
+        """
+        batch, handles = self._next_batch()
+        handle_by_id = {h.id: h for h in handles if h is not None}
+        groups = []
+        for entry in batch:
+            if groups and groups[-1][0] == entry['op']:
+                groups[-1][1].append(entry)
+            else:
+                groups.append((entry['op'], [entry]))
+
+        for op, entries in groups:
+            try:
+                for attempt in Retrying(stop=stop_after_attempt(RETRY_ATTEMPTS),
+                                        wait=wait_exponential(multiplier=0.5, max=10), reraise=True):
+                    with attempt:
+                        for entry in entries:
+                            handle = handle_by_id.get(entry['id'])
+                            if handle is not None:
+                                handle.attempts += 1
+                        self._apply_group(op, entries)
+            except Exception as e:
+                with self._lock:
+                    self._stats['failures'] += 1
+                    self._stats['last_error'] = f"{op}: {e}"
+                for entry in entries:
+                    handle = handle_by_id.get(entry['id'])
+                    if handle is not None:
+                        handle.status, handle.error = 'retrying', str(e)
+                print(f"Write-behind flush failed, will retry: {op}: {e}")
+                return False
+            self._acknowledge(entries)
+        return True
+
+    def _run(self):
+        pause = FAILED_BATCH_PAUSE_SECONDS
+        while True:
+            try:
+                if self.flush_once():
+                    pause = FAILED_BATCH_PAUSE_SECONDS
+                    time.sleep(FLUSH_INTERVAL_SECONDS)  # let a few more writes gather into the next batch
+                else:
+                    time.sleep(pause)
+                    pause = min(pause * 2, MAX_FAILED_BATCH_PAUSE_SECONDS)
+            except Exception as e:
+                print(f"Error in write-behind worker: {e}")
+                time.sleep(pause)
+
+    def start(self):
+        """Starts the worker thread if it isn't already running."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="eduscan-write-behind", daemon=True)
+                self._thread.start()
+        return self
+
+    def status(self):
+        """Queue depth and flush history for the UI."""
+        with self._lock:
+            status = dict(self._stats)
+            status['pending'] = len(self._pending)
+            status['running'] = self._thread is not None and self._thread.is_alive()
+        return status
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+def start_write_queue():
+    """
+    Returns the process-wide write queue, starting its worker on first use.
+
+    Safe to call on every script rerun; writes left in the spool by a previous
+    run are flushed as soon as the worker starts.
+    """
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = WriteBehindQueue()
+        return _queue.start()
+
+def enqueue_write(op, payload):
+    """Queues a write ('save_prediction', 'save_parent_observation' or 'delete_parent_observation')."""
+    return start_write_queue().enqueue(op, payload)
+
+def get_write_queue_status():
+    """Status of the write queue, or None if it hasn't been started in this process."""
+    return _queue.status() if _queue is not None else None